@@ -10,6 +10,7 @@ from app.models.user import User
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
 def get_current_user(
@@ -37,6 +38,21 @@ def get_current_user(
     return user
 
 
+def get_current_user_optional(
+    db: Session = Depends(get_db),
+    token: Optional[str] = Depends(oauth2_scheme_optional)
+) -> Optional[User]:
+    """Resolve the user when a valid token is sent, otherwise return None"""
+    if not token:
+        return None
+
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+
+    return db.query(User).filter(User.username == payload.get("sub")).first()
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
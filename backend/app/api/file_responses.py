@@ -0,0 +1,184 @@
+"""
+Conditional and partial file responses.
+
+Starlette's FileResponse ignores Range and validators, so media endpoints build
+their responses here: strong ETags, Last-Modified, 304 revalidation via
+If-None-Match / If-Modified-Since, and single-range 206 responses (with If-Range)
+so players can seek and interrupted downloads can resume. Pre-serialized API
+bodies get the same ETag revalidation and a pre-compressed gzip variant.
+"""
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "public, max-age=86400"
+NO_CACHE = "no-cache"
+
+_RANGE_RE = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+def make_etag(digest: str) -> str:
+    return f'"{digest[:32]}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if header.strip() == "*":
+        return True
+    bare = etag.replace("W/", "")
+    return any(candidate.strip().replace("W/", "") == bare for candidate in header.split(","))
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _if_range_allows(request: Request, etag: str, last_modified: str) -> bool:
+    """A stale If-Range validator means the client must get the whole file again"""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range.strip() == etag
+    return if_range.strip() == last_modified
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Return an inclusive (start, end) byte range, or None if it cannot be satisfied
+
+    Raises ValueError for headers we don't handle (other units, multiple ranges),
+    which callers answer with the full file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError("Unsupported range")
+
+    match = _RANGE_RE.match(spec)
+    if not match or match.groups() == ("", ""):
+        raise ValueError("Malformed range")
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def iter_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(
+    request: Request,
+    path: Path,
+    *,
+    size: int,
+    mtime: float,
+    etag: str,
+    media_type: str,
+    cache_control: str = REVALIDATE_CACHE,
+    filename: Optional[str] = None,
+    extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Serve a file whose size, mtime and hash are already known, without touching the filesystem first"""
+    last_modified = formatdate(mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if extra_headers:
+        headers.update(extra_headers)
+
+    if _not_modified(request, etag, mtime):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header and _if_range_allows(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            byte_range = (0, size - 1)
+            range_header = None
+
+        if byte_range is None:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{size}"}
+            )
+
+        if range_header:
+            start, end = byte_range
+            length = end - start + 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(length)
+            return StreamingResponse(
+                iter_file(path, start, length),
+                status_code=206,
+                media_type=media_type,
+                headers=headers
+            )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(iter_file(path, 0, size), media_type=media_type, headers=headers)
+
+
+def payload_response(
+    request: Request,
+    body: bytes,
+    body_gzip: Optional[bytes],
+    *,
+    etag: str,
+    media_type: str = "application/json",
+    cache_control: str = NO_CACHE
+) -> Response:
+    """Serve an in-memory body, answering If-None-Match with 304 and preferring the gzip copy"""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if body_gzip is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=body_gzip, media_type=media_type, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_superuser, get_current_user
+from app.db.base import get_db
+from app.models.leaderboard import Classroom
+from app.models.user import User
+from app.schemas.analytics import StudyBucket, StudySeries, StudyTotals
+from app.schemas.user import UserImportResult, UserImportRow
+from app.services import study_rollups, user_import
+
+router = APIRouter()
+
+# Longest range one chart may cover, and the default when no start is given
+MAX_RANGE = {study_rollups.HOUR: timedelta(days=31), study_rollups.DAY: timedelta(days=400)}
+DEFAULT_RANGE = {study_rollups.HOUR: timedelta(days=2), study_rollups.DAY: timedelta(days=30)}
+
+
+@router.get("/analytics/study", response_model=StudySeries)
+def study_analytics(
+    scope: Literal["all", "class", "user"] = "all",
+    scope_id: Optional[int] = None,
+    period: Literal["hour", "day"] = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Study totals per hour or day (UTC) for everyone, one class or one learner
+
+    Served from the rollup tables, which trail live sessions by one rollup run.
+    Admins can chart any scope; teachers can chart the classes they teach.
+    """
+    if scope == study_rollups.ALL:
+        scope_id = 0
+    elif scope_id is None:
+        raise HTTPException(status_code=400, detail=f"scope_id is required for {scope} analytics")
+
+    if not current_user.is_superuser:
+        teaches = scope == study_rollups.CLASS and db.query(Classroom).filter(
+            Classroom.id == scope_id, Classroom.teacher_id == current_user.id
+        ).first()
+        if not teaches:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    # Naive bounds are taken as UTC so they compare with aware ones
+    end = study_rollups.as_utc(end) if end else datetime.now(timezone.utc)
+    start = study_rollups.as_utc(start) if start else end - DEFAULT_RANGE[period]
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if end - start > MAX_RANGE[period]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{period} analytics cover at most {MAX_RANGE[period].days} days"
+        )
+
+    buckets = [StudyBucket.model_validate(row) for row in study_rollups.study_series(db, period, scope, scope_id, start, end)]
+    totals = StudyTotals(**{
+        measure: sum(getattr(bucket, measure) for bucket in buckets) for measure in study_rollups.MEASURES
+    })
+    return StudySeries(
+        scope=scope,
+        scope_id=scope_id,
+        period=period,
+        start=start,
+        end=end,
+        totals=totals,
+        buckets=buckets,
+        rolled_up_at=study_rollups.rolled_up_at(db)
+    )
+
+
+@router.post("/users/import", response_model=UserImportResult)
+def import_users(
+    file: UploadFile = File(...),
+    classroom_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser)
+):
+    """Create accounts from a CSV upload, optionally enrolling them in a class
+
+    Admins only: any account can create a class, so owning one is no authority to
+    create accounts. Rows are reported one by one: created (with the generated
+    password when the row had none), duplicate or invalid.
+    """
+    if classroom_id is not None and db.get(Classroom, classroom_id) is None:
+        raise HTTPException(status_code=404, detail="Classroom not found")
+
+    # Read one byte past the limit to tell a full-size file from an oversized one
+    data = file.file.read(user_import.MAX_IMPORT_BYTES + 1)
+    if len(data) > user_import.MAX_IMPORT_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"CSV must be at most {user_import.MAX_IMPORT_BYTES // 1024} KB"
+        )
+
+    try:
+        rows = user_import.parse_csv(data.decode("utf-8"))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    except user_import.ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    report = user_import.import_users(db, rows, classroom_id=classroom_id)
+    return UserImportResult(
+        created=report.created,
+        duplicates=report.duplicates,
+        invalid=report.invalid,
+        rows=[UserImportRow(**row._asdict()) for row in report.rows]
+    )
@@ -71,7 +71,8 @@ def register(
             hashed_password=hashed_password,
             preferred_language=user_data.preferred_language,
             learning_level=user_data.learning_level,
-            daily_goal_minutes=user_data.daily_goal_minutes
+            daily_goal_minutes=user_data.daily_goal_minutes,
+            preferences={"timezone": user_data.timezone} if user_data.timezone else {}
         )
 
         db.add(db_user)
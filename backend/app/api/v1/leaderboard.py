@@ -0,0 +1,122 @@
+import secrets
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user, get_current_user_optional
+from app.db.base import get_db
+from app.models.leaderboard import Classroom, ClassroomMember
+from app.models.user import User
+from app.schemas.leaderboard import (
+    ClassroomCreate,
+    ClassroomJoin,
+    ClassroomResponse,
+    LeaderboardEntry,
+    LeaderboardResponse
+)
+from app.services import leaderboard
+
+router = APIRouter()
+
+JOIN_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+
+@router.get("", response_model=LeaderboardResponse)
+def get_leaderboard(
+    scope: Literal["global", "weekly", "class"] = "global",
+    class_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """Top learners by points, plus the caller's own rank when signed in
+
+    `weekly` counts points earned since Monday (UTC); `class` ranks the members
+    of a class the caller belongs to.
+    """
+    if scope == leaderboard.CLASS:
+        if class_id is None:
+            raise HTTPException(status_code=400, detail="class_id is required for class leaderboards")
+        if current_user is None or not db.get(ClassroomMember, (class_id, current_user.id)):
+            raise HTTPException(status_code=404, detail="Class not found")
+
+    week = leaderboard.current_week() if scope == leaderboard.WEEKLY else None
+    key = leaderboard.board_key(scope, week=week, class_id=class_id)
+    standings, total = leaderboard.top(db, key, limit)
+    mine = leaderboard.standing(db, key, current_user.id) if current_user else None
+
+    user_ids = {standing.user_id for standing in standings} | ({mine.user_id} if mine else set())
+    users = {
+        user.id: user
+        for user in db.execute(select(User).where(User.id.in_(user_ids))).scalars()
+    } if user_ids else {}
+
+    def entry(standing) -> Optional[LeaderboardEntry]:
+        user = users.get(standing.user_id)
+        if user is None:
+            return None
+        return LeaderboardEntry(
+            rank=standing.rank,
+            user_id=user.id,
+            username=user.username,
+            full_name=user.full_name,
+            points=standing.points
+        )
+
+    return LeaderboardResponse(
+        scope=scope,
+        week_start=week,
+        class_id=class_id if scope == leaderboard.CLASS else None,
+        total=total,
+        entries=[e for e in (entry(standing) for standing in standings) if e is not None],
+        me=entry(mine) if mine else None
+    )
+
+
+@router.post("/classes", response_model=ClassroomResponse)
+def create_class(
+    request: ClassroomCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create a class; the creator joins it and shares the join code with learners"""
+    for _ in range(5):
+        classroom = Classroom(
+            name=request.name.strip(),
+            join_code="".join(secrets.choice(JOIN_CODE_ALPHABET) for _ in range(8)),
+            teacher_id=current_user.id
+        )
+        db.add(classroom)
+        try:
+            db.flush()
+            break
+        except IntegrityError:
+            db.rollback()
+    else:
+        raise HTTPException(status_code=500, detail="Could not allocate a join code")
+
+    db.add(ClassroomMember(classroom_id=classroom.id, user_id=current_user.id))
+    leaderboard.joined_class(db, classroom.id, current_user)
+    db.commit()
+    db.refresh(classroom)
+    return classroom
+
+
+@router.post("/classes/join", response_model=ClassroomResponse)
+def join_class(
+    request: ClassroomJoin,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    classroom = db.query(Classroom).filter(Classroom.join_code == request.join_code.strip().upper()).first()
+    if classroom is None:
+        raise HTTPException(status_code=404, detail="Class not found")
+
+    if not db.get(ClassroomMember, (classroom.id, current_user.id)):
+        db.add(ClassroomMember(classroom_id=classroom.id, user_id=current_user.id))
+        leaderboard.joined_class(db, classroom.id, current_user)
+        db.commit()
+    return classroom
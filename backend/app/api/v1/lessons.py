@@ -0,0 +1,93 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user_optional
+from app.api.file_responses import IMMUTABLE_CACHE, NO_CACHE, file_response, make_etag, payload_response
+from app.db.base import get_db
+from app.models.user import User
+from app.schemas.lesson import CourseMap, CourseMapLesson
+from app.services.course_map import AVAILABLE, COMPLETED, user_course_map
+from app.services.lesson_payloads import index_payload, lesson_payload
+from app.services.lesson_sync import change_feed
+from app.services.offline_packs import pack_index
+from app.services.pronunciation_bundles import MANIFEST_FILENAME
+
+router = APIRouter()
+
+
+@router.get("")
+def list_lessons(request: Request, db: Session = Depends(get_db)):
+    """The published curriculum, in course order, without slide content"""
+    payload = index_payload(db)
+    return payload_response(request, payload.body, payload.body_gzip, etag=make_etag(payload.digest))
+
+
+@router.get("/changes")
+def lesson_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Content version the client already has"),
+    db: Session = Depends(get_db)
+):
+    """Lessons changed or deleted since a content version, for incremental sync"""
+    feed = change_feed(db, since)
+    body_gzip = feed.gzipped() if "gzip" in request.headers.get("accept-encoding", "") else None
+    return payload_response(request, feed.body, body_gzip, etag=make_etag(feed.digest))
+
+
+@router.get("/map", response_model=CourseMap)
+def get_course_map(
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """Every published lesson's status for the caller: completed, available or locked"""
+    graph, entries = user_course_map(db, current_user.id if current_user else None)
+    return CourseMap(
+        version=graph.version,
+        completed=sum(1 for entry in entries if entry.status == COMPLETED),
+        available=sum(1 for entry in entries if entry.status == AVAILABLE),
+        total=len(entries),
+        lessons=[CourseMapLesson(**entry._asdict()) for entry in entries]
+    )
+
+
+@router.get("/packs")
+def get_pack_manifest(request: Request):
+    """Available offline packs, one per unit, with their current filenames and sizes"""
+    return serve_pack_file(MANIFEST_FILENAME, request)
+
+
+@router.get("/packs/{filename}")
+def get_pack(filename: str, request: Request):
+    """Download an offline pack; Range requests let interrupted downloads resume"""
+    if filename == MANIFEST_FILENAME:
+        raise HTTPException(status_code=404, detail="Pack not found")
+    return serve_pack_file(filename, request)
+
+
+def serve_pack_file(filename: str, request: Request):
+    bundle = pack_index.get(filename)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="Pack not found")
+
+    manifest = filename == MANIFEST_FILENAME
+    return file_response(
+        request,
+        bundle.plain.path,
+        size=bundle.plain.size,
+        mtime=bundle.plain.mtime,
+        etag=make_etag(bundle.plain.sha256),
+        media_type="application/json" if manifest else "application/zip",
+        cache_control=NO_CACHE if manifest else IMMUTABLE_CACHE,
+        filename=None if manifest else filename
+    )
+
+
+@router.get("/{lesson_uuid}")
+def get_lesson(lesson_uuid: str, request: Request, db: Session = Depends(get_db)):
+    """A lesson with its slides"""
+    payload = lesson_payload(db, lesson_uuid)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    return payload_response(request, payload.body, payload.body_gzip, etag=make_etag(payload.digest))
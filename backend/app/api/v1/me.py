@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.db.base import get_db
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.services.dashboard import get_dashboard, summary
+
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+def read_dashboard(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The caller's dashboard summary: totals, streak, recent activity and due reviews"""
+    return DashboardResponse(**summary(get_dashboard(db, current_user.id)))
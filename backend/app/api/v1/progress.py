@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.db.base import get_db
+from app.models.lesson import Lesson
+from app.models.progress import StudySession
+from app.models.user import User
+from app.schemas.progress import (
+    AchievementUnlocked,
+    LessonProgress,
+    ProgressEventBatch,
+    ProgressEventResult,
+    StudySessionCreate,
+    StudySessionResult
+)
+from app.services import events
+from app.services.achievements import pop_unlocked
+from app.services.leaderboard import award_points
+from app.services.progress import UnknownLessonsError, apply_progress_events, claim_batch, progress_for
+
+router = APIRouter()
+
+
+@router.post("/events", response_model=ProgressEventResult)
+def record_progress_events(
+    batch: ProgressEventBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply a batch of lesson progress events in one transaction
+
+    Events are folded per lesson, so clients can queue clicks and flush them
+    every few seconds. Returns the merged progress for each lesson touched, and
+    awards a lesson's points the first time it is completed along with those of
+    any achievements the batch unlocks. A batch_id that was already applied is
+    acknowledged with applied=0 and not counted again.
+    """
+    if batch.batch_id and not claim_batch(db, current_user.id, batch.batch_id):
+        # A retry of a batch that was applied but whose response never arrived
+        db.rollback()
+        lessons = progress_for(db, current_user.id, [event.lesson_id for event in batch.events])
+        return ProgressEventResult(applied=0, lessons=[LessonProgress(**update._asdict()) for update in lessons])
+
+    try:
+        updates = apply_progress_events(db, current_user.id, batch.events)
+    except UnknownLessonsError as e:
+        raise HTTPException(status_code=400, detail={"message": "Unknown lessons", "lesson_ids": e.lesson_ids})
+
+    completed = [update.lesson_id for update in updates if update.newly_completed]
+    points = db.execute(
+        select(func.coalesce(func.sum(Lesson.points_value), 0)).where(Lesson.id.in_(completed))
+    ).scalar() if completed else 0
+    if points:
+        award_points(db, current_user.id, points)
+    events.publish(db, events.PROGRESS_RECORDED, current_user.id, events=batch.events, updates=updates)
+
+    unlocked = [AchievementUnlocked.model_validate(achievement) for achievement in pop_unlocked(db)]
+    points += sum(achievement.points_value for achievement in unlocked)
+    total_points = _total_points(db, current_user.id) if points else None
+    db.commit()
+
+    return ProgressEventResult(
+        applied=len(batch.events),
+        lessons=[LessonProgress(**update._asdict()) for update in updates],
+        points_awarded=points,
+        total_points=total_points,
+        achievements_unlocked=unlocked
+    )
+
+
+@router.post("/sessions", response_model=StudySessionResult)
+def record_study_session(
+    request: StudySessionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Record a finished study session and return any achievements it unlocks"""
+    session = StudySession(user_id=current_user.id, **request.model_dump(exclude_none=True))
+    db.add(session)
+    db.flush()
+    events.publish(
+        db, events.STUDY_SESSION_RECORDED, current_user.id,
+        session_id=session.id,
+        occurred_at=request.ended_at or request.started_at,
+        duration_minutes=session.duration_minutes,
+        exercises_completed=session.exercises_completed,
+        translations_made=session.translations_made
+    )
+
+    unlocked = [AchievementUnlocked.model_validate(achievement) for achievement in pop_unlocked(db)]
+    result = StudySessionResult(id=session.id, duration_minutes=session.duration_minutes, achievements_unlocked=unlocked)
+    db.commit()
+    return result
+
+
+def _total_points(db: Session, user_id: int) -> int:
+    return db.execute(select(User.total_points).where(User.id == user_id)).scalar() or 0
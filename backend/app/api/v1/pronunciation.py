@@ -1,12 +1,27 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from typing import Optional, Dict, List
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import FrozenSet, Optional, Dict, List
 import os
 from pathlib import Path
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from app.api.file_responses import IMMUTABLE_CACHE, NO_CACHE, REVALIDATE_CACHE, file_response, make_etag
+from app.services.audio_index import audio_index
+from app.services.pronunciation_bundles import MANIFEST_FILENAME, bundle_index
+from app.services.pronunciation_engine import transcribe, words_in
+from app.services.pronunciation_store import pronunciation_store
+from app.services.sentence_audio import (
+    AudioToolUnavailable, MissingAudioError, RENDER_MIME_TYPE, RenderFailed, RenderTimedOut, render_sentence
+)
+from app.services.syllable_synth import synth_index
 
 router = APIRouter()
 
+MAX_BATCH_WORDS = 200
+
+class AudioRendition(BaseModel):
+    url: str
+    mime_type: str
+    size_bytes: int
+
 class PronunciationResponse(BaseModel):
     word: str
     phonetic: str
@@ -14,241 +29,234 @@ class PronunciationResponse(BaseModel):
     syllables: List[str]
     audio_url: Optional[str]
     tips: List[str]
+    audio_renditions: Optional[List[AudioRendition]] = None
+    audio_source: Optional[str] = None  # "native" or "synthesized"
 
-# Pronunciation database (in production, this would be in a real database)
-PRONUNCIATION_DATA: Dict[str, dict] = {
-    "aloha": {
-        "phonetic": "ah-LOH-hah",
-        "ipa": "[ɐˈloːhɐ]",
-        "syllables": ["a", "lo", "ha"],
-        "audio_file": "aloha.mp3",
-        "tips": [
-            "Stress on the second syllable 'LO'",
-            "Each vowel is pronounced separately",
-            "The 'a' sounds like 'ah' in 'father'"
-        ]
-    },
-    "mahalo": {
-        "phonetic": "mah-HAH-loh",
-        "ipa": "[mɐˈhaːlo]",
-        "syllables": ["ma", "ha", "lo"],
-        "audio_file": "mahalo.mp3",
-        "tips": [
-            "Stress on the second syllable 'HA'",
-            "The 'o' at the end is pronounced like 'oh'"
-        ]
-    },
-    "ohana": {
-        "phonetic": "oh-HAH-nah",
-        "ipa": "[oˈhaːnɐ]",
-        "syllables": ["o", "ha", "na"],
-        "audio_file": "ohana.mp3",
-        "tips": [
-            "Stress on the second syllable 'HA'",
-            "Each vowel is distinct"
-        ]
-    },
-    "keiki": {
-        "phonetic": "KAY-kee",
-        "ipa": "[ˈkejki]",
-        "syllables": ["kei", "ki"],
-        "audio_file": "keiki.mp3",
-        "tips": [
-            "Stress on the first syllable 'KAY'",
-            "The 'ei' makes an 'ay' sound"
-        ]
-    },
-    "wiki": {
-        "phonetic": "VEE-kee",
-        "ipa": "[ˈviki]",
-        "syllables": ["wi", "ki"],
-        "audio_file": "wiki.mp3",
-        "tips": [
-            "W sounds like 'v' before 'i'",
-            "Stress on the first syllable"
-        ]
-    }
-}
+class PronunciationBatchRequest(BaseModel):
+    words: Optional[List[str]] = Field(None, max_length=MAX_BATCH_WORDS)
+    text: Optional[str] = Field(None, max_length=2000)
 
-@router.get("/word/{word}", response_model=PronunciationResponse)
-async def get_pronunciation(word: str):
-    """Get pronunciation information for a Hawaiian word"""
-    word_lower = word.lower()
+class PronunciationBatchResponse(BaseModel):
+    items: List[PronunciationResponse]
+
+def audio_url_for(asset) -> str:
+    return f"/api/v1/pronunciation/audio/{audio_index.versioned_name(asset)}"
+
+def synth_url_for(asset) -> str:
+    return f"/api/v1/pronunciation/synth/{synth_index.versioned_name(asset)}"
+
+def with_synthesized_audio(response: PronunciationResponse) -> PronunciationResponse:
+    """Fill in audio assembled from syllable recordings when no native clip exists"""
+    if response.audio_url is None:
+        asset = synth_index.for_word(response.word)
+        if asset:
+            response.audio_url = synth_url_for(asset)
+            response.audio_source = "synthesized"
+    return response
+
+# Renditions every browser plays; Ogg/WebM only go to clients that say they accept them,
+# since Safari and older iOS can't play Opus
+PLAYABLE_AUDIO_TYPES = frozenset({"audio/mpeg", "audio/mp4", "audio/aac", "audio/wav"})
+
+def small_audio_types(request: Request, quality: Optional[str]) -> Optional[FrozenSet[str]]:
+    """MIME types to pick the smallest rendition from, or None for the default clip
+
+    Data saver clients and explicit low-quality requests get the smallest rendition
+    they can play.
+    """
+    if quality:
+        wanted = quality == "low"
+    else:
+        wanted = request.headers.get("save-data", "").lower() == "on" or \
+            request.headers.get("ect", "") in ("slow-2g", "2g", "3g")
+    if not wanted:
+        return None
+    accepted = {part.split(";")[0].strip().lower() for part in request.headers.get("accept", "").split(",")}
+    return PLAYABLE_AUDIO_TYPES | {t for t in accepted if t.startswith("audio/") and t != "audio/*"}
+
+def pronunciation_for(word: str, small_audio: Optional[FrozenSet[str]] = None) -> PronunciationResponse:
+    """Stored entry with its best audio, or generated data for unknown words
+
+    `small_audio` is the set of MIME types the client plays when it asked for the
+    smallest rendition.
+    """
+    entry = pronunciation_store.get(word)
     
-    if word_lower in PRONUNCIATION_DATA:
-        data = PRONUNCIATION_DATA[word_lower]
-        
-        # Check if audio file actually exists
+    if entry is not None:
+        # Only link audio the manifest knows is on disk, under its content-versioned name
         audio_url = None
-        if data.get("audio_file"):
-            audio_path = Path("static/audio/hawaiian") / data["audio_file"]
-            if audio_path.exists():
-                audio_url = f"/api/v1/pronunciation/audio/{data['audio_file']}"
+        renditions = None
+        asset = audio_index.get(entry.audio_file) if entry.audio_file else None
+        if asset:
+            variants = audio_index.renditions(asset.word)
+            if small_audio:
+                asset = next((v for v in variants if v.mime_type in small_audio), asset)
+            audio_url = audio_url_for(asset)
+            if len(variants) > 1:
+                renditions = [
+                    AudioRendition(url=audio_url_for(v), mime_type=v.mime_type, size_bytes=v.size)
+                    for v in variants
+                ]
         
-        return PronunciationResponse(
+        return with_synthesized_audio(PronunciationResponse(
             word=word,
-            phonetic=data["phonetic"],
-            ipa=data["ipa"],
-            syllables=data["syllables"],
+            phonetic=entry.phonetic,
+            ipa=entry.ipa,
+            syllables=list(entry.syllables),
             audio_url=audio_url,
-            tips=data["tips"]
-        )
+            tips=list(entry.tips),
+            audio_renditions=renditions,
+            audio_source="native" if audio_url else None
+        ))
     
     # Generate basic pronunciation data for unknown words
-    return generate_pronunciation(word)
+    return with_synthesized_audio(generate_pronunciation(word))
+
+@router.get("/word/{word}", response_model=PronunciationResponse)
+async def get_pronunciation(word: str, request: Request, quality: Optional[str] = None):
+    """Get pronunciation information for a Hawaiian word
+
+    Clients look known words up in the static bundles first; this covers the rest.
+    """
+    return pronunciation_for(word, small_audio_types(request, quality))
+
+@router.post("/batch", response_model=PronunciationBatchResponse)
+async def get_pronunciations(batch: PronunciationBatchRequest, request: Request, quality: Optional[str] = None):
+    """Pronunciations for a list of words and/or every word in a sentence, in one call
+
+    Each distinct word appears once, in first-seen order, with `word` echoing the
+    spelling that was sent.
+    """
+    words = list(dict.fromkeys(
+        [w.strip() for w in batch.words or [] if w.strip()] + words_in(batch.text or "")
+    ))
+    if not words:
+        raise HTTPException(status_code=400, detail="Provide words or text")
+    if len(words) > MAX_BATCH_WORDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_WORDS} words per request")
+    
+    small_audio = small_audio_types(request, quality)
+    return PronunciationBatchResponse(items=[pronunciation_for(word, small_audio) for word in words])
 
 def generate_pronunciation(word: str) -> PronunciationResponse:
     """Generate pronunciation data for words not in the database"""
-    syllables = break_into_syllables(word)
-    phonetic = generate_phonetic(word, syllables)
-    tips = generate_tips(word)
+    transcription = transcribe(word)
     
     return PronunciationResponse(
         word=word,
-        phonetic=phonetic,
-        ipa=generate_ipa(word),
-        syllables=syllables,
+        phonetic=transcription.phonetic,
+        ipa=transcription.ipa,
+        syllables=list(transcription.syllables),
         audio_url=None,
-        tips=tips
+        tips=list(transcription.tips)
     )
 
 def break_into_syllables(word: str) -> List[str]:
     """Break Hawaiian word into syllables"""
-    syllables = []
-    current = ""
-    vowels = "aeiouāēīōū"
-    
-    for i, char in enumerate(word.lower()):
-        current += char
-        
-        # Check if current char is a vowel
-        if char in vowels:
-            # Look ahead to see if next char is also a vowel
-            if i + 1 < len(word) and word[i + 1] not in vowels:
-                syllables.append(current)
-                current = ""
-            elif i + 1 == len(word):
-                syllables.append(current)
-                
-    if current:
-        syllables.append(current)
-        
-    return syllables
+    return list(transcribe(word).syllables)
 
-def generate_phonetic(word: str, syllables: List[str]) -> str:
+def generate_phonetic(word: str) -> str:
     """Generate phonetic pronunciation"""
-    phonetic_parts = []
-    
-    for i, syllable in enumerate(syllables):
-        phonetic = syllable
-        
-        # Apply basic rules
-        phonetic = phonetic.replace('a', 'ah')
-        phonetic = phonetic.replace('e', 'eh')
-        phonetic = phonetic.replace('i', 'ee')
-        phonetic = phonetic.replace('o', 'oh')
-        phonetic = phonetic.replace('u', 'oo')
-        
-        # W before i/e becomes V
-        phonetic = phonetic.replace('wee', 'vee')
-        phonetic = phonetic.replace('weh', 'veh')
-        
-        # Apply stress to penultimate syllable
-        if len(syllables) > 1 and i == len(syllables) - 2:
-            phonetic = phonetic.upper()
-            
-        phonetic_parts.append(phonetic)
-    
-    return "-".join(phonetic_parts)
+    return transcribe(word).phonetic
 
 def generate_ipa(word: str) -> str:
     """Generate IPA representation"""
-    ipa_map = {
-        'a': 'ɐ', 'ā': 'aː',
-        'e': 'ɛ', 'ē': 'eː',
-        'i': 'i', 'ī': 'iː',
-        'o': 'o', 'ō': 'oː',
-        'u': 'u', 'ū': 'uː',
-        'h': 'h', 'k': 'k', 'l': 'l',
-        'm': 'm', 'n': 'n', 'p': 'p',
-        'w': 'w', 'ʻ': 'ʔ'
-    }
-    
-    ipa = ""
-    word_lower = word.lower()
-    
-    for i, char in enumerate(word_lower):
-        if char == 'w' and i + 1 < len(word_lower) and word_lower[i + 1] in 'ie':
-            ipa += 'v'
-        else:
-            ipa += ipa_map.get(char, char)
-    
-    return f"[{ipa}]"
+    return transcribe(word).ipa
 
 def generate_tips(word: str) -> List[str]:
     """Generate pronunciation tips based on word features"""
-    tips = []
-    word_lower = word.lower()
-    
-    # Check for W before i/e
-    if 'wi' in word_lower or 'we' in word_lower:
-        tips.append("W sounds like 'v' before i and e")
-    
-    # Check for ʻokina
-    if 'ʻ' in word:
-        tips.append("The ʻokina (ʻ) is a glottal stop - make a brief pause")
-    
-    # Check for macrons
-    if any(char in word for char in 'āēīōū'):
-        tips.append("Hold vowels with macrons (lines above) longer")
-    
-    # General tip for longer words
-    if len(word) > 4:
-        tips.append("Stress usually falls on the second-to-last syllable")
-    
-    # Check for diphthongs
-    vowels = "aeiou"
-    for i in range(len(word_lower) - 1):
-        if word_lower[i] in vowels and word_lower[i + 1] in vowels:
-            tips.append("Pronounce each vowel separately")
-            break
-    
-    return tips
+    return list(transcribe(word).tips)
 
 @router.get("/audio/{filename}")
-async def get_audio_file(filename: str):
-    """Serve pre-recorded audio files from native Hawaiian speakers"""
-    
+async def get_audio_file(filename: str, request: Request):
+    """Serve pre-recorded audio files from native Hawaiian speakers
+
+    Supports Range requests for seeking, ETag/Last-Modified revalidation, and
+    year-long immutable caching when requested by content-versioned name.
+    """
+    return serve_indexed_audio(
+        audio_index, filename, request,
+        f"Audio file not found. Native speaker recording needed for '{filename}'."
+    )
+
+@router.get("/synth/{filename}")
+async def get_synthesized_audio(filename: str, request: Request):
+    """Serve word audio pre-rendered from native syllable recordings"""
+    return serve_indexed_audio(
+        synth_index, filename, request,
+        f"No synthesized audio for '{filename}'. Run scripts/synthesize_audio.py build."
+    )
+
+def serve_indexed_audio(index, filename: str, request: Request, missing_detail: str):
     # Security: Ensure filename doesn't contain path traversal attempts
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    # Define the audio directory
-    audio_dir = Path("static/audio/hawaiian")
-    file_path = audio_dir / filename
+    asset, immutable = index.resolve(filename)
     
-    # Check if file exists
-    if not file_path.exists() or not file_path.is_file():
+    if asset is None:
         # Fallback message for missing audio
+        raise HTTPException(status_code=404, detail=missing_detail)
+    
+    return file_response(
+        request,
+        asset.path,
+        size=asset.size,
+        mtime=asset.mtime,
+        etag=make_etag(asset.sha256),
+        media_type=asset.mime_type,
+        cache_control=IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE
+    )
+
+@router.get("/bundles/{filename}")
+async def get_pronunciation_bundle(filename: str, request: Request):
+    """Serve the bundle manifest or a content-hashed pronunciation shard"""
+    bundle = bundle_index.get(filename)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    
+    gzipped = bundle.gzipped is not None and "gzip" in request.headers.get("accept-encoding", "")
+    variant = bundle.gzipped if gzipped else bundle.plain
+    extra_headers = {"Vary": "Accept-Encoding"}
+    if gzipped:
+        extra_headers["Content-Encoding"] = "gzip"
+    
+    return file_response(
+        request,
+        variant.path,
+        size=variant.size,
+        mtime=variant.mtime,
+        etag=make_etag(variant.sha256),
+        media_type="application/json",
+        cache_control=NO_CACHE if filename == MANIFEST_FILENAME else IMMUTABLE_CACHE,
+        extra_headers=extra_headers
+    )
+
+@router.get("/sentence")
+def get_sentence_audio(request: Request, text: str = Query(..., min_length=1, max_length=500)):
+    """Stitch the native speaker clips for each word of a phrase into one stream
+
+    Renders are cached on disk, so repeat plays of a lesson phrase are plain file hits.
+    """
+    try:
+        rendered = render_sentence(text)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except MissingAudioError as e:
         raise HTTPException(
             status_code=404,
-            detail=f"Audio file not found. Native speaker recording needed for '{filename}'."
+            detail={"message": "Native speaker recordings needed", "missing_words": e.words}
         )
+    except (AudioToolUnavailable, RenderTimedOut) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except RenderFailed as e:
+        raise HTTPException(status_code=502, detail=str(e))
     
-    # Determine content type based on file extension
-    content_type = "audio/mpeg"  # default for mp3
-    if filename.endswith(".wav"):
-        content_type = "audio/wav"
-    elif filename.endswith(".ogg"):
-        content_type = "audio/ogg"
-    elif filename.endswith(".m4a"):
-        content_type = "audio/mp4"
-    
-    return FileResponse(
-        path=file_path,
-        media_type=content_type,
-        headers={
-            "Cache-Control": "public, max-age=86400",  # Cache for 1 day
-            "Accept-Ranges": "bytes"  # Enable partial content for audio streaming
-        }
-    )
\ No newline at end of file
+    return file_response(
+        request,
+        rendered.path,
+        size=rendered.size,
+        mtime=rendered.mtime,
+        etag=make_etag(rendered.key),
+        media_type=RENDER_MIME_TYPE
+    )
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.db.base import get_db
+from app.models.user import User
+from app.schemas.review import (
+    DueCards,
+    ReviewCardsAdded,
+    ReviewCardsCreate,
+    ReviewGradeBatch,
+    ReviewGradeResult,
+    ReviewRebalance,
+    ReviewRebalanceResult
+)
+from app.services import review
+
+router = APIRouter()
+
+
+@router.get("/due", response_model=DueCards)
+def get_due_cards(
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The caller's next due review cards, most overdue first"""
+    return DueCards(cards=review.due_cards(db, current_user.id, limit))
+
+
+@router.post("/cards", response_model=ReviewCardsAdded)
+def add_review_cards(
+    request: ReviewCardsCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Start reviewing dictionary words or a lesson's vocabulary; words already on a card are skipped"""
+    cards = []
+    if request.dictionary_ids:
+        cards += review.dictionary_cards(db, request.dictionary_ids)
+    if request.lesson_ids:
+        cards += review.vocabulary_cards(db, request.lesson_ids)
+    added = review.add_cards(db, current_user.id, cards)
+    db.commit()
+    return ReviewCardsAdded(added=added)
+
+
+@router.post("/grades", response_model=ReviewGradeResult)
+def grade_review_cards(
+    batch: ReviewGradeBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply a batch of review grades (SM-2 quality 0-5) and return the rescheduled cards"""
+    try:
+        cards = review.grade_cards(db, current_user.id, batch.grades)
+    except review.UnknownCardsError as e:
+        raise HTTPException(status_code=400, detail={"message": "Unknown review cards", "card_ids": e.card_ids})
+    db.commit()
+    return ReviewGradeResult(graded=len(batch.grades), cards=cards)
+
+
+@router.post("/rebalance", response_model=ReviewRebalanceResult)
+def rebalance_review_cards(
+    request: ReviewRebalance,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Spread an overdue backlog so at most `max_per_day` cards are due each day"""
+    report = review.rebalance_overdue(db, current_user.id, request.max_per_day)
+    db.commit()
+    return ReviewRebalanceResult(**report._asdict())
@@ -1,18 +1,23 @@
 from typing import List, Optional
 import os
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.db.base import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_optional
 from app.models.user import User
 from app.models.translation import Translation
 from app.schemas.translation import (
     TranslationRequest,
     TranslationResponse,
     TranslationHistory,
+    TranslationSearchResult,
     WordOfTheDay
 )
+from app.services import events
 from app.services.translation import TranslationService
+from app.services.translation_search import search_history
+from app.services.translation_export import EXPORT_FORMATS, export_history
 from app.services.mock_translation import MockTranslationService
 from app.core.config import settings
 
@@ -21,7 +26,8 @@ router = APIRouter()
 
 @router.post("/translate", response_model=TranslationResponse)
 async def translate(
-    request: TranslationRequest
+    request: TranslationRequest,
+    current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     import logging
     import json
@@ -105,6 +111,38 @@ Return JSON:
             target_lang=request.target_language,
             include_cultural_context=request.include_cultural_context
         )
+
+        # Check if translation failed
+        if result.get('translation') == 'Translation temporarily unavailable':
+            error_message = result.get('error', 'Translation service error')
+            error_type = result.get('error_type', 'Unknown')
+            raise HTTPException(
+                status_code=503,
+                detail=f"{error_message} (Error type: {error_type})"
+            )
+
+        # Save to history if user is authenticated (the search index is maintained by the database)
+        if current_user and db:
+            translation_record = Translation(
+                user_id=current_user.id,
+                source_text=request.text,
+                translated_text=result.get('translation', ''),
+                source_language=request.source_language,
+                target_language=request.target_language,
+                cultural_context=result.get('cultural_context'),
+                word_meanings=result.get('word_breakdown', [])
+            )
+            db.add(translation_record)
+            db.flush()
+            events.publish(
+                db, events.TRANSLATION_CREATED, current_user.id,
+                translation_id=translation_record.id,
+                source_text=translation_record.source_text,
+                translated_text=translation_record.translated_text
+            )
+            db.commit()
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Translation error: {type(e).__name__}: {str(e)}")
         import traceback
@@ -126,29 +164,6 @@ Return JSON:
             except:
                 pass
     
-    # Check if translation failed
-    if result.get('translation') == 'Translation temporarily unavailable':
-        error_message = result.get('error', 'Translation service error')
-        error_type = result.get('error_type', 'Unknown')
-        raise HTTPException(
-            status_code=503,
-            detail=f"{error_message} (Error type: {error_type})"
-        )
-    
-    # Save to history if user is authenticated
-    if current_user:
-        translation_record = Translation(
-            user_id=current_user.id,
-            source_text=request.text,
-            translated_text=result.get('translation', ''),
-            source_language=request.source_language,
-            target_language=request.target_language,
-            cultural_context=result.get('cultural_context'),
-            word_meanings=result.get('word_breakdown', [])
-        )
-        db.add(translation_record)
-        db.commit()
-    
     return TranslationResponse(**result)
 
 
@@ -166,6 +181,44 @@ def get_translation_history(
     return translations
 
 
+@router.get("/history/search", response_model=List[TranslationSearchResult])
+def search_translation_history(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(20, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Ranked search over the user's history; matches are wrapped in <mark> tags"""
+    return search_history(db, current_user.id, q, limit=limit, skip=skip)
+
+
+@router.get("/history/export")
+def export_translation_history(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    after_id: int = 0,
+    user_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the full history; resume by passing the last exported id as after_id"""
+    if user_id is not None and user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    owner_id = user_id if user_id is not None else current_user.id
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"translations-{owner_id}.{extension}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        export_history(owner_id, export_format=format, after_id=after_id, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.post("/history/{translation_id}/favorite")
 def toggle_favorite(
     translation_id: int,
@@ -28,9 +28,38 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     
+    # Translation retention
+    TRANSLATION_ANON_RETENTION_MONTHS: int = 3
+    TRANSLATION_USER_RETENTION_MONTHS: Optional[int] = None  # Keep user history forever by default
+    TRANSLATION_PARTITION_MONTHS_AHEAD: int = 3
+    TRANSLATION_ARCHIVE_DIR: str = "archive/translations"
+    WORD_FREQUENCY_FLUSH_SECONDS: int = 10  # Committed translations' word counts are written this often
+    
+    # Native speaker audio
+    AUDIO_DIR: str = "static/audio/hawaiian"
+    AUDIO_INDEX_REFRESH_SECONDS: int = 10
+    AUDIO_RENDER_CACHE_DIR: str = "static/audio/cache/sentences"
+    AUDIO_RENDER_CACHE_MAX_MB: int = 512
+    SYLLABLE_UNITS_DIR: str = "static/audio/syllables"
+    SYNTH_AUDIO_DIR: str = "static/audio/synth"
+    
+    # Pronunciation cache
+    PRONUNCIATION_CACHE_POLL_SECONDS: int = 30
+    PRONUNCIATION_BUNDLE_DIR: str = "static/pronunciation"
+    
+    # Offline study packs
+    OFFLINE_PACK_DIR: str = "static/packs"
+    
     # Redis
     REDIS_URL: Optional[str] = None
     
+    # Leaderboards (Redis sorted sets when REDIS_URL is set, in-process otherwise)
+    LEADERBOARD_WEEKS_KEPT: int = 5
+    LEADERBOARD_REFRESH_SECONDS: int = 30  # Boards re-apply recent awards (other workers', failed pushes) this often
+    
+    # Streaks (days follow the user's preferences["timezone"], or this default)
+    DEFAULT_TIMEZONE: str = "Pacific/Honolulu"
+    
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     
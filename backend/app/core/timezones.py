@@ -0,0 +1,10 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+def is_timezone(name: str) -> bool:
+    """Whether `name` is an IANA timezone zoneinfo can load"""
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
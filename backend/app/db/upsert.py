@@ -0,0 +1,19 @@
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(bind, table):
+    """Return an INSERT for the bound dialect that supports on_conflict_do_update/nothing"""
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    if bind.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upsert is not supported on {bind.dialect.name}")
+
+
+def greatest(bind, *columns):
+    """GREATEST() for the bound dialect, ignoring NULL arguments the way Postgres does"""
+    if bind.dialect.name == "postgresql":
+        return func.greatest(*columns)
+    # SQLite's multi-argument max() returns NULL if any argument is NULL
+    return func.max(*[func.coalesce(column, *[other for other in columns if other is not column]) for column in columns])
@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1 import auth, translation, pronunciation
+from app.api.v1 import auth, translation, pronunciation, lessons, progress, leaderboard, review, me, admin
 from app.db.base import engine, Base, wait_for_db
 import logging
 
@@ -9,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 # Import all models so SQLAlchemy knows about them
 try:
-    from app.models import user, lesson, translation as translation_model, progress
+    from app.models import user, lesson, translation as translation_model, progress as progress_model, pronunciation as pronunciation_model, leaderboard as leaderboard_model, review as review_model, dashboard as dashboard_model, analytics as analytics_model
     logger.info("Models imported successfully")
 except Exception as e:
     logger.error(f"Failed to import models: {e}")
@@ -21,11 +21,46 @@ try:
     logger.info("Creating database tables...")
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created successfully")
+
+    from app.services.progress import ensure_progress_columns
+    from app.services.study_rollups import ensure_rollup_columns
+    from app.services.translation_retention import ensure_translation_partitions
+    from app.services.translation_search import ensure_search_index
+    ensure_progress_columns(engine)
+    ensure_rollup_columns(engine)
+    ensure_translation_partitions(engine)
+    ensure_search_index(engine)
+
+    from app.db.base import SessionLocal
+    from app.services.achievements import seed_achievements
+    from app.services.change_counters import change_listener
+    from app.services.pronunciation_store import pronunciation_store, seed_pronunciations
+    db = SessionLocal()
+    try:
+        seed_achievements(db)
+        seed_pronunciations(db)
+        pronunciation_store.load(db)
+    finally:
+        db.close()
+    change_listener.start(engine)
 except Exception as e:
     logger.error(f"Failed to initialize database: {e}")
     # Don't fail the application startup, let it try to connect later
     logger.warning("Application starting without database initialization")
 
+# Index native speaker audio, synthesized audio, pronunciation bundles and offline packs so requests never stat the filesystem
+try:
+    from app.services.audio_index import audio_index
+    from app.services.syllable_synth import synth_index
+    audio_index.build()
+    synth_index.build()
+    from app.services.pronunciation_bundles import bundle_index
+    bundle_index.build()
+    from app.services.offline_packs import pack_index
+    pack_index.build()
+except Exception as e:
+    logger.error(f"Failed to index audio files: {e}")
+
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
@@ -54,10 +89,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Register domain event subscribers
+from app.services import achievements, dashboard, review as review_service, streaks, word_frequency  # noqa: F401
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
 app.include_router(translation.router, prefix="/api/v1/translation", tags=["translation"])
 app.include_router(pronunciation.router, prefix="/api/v1/pronunciation", tags=["pronunciation"])
+app.include_router(lessons.router, prefix="/api/v1/lessons", tags=["lessons"])
+app.include_router(progress.router, prefix="/api/v1/progress", tags=["progress"])
+app.include_router(leaderboard.router, prefix="/api/v1/leaderboard", tags=["leaderboard"])
+app.include_router(review.router, prefix="/api/v1/review", tags=["review"])
+app.include_router(me.router, prefix="/api/v1/me", tags=["me"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 # Debug router (only in development)
 if settings.DEBUG:
@@ -1,18 +1,40 @@
 from app.models.user import User
-from app.models.lesson import Lesson, LessonContent, LessonLevel, LessonType
-from app.models.translation import Translation, Dictionary
-from app.models.progress import UserProgress, Achievement, UserAchievement, StudySession
+from app.models.lesson import Lesson, LessonContent, LessonPayload, LessonChange, LessonLevel, LessonType
+from app.models.translation import Translation, Dictionary, PhraseFrequency, WordFrequency
+from app.models.pronunciation import Pronunciation, DictionaryPronunciation, ChangeCounter
+from app.models.progress import UserProgress, Achievement, UserAchievement, StudySession, UserCounter, UserStreak, ProgressBatch
+from app.models.leaderboard import WeeklyPoints, Classroom, ClassroomMember
+from app.models.review import ReviewCard
+from app.models.dashboard import UserDashboard
+from app.models.analytics import StudyRollup, RollupWatermark
 
 __all__ = [
     "User",
     "Lesson",
     "LessonContent", 
+    "LessonPayload",
+    "LessonChange",
     "LessonLevel",
     "LessonType",
     "Translation",
     "Dictionary",
+    "PhraseFrequency",
+    "WordFrequency",
+    "Pronunciation",
+    "DictionaryPronunciation",
+    "ChangeCounter",
     "UserProgress",
     "Achievement",
     "UserAchievement",
-    "StudySession"
+    "StudySession",
+    "UserCounter",
+    "UserStreak",
+    "ProgressBatch",
+    "WeeklyPoints",
+    "Classroom",
+    "ClassroomMember",
+    "ReviewCard",
+    "UserDashboard",
+    "StudyRollup",
+    "RollupWatermark"
 ]
\ No newline at end of file
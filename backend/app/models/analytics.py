@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class StudyRollup(Base):
+    """Study session totals per hour or day (UTC) for one learner, one class, or everyone"""
+    __tablename__ = "study_rollups"
+
+    # The primary key order makes a chart one range scan: period, scope, scope_id, then time
+    period = Column(String, primary_key=True)  # hour, day
+    scope = Column(String, primary_key=True)  # user, class, all
+    scope_id = Column(Integer, primary_key=True)  # User or classroom id; 0 for all
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+
+    sessions = Column(Integer, nullable=False, default=0)
+    minutes = Column(Integer, nullable=False, default=0)
+    translations = Column(Integer, nullable=False, default=0)
+    exercises = Column(Integer, nullable=False, default=0)
+
+
+class RollupWatermark(Base):
+    """How far a rollup job has read its source table"""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    last_id = Column(BigInteger, nullable=False, default=0)  # Rows up to this id are rolled up
+    horizon_id = Column(BigInteger, nullable=False, default=0)  # Highest id seen by the previous run
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class UserDashboard(Base):
+    """Everything the dashboard shows for one user, kept current by domain events"""
+    __tablename__ = "user_dashboards"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # Totals
+    total_points = Column(Integer, nullable=False, default=0)
+    lessons_completed = Column(Integer, nullable=False, default=0)
+    translations_made = Column(Integer, nullable=False, default=0)
+    study_sessions = Column(Integer, nullable=False, default=0)
+    study_minutes = Column(Integer, nullable=False, default=0)
+    achievements_count = Column(Integer, nullable=False, default=0)
+
+    # Streak; current_streak reads as 0 once streak_breaks_at has passed
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    streak_breaks_at = Column(DateTime(timezone=True))
+
+    # Newest first
+    recent_translations = Column(JSON, default=[])
+    recent_achievements = Column(JSON, default=[])
+
+    # Earliest due times of the user's review cards (ISO strings, capped), so due counts need no query
+    review_due_times = Column(JSON, default=[])
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
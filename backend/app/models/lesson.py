@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, JSON, Float, Enum, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, JSON, Float, Enum, ForeignKey, DateTime, LargeBinary, BigInteger
 from sqlalchemy.sql import func
 from app.db.base import Base
 import enum
@@ -78,4 +78,27 @@ class LessonContent(Base):
     
     # Media
     audio_url = Column(String)
-    image_url = Column(String)
\ No newline at end of file
+    image_url = Column(String)
+
+
+class LessonPayload(Base):
+    """Pre-serialized lesson API responses, rebuilt when their source rows change"""
+    __tablename__ = "lesson_payloads"
+    
+    key = Column(String, primary_key=True)  # "index" or a lesson uuid
+    source_version = Column(String, nullable=False)
+    etag = Column(String, nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    body_gzip = Column(LargeBinary, nullable=False)
+    built_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class LessonChange(Base):
+    """Latest content version per lesson, kept after deletion so clients can sync deltas"""
+    __tablename__ = "lesson_changes"
+    
+    lesson_id = Column(Integer, primary_key=True)  # No FK: rows outlive deleted lessons
+    lesson_uuid = Column(String, nullable=False, unique=True)
+    content_version = Column(BigInteger, nullable=False, index=True)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
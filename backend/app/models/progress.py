@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, ForeignKey, Boolean, Float, JSON, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -15,7 +15,8 @@ class UserProgress(Base):
     is_completed = Column(Boolean, default=False)
     completion_percentage = Column(Float, default=0.0)
     score = Column(Float)  # Quiz/exercise score
-    time_spent_minutes = Column(Integer, default=0)
+    time_spent_minutes = Column(Integer, default=0)  # Whole minutes of time_spent_seconds
+    time_spent_seconds = Column(Integer, default=0)
     
     # Attempts
     attempts = Column(Integer, default=0)
@@ -99,4 +100,32 @@ class StudySession(Base):
     points_earned = Column(Integer, default=0)
     
     # Relations
-    user = relationship("User", backref="study_sessions")
\ No newline at end of file
+    user = relationship("User", backref="study_sessions")
+
+
+class UserCounter(Base):
+    """Running per-user totals (lessons completed, translations made, ...) that achievements test against"""
+    __tablename__ = "user_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String, primary_key=True)  # An achievement requirement_type, optionally qualified
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class UserStreak(Base):
+    """When a user was last active, in their own calendar, and when their streak lapses"""
+    __tablename__ = "user_streaks"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    last_active_date = Column(Date, nullable=False)  # Local date in the user's timezone
+    breaks_at = Column(DateTime(timezone=True), index=True)  # Local midnight ending the day after; null once reset
+
+
+class ProgressBatch(Base):
+    """Progress event batches already applied, so a retried upload isn't counted twice"""
+    __tablename__ = "progress_batches"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    batch_id = Column(String(64), primary_key=True)  # Chosen by the client
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,62 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+
+class Pronunciation(Base):
+    __tablename__ = "pronunciations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    dictionary_id = Column(Integer, ForeignKey("dictionary.id"), nullable=True, index=True)
+    
+    # Lookup key (see app.services.hawaiian_text.normalize_word) and display form
+    word = Column(String, unique=True, index=True, nullable=False)
+    display_word = Column(String, nullable=False)
+    
+    # Pronunciation data
+    phonetic = Column(String, nullable=False)
+    ipa = Column(String, nullable=False)
+    syllables = Column(JSON, default=[])
+    tips = Column(JSON, default=[])
+    
+    # Native speaker recording in static/audio/hawaiian
+    audio_file = Column(String)
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relations
+    dictionary = relationship("Dictionary", backref="pronunciations")
+
+
+class DictionaryPronunciation(Base):
+    """Engine output for a dictionary row and the row version it was computed from
+    
+    Written by scripts/precompute_pronunciations.py, which uses it to skip rows that
+    have not changed since their last run. The pronunciation store serves current
+    rows for dictionary words without a curated `pronunciations` entry.
+    """
+    __tablename__ = "dictionary_pronunciations"
+    
+    dictionary_id = Column(Integer, ForeignKey("dictionary.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Dictionary.updated_at (created_at for never-edited rows) at computation time
+    source_updated_at = Column(DateTime(timezone=True))
+    engine_version = Column(Integer, nullable=False)
+    
+    phonetic = Column(String, nullable=False)
+    ipa = Column(String, nullable=False)
+    syllables = Column(JSON, default=[])
+    tips = Column(JSON, default=[])
+    
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ChangeCounter(Base):
+    """Named monotonically increasing counters used to invalidate caches across workers"""
+    __tablename__ = "change_counters"
+    
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class ReviewCard(Base):
+    """A word a learner is memorizing, scheduled with SM-2"""
+    __tablename__ = "review_cards"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    # Card face, copied so the due queue needs no joins
+    word = Column(String, nullable=False)  # Normalized Hawaiian word; one card per word per user
+    translation = Column(String, nullable=False)
+    dictionary_id = Column(Integer, ForeignKey("dictionary.id", ondelete="SET NULL"))
+    lesson_id = Column(Integer, ForeignKey("lessons.id", ondelete="SET NULL"))  # Lesson that introduced it
+
+    # Scheduling state
+    ease = Column(Float, nullable=False, default=2.5)
+    interval_days = Column(Float, nullable=False, default=0)
+    repetitions = Column(Integer, nullable=False, default=0)  # Successful reviews in a row
+    lapses = Column(Integer, nullable=False, default=0)
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    last_reviewed_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "word"),
+        Index("ix_review_cards_user_due", "user_id", "due_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, JSON, Boolean, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -27,6 +27,9 @@ class Translation(Base):
     # Relations
     user = relationship("User", backref="translations")
 
+    # Per-user history is always read newest first
+    __table_args__ = (Index("ix_translations_user_created", "user_id", "created_at"),)
+
 
 class Dictionary(Base):
     __tablename__ = "dictionary"
@@ -57,4 +60,34 @@ class Dictionary(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class PhraseFrequency(Base):
+    """Monthly counts of anonymous translations, kept after the raw rows are archived"""
+    __tablename__ = "phrase_frequencies"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # sha256 of the normalized phrase pair, so long texts stay out of the unique index
+    phrase_hash = Column(String(64), nullable=False)
+    period = Column(Date, nullable=False)  # First day of the month
+
+    source_language = Column(String, nullable=False)
+    target_language = Column(String, nullable=False)
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+
+    count = Column(Integer, default=0, nullable=False)
+    first_seen = Column(DateTime(timezone=True))
+    last_seen = Column(DateTime(timezone=True))
+
+    __table_args__ = (UniqueConstraint('phrase_hash', 'period'),)
+
+
+class WordFrequency(Base):
+    """How often each folded word appears in translations, counted as they are saved"""
+    __tablename__ = "word_frequencies"
+
+    word = Column(String, primary_key=True)  # fold_word key
+    count = Column(Integer, default=0, nullable=False)
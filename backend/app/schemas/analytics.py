@@ -0,0 +1,32 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class StudyBucket(BaseModel):
+    bucket_start: datetime
+    sessions: int
+    minutes: int
+    translations: int
+    exercises: int
+
+    class Config:
+        from_attributes = True
+
+
+class StudyTotals(BaseModel):
+    sessions: int = 0
+    minutes: int = 0
+    translations: int = 0
+    exercises: int = 0
+
+
+class StudySeries(BaseModel):
+    scope: str
+    scope_id: int
+    period: str
+    start: datetime
+    end: datetime
+    totals: StudyTotals
+    buckets: List[StudyBucket]  # Only buckets with activity, oldest first
+    rolled_up_at: Optional[datetime] = None  # Sessions recorded after this aren't counted yet
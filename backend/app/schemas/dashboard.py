@@ -0,0 +1,37 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class DashboardTranslation(BaseModel):
+    id: int
+    source_text: str
+    translated_text: str
+    created_at: Optional[datetime] = None
+
+
+class DashboardAchievement(BaseModel):
+    id: int
+    name: str
+    name_hawaiian: Optional[str] = None
+    description: Optional[str] = None
+    icon_name: Optional[str] = None
+    badge_tier: Optional[str] = None
+    unlocked_at: Optional[datetime] = None
+
+
+class DashboardResponse(BaseModel):
+    total_points: int
+    current_streak: int
+    longest_streak: int
+    lessons_completed: int
+    translations_made: int
+    study_sessions: int
+    study_minutes: int
+    achievements_count: int
+    recent_translations: List[DashboardTranslation]
+    recent_achievements: List[DashboardAchievement]
+    reviews_due: int
+    reviews_due_capped: bool = False  # True when at least `reviews_due` cards are due
+    next_review_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
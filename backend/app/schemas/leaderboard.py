@@ -0,0 +1,38 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from datetime import date
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: str
+    full_name: Optional[str] = None
+    points: int
+
+
+class LeaderboardResponse(BaseModel):
+    scope: str
+    week_start: Optional[date] = None
+    class_id: Optional[int] = None
+    total: int
+    entries: List[LeaderboardEntry]
+    me: Optional[LeaderboardEntry] = None
+
+
+class ClassroomCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+
+
+class ClassroomJoin(BaseModel):
+    join_code: str = Field(..., min_length=4, max_length=16)
+
+
+class ClassroomResponse(BaseModel):
+    id: int
+    name: str
+    join_code: str
+    teacher_id: int
+
+    class Config:
+        from_attributes = True
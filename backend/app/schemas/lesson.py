@@ -0,0 +1,16 @@
+from typing import List, Literal
+from pydantic import BaseModel
+
+
+class CourseMapLesson(BaseModel):
+    lesson_id: int
+    status: Literal["completed", "available", "locked"]
+    missing_prerequisites: List[int] = []  # Prerequisites still to complete, when locked
+
+
+class CourseMap(BaseModel):
+    version: int  # Lessons content version the graph was compiled from
+    completed: int
+    available: int
+    total: int
+    lessons: List[CourseMapLesson]  # Prerequisites always come before the lessons that need them
@@ -0,0 +1,69 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+MAX_PROGRESS_EVENTS = 500
+MAX_SESSION_LESSONS = 100
+
+
+class ProgressEvent(BaseModel):
+    lesson_id: int
+    type: Literal["exercise_completed", "lesson_completed", "time_spent"]
+    score: Optional[float] = Field(None, ge=0, le=100)  # Exercise or quiz score, 0-100
+    completion_percentage: Optional[float] = Field(None, ge=0, le=100)
+    time_spent_seconds: int = Field(0, ge=0, le=6 * 60 * 60)
+    occurred_at: Optional[datetime] = None
+
+
+class ProgressEventBatch(BaseModel):
+    events: List[ProgressEvent] = Field(..., min_length=1, max_length=MAX_PROGRESS_EVENTS)
+    batch_id: Optional[str] = Field(None, min_length=1, max_length=64)  # Resend the same id when retrying
+
+
+class LessonProgress(BaseModel):
+    lesson_id: int
+    is_completed: bool
+    completion_percentage: float
+    score: Optional[float]
+    best_score: Optional[float]
+    attempts: int
+    time_spent_minutes: int
+    completed_at: Optional[datetime]
+    newly_completed: bool = False
+
+
+class AchievementUnlocked(BaseModel):
+    id: int
+    name: str
+    name_hawaiian: Optional[str] = None
+    description: Optional[str] = None
+    icon_name: Optional[str] = None
+    badge_tier: Optional[str] = None
+    points_value: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+class ProgressEventResult(BaseModel):
+    applied: int
+    lessons: List[LessonProgress]
+    points_awarded: int = 0
+    total_points: Optional[int] = None
+    achievements_unlocked: List[AchievementUnlocked] = []
+
+
+class StudySessionCreate(BaseModel):
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    duration_minutes: int = Field(..., ge=1, le=24 * 60)
+    lessons_studied: List[int] = Field([], max_length=MAX_SESSION_LESSONS)
+    translations_made: int = Field(0, ge=0)
+    exercises_completed: int = Field(0, ge=0)
+
+
+class StudySessionResult(BaseModel):
+    id: int
+    duration_minutes: int
+    achievements_unlocked: List[AchievementUnlocked] = []
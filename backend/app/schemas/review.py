@@ -0,0 +1,61 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+MAX_REVIEW_GRADES = 1000
+
+
+class ReviewCard(BaseModel):
+    id: int
+    word: str
+    translation: str
+    dictionary_id: Optional[int] = None
+    lesson_id: Optional[int] = None
+    ease: float
+    interval_days: float
+    repetitions: int
+    lapses: int
+    due_at: datetime
+    last_reviewed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DueCards(BaseModel):
+    cards: List[ReviewCard]
+
+
+class ReviewCardsCreate(BaseModel):
+    dictionary_ids: List[int] = Field([], max_length=500)
+    lesson_ids: List[int] = Field([], max_length=100)  # Adds each lesson's vocabulary
+
+
+class ReviewCardsAdded(BaseModel):
+    added: int
+
+
+class ReviewGrade(BaseModel):
+    card_id: int
+    grade: int = Field(..., ge=0, le=5)  # SM-2 quality: 0 blackout ... 5 perfect recall
+    reviewed_at: Optional[datetime] = None
+
+
+class ReviewGradeBatch(BaseModel):
+    grades: List[ReviewGrade] = Field(..., min_length=1, max_length=MAX_REVIEW_GRADES)
+
+
+class ReviewGradeResult(BaseModel):
+    graded: int
+    cards: List[ReviewCard]
+
+
+class ReviewRebalance(BaseModel):
+    max_per_day: int = Field(50, ge=1, le=1000)
+
+
+class ReviewRebalanceResult(BaseModel):
+    overdue: int
+    rescheduled: int
+    days: int
@@ -41,6 +41,12 @@ class TranslationHistory(BaseModel):
         from_attributes = True
 
 
+class TranslationSearchResult(TranslationHistory):
+    rank: float
+    source_highlight: str  # HTML-escaped, matches wrapped in <mark>
+    translated_highlight: str
+
+
 class DictionaryEntry(BaseModel):
     hawaiian_word: str
     english_translation: str
@@ -1,6 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import List, Optional
+from pydantic import BaseModel, EmailStr, field_validator
 from datetime import datetime
+from app.core.timezones import is_timezone
 
 
 class UserBase(BaseModel):
@@ -14,6 +15,14 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     password: str
+    timezone: Optional[str] = None  # IANA name, e.g. Pacific/Honolulu; streak days follow it
+
+    @field_validator("timezone")
+    @classmethod
+    def known_timezone(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and not is_timezone(value):
+            raise ValueError(f"Unknown timezone: {value}")
+        return value
 
 
 class UserUpdate(BaseModel):
@@ -53,4 +62,21 @@ class Token(BaseModel):
 
 
 class TokenData(BaseModel):
-    username: Optional[str] = None
\ No newline at end of file
+    username: Optional[str] = None
+
+
+class UserImportRow(BaseModel):
+    line: int
+    email: Optional[str] = None
+    username: Optional[str] = None
+    status: str  # created, duplicate, invalid
+    error: Optional[str] = None
+    user_id: Optional[int] = None
+    password: Optional[str] = None  # Generated password to hand out, for rows that had none
+
+
+class UserImportResult(BaseModel):
+    created: int
+    duplicates: int
+    invalid: int
+    rows: List[UserImportRow]
@@ -0,0 +1,369 @@
+"""
+Incremental achievement evaluation.
+
+Each user has running counters in `user_counters`, one per requirement type
+(lessons_completed, translations_made, study_minutes, ...), plus qualified
+variants such as `lessons_completed[lesson_type=culture]` for achievements whose
+`requirement_details` narrow the count. Event handlers bump only the counters an
+event touches, in one upsert that returns the new values, then look up the
+achievements whose threshold the counter just crossed in an in-memory index
+(sorted thresholds per counter, so the lookup is a bisect). Newly earned
+achievements are inserted in one batch with ON CONFLICT DO NOTHING, and their
+points are awarded. An event therefore costs O(affected achievements), no matter
+how many achievements or users exist.
+
+Counters start when this code is deployed; scripts/rebuild_achievements.py
+recomputes them from history and grants anything already earned.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from itertools import combinations
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.db.base import SessionLocal
+from app.db.upsert import dialect_insert, greatest
+from app.models.lesson import Lesson
+from app.models.progress import Achievement, StudySession, UserAchievement, UserCounter, UserProgress
+from app.models.translation import Translation
+from app.models.user import User
+from app.services import change_counters, events
+
+logger = logging.getLogger(__name__)
+
+COUNTER_NAME = "achievements"
+
+# requirement_details keys that select a narrower counter, in name order
+QUALIFIERS = ("lesson_type", "level")
+
+_UNLOCKED_KEY = "achievements_unlocked"
+
+DEFAULT_ACHIEVEMENTS = [
+    {
+        "name": "First Steps", "name_hawaiian": "Nā Kapuaʻi Mua",
+        "description": "Complete your first lesson", "icon_name": "footprints",
+        "requirement_type": "lessons_completed", "requirement_value": 1,
+        "points_value": 10, "badge_tier": "bronze",
+    },
+    {
+        "name": "Dedicated Student", "name_hawaiian": "Haumāna",
+        "description": "Complete 10 lessons", "icon_name": "book-open",
+        "requirement_type": "lessons_completed", "requirement_value": 10,
+        "points_value": 50, "badge_tier": "silver",
+    },
+    {
+        "name": "Culture Keeper",
+        "description": "Complete 5 culture lessons", "icon_name": "flower",
+        "requirement_type": "lessons_completed", "requirement_value": 5,
+        "requirement_details": {"lesson_type": "culture"},
+        "points_value": 75, "badge_tier": "silver",
+    },
+    {
+        "name": "Sharp Ear",
+        "description": "Answer 25 exercises perfectly", "icon_name": "target",
+        "requirement_type": "perfect_scores", "requirement_value": 25,
+        "points_value": 25, "badge_tier": "bronze",
+    },
+    {
+        "name": "Translator", "name_hawaiian": "Mea Unuhi",
+        "description": "Make 25 translations", "icon_name": "languages",
+        "requirement_type": "translations_made", "requirement_value": 25,
+        "points_value": 25, "badge_tier": "bronze",
+    },
+    {
+        "name": "Five Hours of Study",
+        "description": "Study for 300 minutes", "icon_name": "clock",
+        "requirement_type": "study_minutes", "requirement_value": 300,
+        "points_value": 100, "badge_tier": "gold",
+    },
+    {
+        "name": "Week of Practice", "name_hawaiian": "Hoʻomau",
+        "description": "Keep a 7 day streak", "icon_name": "flame",
+        "requirement_type": "streak_days", "requirement_value": 7,
+        "points_value": 70, "badge_tier": "silver",
+    },
+    {
+        "name": "Thousand Points",
+        "description": "Earn 1,000 points", "icon_name": "star",
+        "requirement_type": "points_earned", "requirement_value": 1000,
+        "points_value": 0, "badge_tier": "gold",
+    },
+]
+
+
+class Rule(NamedTuple):
+    achievement_id: int
+    threshold: int
+    points: int
+
+
+def counter_name(requirement_type: str, details: Optional[dict] = None) -> str:
+    """Counter an achievement tests, e.g. lessons_completed[lesson_type=culture]"""
+    details = details or {}
+    return requirement_type + "".join(
+        f"[{key}={str(details[key]).lower()}]" for key in QUALIFIERS if details.get(key) is not None
+    )
+
+
+def qualified_names(requirement_type: str, attributes: Dict[str, str]) -> List[str]:
+    """Every counter an event with these attributes counts towards"""
+    keys = [key for key in QUALIFIERS if attributes.get(key) is not None]
+    return [
+        counter_name(requirement_type, {key: attributes[key] for key in subset})
+        for size in range(len(keys) + 1)
+        for subset in combinations(keys, size)
+    ]
+
+
+class AchievementIndex:
+    """Active achievements grouped by counter with sorted thresholds, reloaded when achievements change"""
+
+    def __init__(self, poll_seconds: int = 30):
+        self.poll_seconds = poll_seconds
+        self._rules: Dict[str, Tuple[List[int], List[Rule]]] = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def crossed(self, db: Session, name: str, old: int, new: int) -> List[Rule]:
+        """Rules on counter `name` with old < threshold <= new"""
+        self._refresh_if_due(db)
+        thresholds, rules = self._rules.get(name, ((), ()))
+        return list(rules[bisect_right(thresholds, old):bisect_right(thresholds, new)])
+
+    def _refresh_if_due(self, db: Session):
+        if self._version is not None and time.monotonic() - self._checked_at < self.poll_seconds:
+            return
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = change_counters.read(db, COUNTER_NAME)
+            if version == self._version:
+                return
+
+            grouped: Dict[str, List[Rule]] = {}
+            for achievement in db.query(Achievement).filter(Achievement.is_active.is_(True)):
+                if not achievement.requirement_type or achievement.requirement_value is None:
+                    continue
+                name = counter_name(achievement.requirement_type, achievement.requirement_details)
+                grouped.setdefault(name, []).append(
+                    Rule(achievement.id, achievement.requirement_value, achievement.points_value or 0)
+                )
+            indexed = {}
+            for name, rules in grouped.items():
+                rules.sort(key=lambda rule: rule.threshold)
+                indexed[name] = ([rule.threshold for rule in rules], rules)
+            self._rules = indexed
+            self._version = version
+            logger.info(f"Loaded {sum(len(rules) for _, rules in self._rules.values())} achievement rules (version {version})")
+
+    def invalidate(self):
+        self._version = None
+
+
+achievement_index = AchievementIndex()
+
+
+def _write_counters(db: Session, user_id: int, values: Dict[str, int], increment: bool) -> Dict[str, int]:
+    """Upsert counters, adding to or raising the stored values; returns the new values"""
+    bind = db.get_bind()
+    table = UserCounter.__table__
+    insert = dialect_insert(bind, table).values([
+        {"user_id": user_id, "name": name, "value": value} for name, value in sorted(values.items())
+    ])
+    merged = table.c.value + insert.excluded.value if increment else greatest(bind, table.c.value, insert.excluded.value)
+    rows = db.execute(
+        insert.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.name],
+            set_={"value": merged}
+        ).returning(table.c.name, table.c.value)
+    )
+    return {name: value for name, value in rows}
+
+
+def record(db: Session, user_id: int, increments: Optional[Dict[str, int]] = None, maxima: Optional[Dict[str, int]] = None):
+    """Apply counter changes for one user and grant every achievement they complete"""
+    crossed: List[Tuple[Rule, int]] = []
+
+    increments = {name: value for name, value in (increments or {}).items() if value}
+    if increments:
+        for name, new in _write_counters(db, user_id, increments, increment=True).items():
+            crossed += [(rule, new) for rule in achievement_index.crossed(db, name, new - increments[name], new)]
+
+    maxima = {name: value for name, value in (maxima or {}).items() if value}
+    if maxima:
+        # The previous value isn't returned; re-offering already granted rules is a no-op below
+        for name, new in _write_counters(db, user_id, maxima, increment=False).items():
+            crossed += [(rule, new) for rule in achievement_index.crossed(db, name, 0, new)]
+
+    if crossed:
+        _grant(db, user_id, crossed)
+
+
+def _grant(db: Session, user_id: int, crossed: List[Tuple[Rule, int]]):
+    table = UserAchievement.__table__
+    insert = dialect_insert(db.get_bind(), table).values([
+        {"user_id": user_id, "achievement_id": rule.achievement_id, "progress_value": value}
+        for rule, value in crossed
+    ])
+    granted = set(db.execute(
+        insert.on_conflict_do_nothing(index_elements=[table.c.user_id, table.c.achievement_id])
+        .returning(table.c.achievement_id)
+    ).scalars())
+    if not granted:
+        return
+
+    db.info.setdefault(_UNLOCKED_KEY, []).extend(sorted(granted))
+    events.publish(db, events.ACHIEVEMENTS_UNLOCKED, user_id, achievement_ids=sorted(granted))
+    points = sum(rule.points for rule, _ in crossed if rule.achievement_id in granted)
+    if points:
+        from app.services.leaderboard import award_points
+        award_points(db, user_id, points)
+
+
+def pop_unlocked(db: Session) -> List[Achievement]:
+    """Achievements granted so far in this session's transaction"""
+    ids = db.info.pop(_UNLOCKED_KEY, [])
+    if not ids:
+        return []
+    return db.query(Achievement).filter(Achievement.id.in_(ids)).order_by(Achievement.id).all()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_unlocked(session: Session):
+    session.info.pop(_UNLOCKED_KEY, None)
+
+
+@events.subscribe(events.PROGRESS_RECORDED)
+def _on_progress(db: Session, event: events.Event):
+    increments = Counter()
+    for progress_event in event.data["events"]:
+        if progress_event.type == "exercise_completed":
+            increments["exercises_completed"] += 1
+        if progress_event.score == 100:
+            increments["perfect_scores"] += 1
+
+    completed = [update.lesson_id for update in event.data["updates"] if update.newly_completed]
+    if completed:
+        for lesson_type, level in db.execute(select(Lesson.lesson_type, Lesson.level).where(Lesson.id.in_(completed))):
+            for name in qualified_names("lessons_completed", {"lesson_type": lesson_type.value, "level": level.value}):
+                increments[name] += 1
+    record(db, event.user_id, increments)
+
+
+@events.subscribe(events.TRANSLATION_CREATED)
+def _on_translation(db: Session, event: events.Event):
+    record(db, event.user_id, {"translations_made": 1})
+
+
+@events.subscribe(events.STUDY_SESSION_RECORDED)
+def _on_study_session(db: Session, event: events.Event):
+    record(db, event.user_id, {"study_sessions": 1, "study_minutes": event.data.get("duration_minutes") or 0})
+
+
+@events.subscribe(events.POINTS_AWARDED)
+def _on_points(db: Session, event: events.Event):
+    record(db, event.user_id, {"points_earned": event.data["points"]})
+
+
+@events.subscribe(events.STREAK_UPDATED)
+def _on_streak(db: Session, event: events.Event):
+    record(db, event.user_id, maxima={"streak_days": event.data["longest_streak"]})
+
+
+def seed_achievements(db: Session):
+    """Add any built-in achievements missing from the table"""
+    table = Achievement.__table__
+    columns = {key for achievement in DEFAULT_ACHIEVEMENTS for key in achievement}
+    rows = [{column: achievement.get(column) for column in columns} for achievement in DEFAULT_ACHIEVEMENTS]
+    inserted = db.execute(
+        dialect_insert(db.get_bind(), table).values(rows)
+        .on_conflict_do_nothing(index_elements=[table.c.name])
+        .returning(table.c.id)
+    ).scalars().all()
+    if inserted:
+        change_counters.bump(db, COUNTER_NAME)
+        logger.info(f"Seeded {len(inserted)} achievements")
+    db.commit()
+
+
+class RebuildReport(NamedTuple):
+    counters: int
+    granted: int
+
+
+def _historical_counters(db: Session) -> Dict[Tuple[int, str], int]:
+    """Counter values recomputed from stored history, keyed by (user_id, name)"""
+    values: Counter = Counter()
+
+    completed = db.execute(
+        select(UserProgress.user_id, Lesson.lesson_type, Lesson.level, func.count())
+        .join(Lesson, Lesson.id == UserProgress.lesson_id)
+        .where(UserProgress.is_completed.is_(True))
+        .group_by(UserProgress.user_id, Lesson.lesson_type, Lesson.level)
+    )
+    for user_id, lesson_type, level, count in completed:
+        for name in qualified_names("lessons_completed", {"lesson_type": lesson_type.value, "level": level.value}):
+            values[user_id, name] += count
+
+    totals = [
+        ("translations_made", select(Translation.user_id, func.count())
+            .where(Translation.user_id.isnot(None)).group_by(Translation.user_id)),
+        ("study_sessions", select(StudySession.user_id, func.count()).group_by(StudySession.user_id)),
+        ("study_minutes", select(StudySession.user_id, func.sum(StudySession.duration_minutes))
+            .group_by(StudySession.user_id)),
+        ("points_earned", select(User.id, User.total_points)),
+        ("streak_days", select(User.id, User.longest_streak)),
+    ]
+    for name, query in totals:
+        for user_id, value in db.execute(query):
+            if value:
+                values[user_id, name] += value
+    return values
+
+
+def rebuild_achievements(db: Session, batch_size: int = 1000) -> RebuildReport:
+    """Recompute counters from history and grant every achievement already earned
+
+    Counters only move up: rows removed by translation retention don't take back
+    progress. exercises_completed and perfect_scores have no history to rebuild
+    from and keep their current values. Retroactive unlocks don't award points.
+    """
+    bind = db.get_bind()
+    table = UserCounter.__table__
+    rows = [
+        {"user_id": user_id, "name": name, "value": value}
+        for (user_id, name), value in sorted(_historical_counters(db).items())
+    ]
+    for start in range(0, len(rows), batch_size):
+        insert = dialect_insert(bind, table).values(rows[start:start + batch_size])
+        db.execute(insert.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.name],
+            set_={"value": greatest(bind, table.c.value, insert.excluded.value)}
+        ))
+
+    granted = 0
+    unlocks = UserAchievement.__table__
+    for achievement in db.query(Achievement).filter(Achievement.is_active.is_(True)):
+        if not achievement.requirement_type or achievement.requirement_value is None:
+            continue
+        earned = select(table.c.user_id, literal(achievement.id), table.c.value).where(
+            table.c.name == counter_name(achievement.requirement_type, achievement.requirement_details),
+            table.c.value >= achievement.requirement_value
+        )
+        result = db.execute(
+            dialect_insert(bind, unlocks)
+            .from_select([unlocks.c.user_id, unlocks.c.achievement_id, unlocks.c.progress_value], earned)
+            .on_conflict_do_nothing(index_elements=[unlocks.c.user_id, unlocks.c.achievement_id])
+        )
+        granted += max(result.rowcount, 0)
+    db.commit()
+    return RebuildReport(counters=len(rows), granted=granted)
+
+
+change_counters.change_listener.subscribe(COUNTER_NAME, achievement_index.invalidate)
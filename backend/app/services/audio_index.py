@@ -0,0 +1,261 @@
+"""
+In-memory manifest of the native speaker audio directory.
+
+The index is built at startup from a directory scan plus metadata.json and records
+size, mtime, sha256 and MIME type for every clip, so request handlers never touch
+the filesystem to find or describe a file. Content hashes are persisted in a small
+cache file keyed by (size, mtime) and only recomputed for files that changed.
+Every AUDIO_INDEX_REFRESH_SECONDS a lookup starts a background thread that stats
+every clip and metadata.json and, if any size or mtime moved, rebuilds the index
+and swaps it in whole; lookups only ever read memory.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.services.hawaiian_text import normalize_word
+
+logger = logging.getLogger(__name__)
+
+AUDIO_MIME_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".m4a": "audio/mp4",
+    ".aac": "audio/aac",
+    ".webm": "audio/webm",
+}
+
+# Hash prefix embedded in versioned names, e.g. aloha.3fa9c1d2e4b5.mp3
+VERSION_LENGTH = 12
+_VERSIONED_RE = re.compile(r"^(?P<stem>.+)\.(?P<version>[0-9a-f]{%d})(?P<suffix>\.[^.]+)$" % VERSION_LENGTH)
+
+METADATA_FILENAME = "metadata.json"
+HASH_CACHE_FILENAME = ".manifest_cache.json"
+
+
+class AudioAsset(NamedTuple):
+    filename: str
+    path: Path
+    size: int
+    mtime: float
+    sha256: str
+    mime_type: str
+    word: str
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _Snapshot(NamedTuple):
+    """One build of the index, swapped in whole so lookups never mix two builds"""
+    assets: Dict[str, AudioAsset]
+    by_word: Dict[str, str]
+    renditions: Dict[str, Tuple[str, ...]]
+
+
+class AudioIndex:
+    def __init__(self, directory, refresh_seconds: Optional[int] = None):
+        self.directory = Path(directory)
+        self.refresh_seconds = settings.AUDIO_INDEX_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self._snapshot = _Snapshot({}, {}, {})
+        self._signature: Tuple = ()
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        self._refresh_if_due()
+        return len(self._snapshot.assets)
+
+    def get(self, filename: str) -> Optional[AudioAsset]:
+        self._refresh_if_due()
+        return self._snapshot.assets.get(filename)
+
+    def resolve(self, name: str) -> Tuple[Optional[AudioAsset], bool]:
+        """Look up a plain or content-versioned filename
+
+        Returns the asset and whether the name pins its current content, in which
+        case the response can be cached forever.
+        """
+        asset = self.get(name)
+        if asset is not None:
+            return asset, False
+
+        match = _VERSIONED_RE.match(name)
+        if not match:
+            return None, False
+        asset = self.get(match.group("stem") + match.group("suffix"))
+        if asset is None:
+            return None, False
+        # An outdated version still plays, it just isn't cached as immutable
+        return asset, asset.sha256.startswith(match.group("version"))
+
+    @staticmethod
+    def versioned_name(asset: AudioAsset) -> str:
+        stem, suffix = os.path.splitext(asset.filename)
+        return f"{stem}.{asset.sha256[:VERSION_LENGTH]}{suffix}"
+
+    def for_word(self, word: str) -> Optional[AudioAsset]:
+        self._refresh_if_due()
+        snapshot = self._snapshot
+        filename = snapshot.by_word.get(normalize_word(word))
+        return snapshot.assets.get(filename) if filename else None
+
+    def renditions(self, word: str) -> List[AudioAsset]:
+        """Every encoding of a word's clip, smallest first"""
+        self._refresh_if_due()
+        snapshot = self._snapshot
+        return [snapshot.assets[name] for name in snapshot.renditions.get(normalize_word(word), ())]
+
+    def assets(self) -> List[AudioAsset]:
+        self._refresh_if_due()
+        return list(self._snapshot.assets.values())
+
+    def mime_type(self, filename: str) -> str:
+        return AUDIO_MIME_TYPES.get(Path(filename).suffix.lower(), "application/octet-stream")
+
+    def build(self):
+        with self._lock:
+            self._build()
+
+    def _signature_now(self) -> Tuple:
+        """Name, size and mtime of every clip plus the metadata mtime
+
+        Clips overwritten in place keep the directory mtime, so each one is stat-ed.
+        """
+        try:
+            entries = os.scandir(self.directory)
+        except FileNotFoundError:
+            return ()
+        with entries:
+            clips = frozenset(
+                (entry.name, stat.st_size, stat.st_mtime_ns)
+                for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in AUDIO_MIME_TYPES and entry.is_file()
+                for stat in (entry.stat(),)
+            )
+        try:
+            metadata_mtime = (self.directory / METADATA_FILENAME).stat().st_mtime_ns
+        except FileNotFoundError:
+            metadata_mtime = 0
+        return (clips, metadata_mtime)
+
+    def _build(self):
+        started = time.monotonic()
+        signature = self._signature_now()
+        hash_cache = self._load_hash_cache()
+        metadata = self._load_metadata()
+        words_by_file = {}
+        primary_files = set()
+        for key, info in metadata.items():
+            if info.get("filename"):
+                words_by_file[info["filename"]] = key
+                primary_files.add(info["filename"])
+            for rendition in info.get("renditions", []):
+                words_by_file[rendition["filename"]] = key
+
+        assets: Dict[str, AudioAsset] = {}
+        by_word: Dict[str, str] = {}
+        renditions: Dict[str, List[str]] = {}
+        new_cache = {}
+        hashed = 0
+
+        if signature:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    suffix = os.path.splitext(entry.name)[1].lower()
+                    if suffix not in AUDIO_MIME_TYPES or not entry.is_file():
+                        continue
+
+                    stat = entry.stat()
+                    cached = hash_cache.get(entry.name)
+                    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                        sha256 = cached[2]
+                    else:
+                        sha256 = file_sha256(Path(entry.path))
+                        hashed += 1
+                    new_cache[entry.name] = [stat.st_size, stat.st_mtime_ns, sha256]
+
+                    word = words_by_file.get(entry.name) or normalize_word(entry.name[:-len(suffix)])
+                    assets[entry.name] = AudioAsset(
+                        entry.name, Path(entry.path), stat.st_size, stat.st_mtime,
+                        sha256, AUDIO_MIME_TYPES[suffix], word
+                    )
+                    # Prefer the file metadata.json registers as the word's default clip
+                    if word not in by_word or entry.name in primary_files:
+                        by_word[word] = entry.name
+                    renditions.setdefault(word, []).append(entry.name)
+
+        if hashed or len(new_cache) != len(hash_cache):
+            self._save_hash_cache(new_cache)
+
+        self._snapshot = _Snapshot(assets, by_word, {
+            word: tuple(sorted(names, key=lambda name: assets[name].size))
+            for word, names in renditions.items()
+        })
+        self._signature = signature
+        self._checked_at = time.monotonic()
+        logger.info(
+            f"Indexed {len(assets)} audio files in {self.directory} "
+            f"({hashed} hashed, {time.monotonic() - started:.2f}s)"
+        )
+
+    def _refresh_if_due(self):
+        if time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        if not self._lock.acquire(blocking=False):
+            return  # Another thread is already refreshing; serve the current index
+
+        # Lookups run on the event loop from async handlers, so stat-ing and hashing
+        # clips happens on a background thread and this lookup serves the current index
+        self._checked_at = time.monotonic()
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        try:
+            if self._signature_now() != self._signature:
+                self._build()
+        except Exception as e:
+            logger.warning(f"Audio index refresh failed: {e}")
+        finally:
+            self._lock.release()
+
+    def _load_metadata(self) -> Dict:
+        try:
+            with open(self.directory / METADATA_FILENAME, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _load_hash_cache(self) -> Dict:
+        try:
+            with open(self.directory / HASH_CACHE_FILENAME, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_hash_cache(self, cache: Dict):
+        path = self.directory / HASH_CACHE_FILENAME
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write audio hash cache: {e}")
+
+
+audio_index = AudioIndex(settings.AUDIO_DIR)
@@ -0,0 +1,93 @@
+"""
+Named change counters for invalidating in-process caches across workers.
+
+Writers call `bump` inside their transaction. Every worker can poll `read` (a single
+primary-key lookup) and, on Postgres, also receives a NOTIFY on the
+`change_counters` channel as soon as the writer commits.
+"""
+import logging
+import select
+import threading
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import select as sql_select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.pronunciation import ChangeCounter
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "change_counters"
+
+
+def bump(db: Session, name: str) -> int:
+    """Increment a counter and return its new value; takes effect when the caller commits"""
+    table = ChangeCounter.__table__
+    insert = dialect_insert(db.get_bind(), table).values(name=name, version=1)
+    statement = insert.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={"version": table.c.version + 1}
+    ).returning(table.c.version)
+    version = db.execute(statement).scalar_one()
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Delivered to listeners only once the surrounding transaction commits
+        db.execute(text("SELECT pg_notify(:channel, :name)"), {"channel": CHANNEL, "name": name})
+    return version
+
+
+def read(db: Session, name: str) -> int:
+    version = db.execute(
+        sql_select(ChangeCounter.version).where(ChangeCounter.name == name)
+    ).scalar()
+    return version or 0
+
+
+class ChangeListener:
+    """Background LISTEN loop that fans Postgres notifications out to callbacks"""
+
+    def __init__(self):
+        self._callbacks: Dict[str, List[Callable[[], None]]] = {}
+        self._thread = None
+
+    def subscribe(self, name: str, callback: Callable[[], None]):
+        self._callbacks.setdefault(name, []).append(callback)
+
+    def start(self, engine: Engine):
+        if engine.dialect.name != "postgresql" or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(engine,), daemon=True)
+        self._thread.start()
+
+    def _run(self, engine: Engine):
+        while True:
+            try:
+                self._listen(engine)
+            except Exception as e:
+                logger.warning(f"Change listener disconnected: {e}. Reconnecting in 5s...")
+                time.sleep(5)
+
+    def _listen(self, engine: Engine):
+        connection = engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            dbapi_connection.cursor().execute(f"LISTEN {CHANNEL}")
+            logger.info(f"Listening for {CHANNEL} notifications")
+
+            while True:
+                if select.select([dbapi_connection], [], [], 60) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    for callback in self._callbacks.get(notify.payload, []):
+                        callback()
+        finally:
+            connection.invalidate()
+
+
+change_listener = ChangeListener()
@@ -0,0 +1,166 @@
+"""
+Course map: which lessons a learner has completed, can open, or has still locked.
+
+The prerequisite lists on published lessons are compiled once per content
+version into a DAG: lessons are put in topological order (Kahn's algorithm,
+ties broken by course order), each gets a bit position in that order, and each
+lesson's direct prerequisites become one integer bitmask. A learner's completed
+lessons become another bitmask, so a lesson is open when
+`requires & ~completed == 0` and the whole map is one pass of integer operations
+after a single query for the learner's completions.
+
+Prerequisites naming lessons that don't exist or aren't published are ignored.
+Lessons on a prerequisite cycle, or behind one, can never be opened; they are
+logged and reported as locked rather than breaking the map.
+"""
+import heapq
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.lesson import Lesson
+from app.models.progress import UserProgress
+from app.services import change_counters
+from app.services.lesson_sync import COUNTER_NAME
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = "completed"
+AVAILABLE = "available"
+LOCKED = "locked"
+
+
+class CourseGraph(NamedTuple):
+    version: int
+    lesson_ids: List[int]  # Topological order; bit i is lesson_ids[i]
+    positions: Dict[int, int]
+    requires: List[int]  # Bitmask of direct prerequisites per position
+    blocked: int  # Bitmask of lessons on or behind a cycle
+
+
+class MapEntry(NamedTuple):
+    lesson_id: int
+    status: str
+    missing_prerequisites: List[int]
+
+
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def compile_graph(lessons: Iterable[tuple], version: int = 0) -> CourseGraph:
+    """Build the graph from (lesson_id, order_index, prerequisites) rows"""
+    order = {}
+    prerequisites: Dict[int, Set[int]] = {}
+    for lesson_id, order_index, required in lessons:
+        order[lesson_id] = order_index if order_index is not None else lesson_id
+        prerequisites[lesson_id] = set(required or [])
+
+    dependents: Dict[int, List[int]] = {lesson_id: [] for lesson_id in order}
+    indegree = {}
+    for lesson_id, required in prerequisites.items():
+        unknown = required - order.keys()
+        if unknown:
+            logger.warning(f"Lesson {lesson_id} requires unknown lessons {sorted(unknown)}; ignoring them")
+            required -= unknown
+        required.discard(lesson_id)
+        indegree[lesson_id] = len(required)
+        for prerequisite in required:
+            dependents[prerequisite].append(lesson_id)
+
+    ready = [(order[lesson_id], lesson_id) for lesson_id, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    sorted_ids = []
+    while ready:
+        _, lesson_id = heapq.heappop(ready)
+        sorted_ids.append(lesson_id)
+        for dependent in dependents[lesson_id]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, (order[dependent], dependent))
+
+    cyclic = sorted((lesson_id for lesson_id in order if indegree[lesson_id] > 0), key=lambda lesson_id: order[lesson_id])
+    if cyclic:
+        logger.error(f"Lesson prerequisites form a cycle; locking lessons {cyclic}")
+    lesson_ids = sorted_ids + cyclic
+    positions = {lesson_id: position for position, lesson_id in enumerate(lesson_ids)}
+
+    requires = [0] * len(lesson_ids)
+    for lesson_id, required in prerequisites.items():
+        for prerequisite in required:
+            requires[positions[lesson_id]] |= 1 << positions[prerequisite]
+    blocked = sum(1 << positions[lesson_id] for lesson_id in cyclic)
+    return CourseGraph(version, lesson_ids, positions, requires, blocked)
+
+
+def course_map(graph: CourseGraph, completed_ids: Iterable[int]) -> List[MapEntry]:
+    """Every lesson's status for a learner, in topological order"""
+    done = 0
+    for lesson_id in completed_ids:
+        position = graph.positions.get(lesson_id)
+        if position is not None:
+            done |= 1 << position
+
+    entries = []
+    for position, lesson_id in enumerate(graph.lesson_ids):
+        bit = 1 << position
+        missing = graph.requires[position] & ~done
+        if done & bit:
+            status = COMPLETED
+        elif missing or graph.blocked & bit:
+            status = LOCKED
+        else:
+            status = AVAILABLE
+        missing_ids = [graph.lesson_ids[index] for index in _bits(missing)] if status == LOCKED else []
+        entries.append(MapEntry(lesson_id, status, missing_ids))
+    return entries
+
+
+class CourseGraphCache:
+    """The compiled graph for the current lessons content version"""
+
+    def __init__(self, poll_seconds: int = 30):
+        self.poll_seconds = poll_seconds
+        self._graph: Optional[CourseGraph] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CourseGraph:
+        graph = self._graph
+        if graph is not None and time.monotonic() - self._checked_at < self.poll_seconds:
+            return graph
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = change_counters.read(db, COUNTER_NAME)
+            if self._graph is None or self._graph.version != version:
+                rows = db.execute(
+                    select(Lesson.id, Lesson.order_index, Lesson.prerequisites).where(Lesson.is_published.is_(True))
+                ).all()
+                self._graph = compile_graph(rows, version)
+                logger.info(f"Compiled prerequisite graph for {len(rows)} lessons (version {version})")
+            return self._graph
+
+    def invalidate(self):
+        self._checked_at = 0.0
+
+
+graph_cache = CourseGraphCache()
+
+
+def user_course_map(db: Session, user_id: Optional[int]) -> Tuple[CourseGraph, List[MapEntry]]:
+    """(graph, entries) for a learner; anonymous visitors have nothing completed"""
+    graph = graph_cache.get(db)
+    completed = db.execute(
+        select(UserProgress.lesson_id).where(UserProgress.user_id == user_id, UserProgress.is_completed.is_(True))
+    ).scalars().all() if user_id is not None else []
+    return graph, course_map(graph, completed)
+
+
+change_counters.change_listener.subscribe(COUNTER_NAME, graph_cache.invalidate)
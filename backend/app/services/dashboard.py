@@ -0,0 +1,235 @@
+"""
+Per-user dashboard summaries.
+
+The dashboard shows points, streaks, totals, recent translations and
+achievements, and how many reviews are due. Gathering that from users,
+user_progress, translations, user_achievements, study_sessions and review_cards
+on every page load takes a query per table, so each user instead has one
+`user_dashboards` row that event handlers keep current as those tables change.
+Reading the dashboard is a primary-key lookup.
+
+Rows are built from the source tables the first time a user opens the
+dashboard, so users who were active before this existed, or whose row was
+dropped with `invalidate_dashboards`, are covered. Handlers skip users without
+a row: building it later picks their change up anyway.
+
+Two values depend on the clock rather than on events. The streak stores when
+it lapses and reads as 0 afterwards. Reviews store the earliest due times of
+the user's cards, and the due count is how many of them have passed.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.dashboard import UserDashboard
+from app.models.progress import Achievement, StudySession, UserAchievement, UserProgress, UserStreak
+from app.models.review import ReviewCard
+from app.models.translation import Translation
+from app.models.user import User
+from app.services import events
+
+RECENT_ITEMS = 5
+REVIEW_DUE_SAMPLE = 100
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return _utc(value).isoformat() if value else None
+
+
+def _translation_item(translation_id: int, source_text: str, translated_text: str, created_at: Optional[datetime]) -> Dict:
+    return {
+        "id": translation_id,
+        "source_text": source_text,
+        "translated_text": translated_text,
+        "created_at": _timestamp(created_at),
+    }
+
+
+def _achievement_item(achievement: Achievement, unlocked_at: Optional[datetime]) -> Dict:
+    return {
+        "id": achievement.id,
+        "name": achievement.name,
+        "name_hawaiian": achievement.name_hawaiian,
+        "description": achievement.description,
+        "icon_name": achievement.icon_name,
+        "badge_tier": achievement.badge_tier,
+        "unlocked_at": _timestamp(unlocked_at),
+    }
+
+
+def _review_due_times(db: Session, user_id: int) -> List[str]:
+    due = db.execute(
+        select(ReviewCard.due_at).where(ReviewCard.user_id == user_id).order_by(ReviewCard.due_at).limit(REVIEW_DUE_SAMPLE)
+    ).scalars()
+    return [_timestamp(due_at) for due_at in due]
+
+
+def build_dashboard(db: Session, user_id: int) -> Dict:
+    """Compute a user's summary from the source tables"""
+    user = db.get(User, user_id)
+    breaks_at = db.execute(select(UserStreak.breaks_at).where(UserStreak.user_id == user_id)).scalar()
+    sessions, minutes = db.execute(
+        select(func.count(), func.coalesce(func.sum(StudySession.duration_minutes), 0))
+        .where(StudySession.user_id == user_id)
+    ).one()
+
+    translations = db.execute(
+        select(Translation.id, Translation.source_text, Translation.translated_text, Translation.created_at)
+        .where(Translation.user_id == user_id)
+        .order_by(Translation.created_at.desc())
+        .limit(RECENT_ITEMS)
+    ).all()
+    achievements = db.execute(
+        select(Achievement, UserAchievement.unlocked_at)
+        .join(UserAchievement, UserAchievement.achievement_id == Achievement.id)
+        .where(UserAchievement.user_id == user_id)
+        .order_by(UserAchievement.unlocked_at.desc(), UserAchievement.id.desc())
+        .limit(RECENT_ITEMS)
+    ).all()
+
+    return {
+        "user_id": user_id,
+        "total_points": user.total_points or 0,
+        "lessons_completed": db.execute(
+            select(func.count()).where(UserProgress.user_id == user_id, UserProgress.is_completed.is_(True))
+        ).scalar(),
+        "translations_made": db.execute(
+            select(func.count()).where(Translation.user_id == user_id)
+        ).scalar(),
+        "study_sessions": sessions,
+        "study_minutes": minutes,
+        "achievements_count": db.execute(
+            select(func.count()).where(UserAchievement.user_id == user_id)
+        ).scalar(),
+        "current_streak": user.current_streak or 0,
+        "longest_streak": user.longest_streak or 0,
+        "streak_breaks_at": breaks_at,
+        "recent_translations": [_translation_item(*row) for row in translations],
+        "recent_achievements": [_achievement_item(achievement, unlocked_at) for achievement, unlocked_at in achievements],
+        "review_due_times": _review_due_times(db, user_id),
+    }
+
+
+def get_dashboard(db: Session, user_id: int) -> UserDashboard:
+    """The user's summary row, built on first use; commits when it had to be built"""
+    dashboard = db.get(UserDashboard, user_id)
+    if dashboard is None:
+        table = UserDashboard.__table__
+        db.execute(
+            dialect_insert(db.get_bind(), table).values(build_dashboard(db, user_id))
+            .on_conflict_do_nothing(index_elements=[table.c.user_id])
+        )
+        db.commit()
+        dashboard = db.get(UserDashboard, user_id)
+    return dashboard
+
+
+def summary(dashboard: UserDashboard, now: Optional[datetime] = None) -> Dict:
+    """Dashboard response fields, resolving the clock-dependent values at `now`"""
+    now = now or datetime.now(timezone.utc)
+    lapsed = dashboard.streak_breaks_at is not None and _utc(dashboard.streak_breaks_at) <= now
+    due_times = [datetime.fromisoformat(due) for due in dashboard.review_due_times or []]
+    due = [due_at for due_at in due_times if due_at <= now]
+    upcoming = [due_at for due_at in due_times if due_at > now]
+    return {
+        "total_points": dashboard.total_points,
+        "current_streak": 0 if lapsed else dashboard.current_streak,
+        "longest_streak": dashboard.longest_streak,
+        "lessons_completed": dashboard.lessons_completed,
+        "translations_made": dashboard.translations_made,
+        "study_sessions": dashboard.study_sessions,
+        "study_minutes": dashboard.study_minutes,
+        "achievements_count": dashboard.achievements_count,
+        "recent_translations": dashboard.recent_translations or [],
+        "recent_achievements": dashboard.recent_achievements or [],
+        "reviews_due": len(due),
+        "reviews_due_capped": len(due) == REVIEW_DUE_SAMPLE,
+        "next_review_at": upcoming[0] if upcoming else None,
+        "updated_at": dashboard.updated_at,
+    }
+
+
+def invalidate_dashboards(db: Session, user_ids: Optional[List[int]] = None) -> int:
+    """Drop summaries (all, or these users') after changes made outside events; they rebuild on next read"""
+    statement = delete(UserDashboard)
+    if user_ids is not None:
+        statement = statement.where(UserDashboard.user_id.in_(user_ids))
+    return db.execute(statement).rowcount
+
+
+def _locked(db: Session, user_id: int) -> Optional[UserDashboard]:
+    # Reloading the row would discard earlier handlers' unflushed changes
+    db.flush()
+    return db.get(UserDashboard, user_id, with_for_update=True, populate_existing=True)
+
+
+@events.subscribe(events.PROGRESS_RECORDED)
+def _on_progress(db: Session, event: events.Event):
+    completed = sum(1 for progress in event.data["updates"] if progress.newly_completed)
+    dashboard = _locked(db, event.user_id) if completed else None
+    if dashboard is not None:
+        dashboard.lessons_completed += completed
+
+
+@events.subscribe(events.POINTS_AWARDED)
+def _on_points(db: Session, event: events.Event):
+    dashboard = _locked(db, event.user_id)
+    if dashboard is not None:
+        dashboard.total_points = event.data["total_points"]
+
+
+@events.subscribe(events.STREAK_UPDATED)
+def _on_streak(db: Session, event: events.Event):
+    dashboard = _locked(db, event.user_id)
+    if dashboard is not None:
+        dashboard.current_streak = event.data["current_streak"]
+        dashboard.longest_streak = event.data["longest_streak"]
+        dashboard.streak_breaks_at = event.data["breaks_at"]
+
+
+@events.subscribe(events.TRANSLATION_CREATED)
+def _on_translation(db: Session, event: events.Event):
+    dashboard = _locked(db, event.user_id)
+    if dashboard is not None:
+        item = _translation_item(
+            event.data["translation_id"], event.data["source_text"], event.data["translated_text"],
+            datetime.now(timezone.utc)
+        )
+        dashboard.translations_made += 1
+        dashboard.recent_translations = ([item] + (dashboard.recent_translations or []))[:RECENT_ITEMS]
+
+
+@events.subscribe(events.STUDY_SESSION_RECORDED)
+def _on_study_session(db: Session, event: events.Event):
+    dashboard = _locked(db, event.user_id)
+    if dashboard is not None:
+        dashboard.study_sessions += 1
+        dashboard.study_minutes += event.data.get("duration_minutes") or 0
+
+
+@events.subscribe(events.ACHIEVEMENTS_UNLOCKED)
+def _on_achievements(db: Session, event: events.Event):
+    dashboard = _locked(db, event.user_id)
+    if dashboard is not None:
+        now = datetime.now(timezone.utc)
+        unlocked = db.execute(
+            select(Achievement).where(Achievement.id.in_(event.data["achievement_ids"])).order_by(Achievement.id.desc())
+        ).scalars().all()
+        dashboard.achievements_count += len(unlocked)
+        dashboard.recent_achievements = (
+            [_achievement_item(achievement, now) for achievement in unlocked] + (dashboard.recent_achievements or [])
+        )[:RECENT_ITEMS]
+
+
+@events.subscribe(events.REVIEWS_GRADED, events.REVIEW_QUEUE_CHANGED)
+def _on_reviews(db: Session, event: events.Event):
+    dashboard = _locked(db, event.user_id)
+    if dashboard is not None:
+        dashboard.review_due_times = _review_due_times(db, event.user_id)
@@ -0,0 +1,49 @@
+"""
+In-process domain events.
+
+Write paths publish what happened (a lesson completed, a translation saved,
+points awarded) and subscribers such as the achievement evaluator and the
+dashboard summaries react to it. Handlers run synchronously inside the
+publisher's transaction, so whatever they write commits or rolls back together
+with the change that triggered them.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from sqlalchemy.orm import Session
+
+# Event types and the data each one carries
+PROGRESS_RECORDED = "progress.recorded"  # events: List[ProgressEvent], updates: List[ProgressUpdate]
+TRANSLATION_CREATED = "translation.created"  # translation_id, source_text, translated_text
+STUDY_SESSION_RECORDED = "study_session.recorded"  # session_id, occurred_at, duration_minutes, exercises_completed, translations_made
+POINTS_AWARDED = "points.awarded"  # points, total_points
+STREAK_UPDATED = "streak.updated"  # current_streak, longest_streak, breaks_at
+ACHIEVEMENTS_UNLOCKED = "achievements.unlocked"  # achievement_ids
+REVIEWS_GRADED = "reviews.graded"  # graded
+REVIEW_QUEUE_CHANGED = "reviews.queue_changed"  # added or rescheduled
+
+
+class Event(NamedTuple):
+    type: str
+    user_id: int
+    data: Dict[str, Any]
+
+
+Handler = Callable[[Session, Event], None]
+
+_subscribers: Dict[str, List[Handler]] = {}
+
+
+def subscribe(*event_types: str):
+    """Decorator registering a handler for one or more event types"""
+    def register(handler: Handler) -> Handler:
+        for event_type in event_types:
+            _subscribers.setdefault(event_type, []).append(handler)
+        return handler
+    return register
+
+
+def publish(db: Session, event_type: str, user_id: int, **data):
+    """Run every handler for `event_type`; their writes are part of the caller's transaction"""
+    event = Event(event_type, user_id, data)
+    for handler in _subscribers.get(event_type, ()):
+        handler(db, event)
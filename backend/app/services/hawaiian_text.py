@@ -0,0 +1,24 @@
+"""Normalization helpers shared by pronunciation, audio and dictionary lookups"""
+import unicodedata
+
+OKINA = "ʻ"
+
+# Characters people type in place of the ʻokina
+OKINA_VARIANTS = "‘’'`"
+
+
+def normalize_word(word: str) -> str:
+    """Canonical lookup key: NFC, lowercase, trimmed, with a real ʻokina"""
+    word = unicodedata.normalize("NFC", word.strip().lower())
+    for variant in OKINA_VARIANTS:
+        word = word.replace(variant, OKINA)
+    return word
+
+
+def fold_word(word: str) -> str:
+    """Loose key without ʻokina or kahakō, for matching text typed on plain keyboards"""
+    decomposed = unicodedata.normalize("NFD", normalize_word(word))
+    return "".join(
+        char for char in decomposed
+        if char != OKINA and not unicodedata.combining(char)
+    )
@@ -0,0 +1,517 @@
+"""
+Points leaderboards.
+
+`award_points` is the single write path for points: it bumps `users.total_points`
+and the user's `weekly_points` row in the caller's transaction and, once that
+commits, pushes the new totals into the global, weekly and class boards. Boards
+are Redis sorted sets when REDIS_URL is set, shared by every worker. Without
+Redis each worker keeps indexable skip lists, loaded from the database on first
+use and then updated incrementally: its own awards as they commit, other
+workers' awards from the rows changed since its last check. Both kinds of board
+sweep those changed rows every LEADERBOARD_REFRESH_SECONDS, which also repairs
+any push that failed. Either way top-N and rank lookups are O(log n).
+
+Ties are ordered the way Redis orders them: by member string, descending.
+"""
+import logging
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.upsert import dialect_insert
+from app.models.leaderboard import ClassroomMember, WeeklyPoints
+from app.models.user import User
+from app.services import events
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+GLOBAL = "global"
+WEEKLY = "weekly"
+CLASS = "class"
+SCOPES = (GLOBAL, WEEKLY, CLASS)
+
+_PENDING_KEY = "leaderboard_pending"
+
+
+class Standing(NamedTuple):
+    rank: int  # 1-based
+    user_id: int
+    points: int
+
+
+def current_week(now: Optional[datetime] = None) -> date:
+    today = (now or datetime.now(timezone.utc)).date()
+    return today - timedelta(days=today.weekday())
+
+
+def board_key(scope: str, week: Optional[date] = None, class_id: Optional[int] = None) -> str:
+    if scope == WEEKLY:
+        return f"{WEEKLY}:{(week or current_week()).isoformat()}"
+    if scope == CLASS:
+        return f"{CLASS}:{class_id}"
+    return GLOBAL
+
+
+def _expires_on(key: str) -> Optional[date]:
+    """Day a weekly board stops being kept; other boards never expire"""
+    scope, _, argument = key.partition(":")
+    if scope != WEEKLY:
+        return None
+    return date.fromisoformat(argument) + timedelta(weeks=settings.LEADERBOARD_WEEKS_KEPT)
+
+
+class SkipList:
+    """Indexable skip list of member -> score, highest score first
+
+    Each forward pointer records how many nodes it skips, so rank lookups and
+    positional ranges take O(log n) like a Redis sorted set.
+    """
+
+    MAX_LEVEL = 32
+    P = 0.25
+
+    class _Node:
+        __slots__ = ("member", "score", "forward", "span")
+
+        def __init__(self, member, score, level):
+            self.member = member
+            self.score = score
+            self.forward = [None] * level
+            self.span = [0] * level
+
+    def __init__(self):
+        self._header = self._Node(None, None, self.MAX_LEVEL)
+        self._level = 1
+        self._length = 0
+        self._scores: Dict[str, int] = {}
+        self._random = random.Random()
+
+    def __len__(self):
+        return self._length
+
+    def score(self, member: str) -> Optional[int]:
+        return self._scores.get(member)
+
+    @staticmethod
+    def _before(node, score, member) -> bool:
+        return node.score > score or (node.score == score and node.member > member)
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < self.P:
+            level += 1
+        return level
+
+    def set(self, member: str, score: int):
+        current = self._scores.get(member)
+        if current == score:
+            return
+        if current is not None:
+            self._delete(member, current)
+        self._insert(member, score)
+
+    def raise_to(self, member: str, score: int):
+        """Set the score only if it is higher than the current one (ZADD GT)"""
+        current = self._scores.get(member)
+        if current is None or score > current:
+            self.set(member, score)
+
+    def _insert(self, member: str, score: int):
+        update = [self._header] * self.MAX_LEVEL
+        rank = [0] * self.MAX_LEVEL
+        node = self._header
+        for i in range(self._level - 1, -1, -1):
+            rank[i] = 0 if i == self._level - 1 else rank[i + 1]
+            while node.forward[i] is not None and self._before(node.forward[i], score, member):
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                rank[i] = 0
+                update[i] = self._header
+                self._header.span[i] = self._length
+            self._level = level
+
+        new = self._Node(member, score, level)
+        for i in range(level):
+            new.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = (rank[0] - rank[i]) + 1
+        for i in range(level, self._level):
+            update[i].span[i] += 1
+
+        self._length += 1
+        self._scores[member] = score
+
+    def remove(self, member: str):
+        score = self._scores.get(member)
+        if score is not None:
+            self._delete(member, score)
+
+    def _delete(self, member: str, score: int):
+        update = [self._header] * self.MAX_LEVEL
+        node = self._header
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and self._before(node.forward[i], score, member):
+                node = node.forward[i]
+            update[i] = node
+
+        target = node.forward[0]
+        for i in range(self._level):
+            if update[i].forward[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].span[i] -= 1
+        while self._level > 1 and self._header.forward[self._level - 1] is None:
+            self._level -= 1
+
+        self._length -= 1
+        del self._scores[member]
+
+    def rank(self, member: str) -> Optional[int]:
+        """0-based position of `member`, or None if absent"""
+        score = self._scores.get(member)
+        if score is None:
+            return None
+
+        traversed = 0
+        node = self._header
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and (
+                self._before(node.forward[i], score, member) or node.forward[i].member == member
+            ):
+                traversed += node.span[i]
+                node = node.forward[i]
+            if node.member == member:
+                return traversed - 1
+        return None
+
+    def range(self, start: int, count: int) -> List[Tuple[str, int]]:
+        """`count` members from 0-based position `start`, highest first"""
+        if start >= self._length or count <= 0:
+            return []
+
+        target = start + 1
+        traversed = 0
+        node = self._header
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and traversed + node.span[i] <= target:
+                traversed += node.span[i]
+                node = node.forward[i]
+            if traversed == target:
+                break
+
+        result = []
+        while node is not None and len(result) < count:
+            result.append((node.member, node.score))
+            node = node.forward[0]
+        return result
+
+
+def _load_board(db: Session, key: str) -> List[Tuple[int, int]]:
+    """(user_id, points) for every member of a board, straight from the database"""
+    scope, _, argument = key.partition(":")
+    if scope == WEEKLY:
+        statement = select(WeeklyPoints.user_id, WeeklyPoints.points).where(
+            WeeklyPoints.week_start == date.fromisoformat(argument)
+        )
+    elif scope == CLASS:
+        statement = select(User.id, func.coalesce(User.total_points, 0)).join(
+            ClassroomMember, ClassroomMember.user_id == User.id
+        ).where(ClassroomMember.classroom_id == int(argument))
+    else:
+        statement = select(User.id, func.coalesce(User.total_points, 0)).where(User.is_active.is_(True))
+    return [(user_id, points) for user_id, points in db.execute(statement)]
+
+
+class _SweptBoards:
+    """Boards that periodically re-apply the awards recorded since the last sweep
+
+    Every refresh_seconds a lookup reads the weekly_points rows and class
+    memberships that changed since the previous sweep (both indexed by time) and
+    raises those members' scores. That brings in awards pushed by other workers or
+    lost to a failed push, without reloading whole boards.
+    """
+
+    # Re-read a margin before the last check: a transaction stamps its rows when
+    # it starts, and may commit after a check that ran in the meantime
+    OVERLAP = timedelta(minutes=5)
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._sync_lock = threading.Lock()
+        self._synced_since = datetime.now(timezone.utc)
+        self._checked_at = time.monotonic()
+
+    def apply(self, updates: List[Tuple[str, str, int]]):
+        raise NotImplementedError
+
+    def _sync_if_due(self, db: Session):
+        if time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return  # Another thread is syncing; serve the boards as they are
+
+        try:
+            self._checked_at = time.monotonic()
+            started = datetime.now(timezone.utc)
+            self._sync(db, self._synced_since - self.OVERLAP)
+            self._synced_since = started
+        except Exception as e:
+            logger.warning(f"Leaderboard sync failed: {e}")
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self, db: Session, since: datetime):
+        self.apply(_changes_since(db, since))
+
+
+class MemoryBoards(_SweptBoards):
+    """Per-worker skip lists, loaded lazily and kept current incrementally
+
+    Awards made by this worker are applied as they commit; sweeps bring in the
+    rest. Weekly boards past LEADERBOARD_WEEKS_KEPT are dropped on the next sweep.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        super().__init__(refresh_seconds)
+        self._boards: Dict[str, SkipList] = {}
+        self._lock = threading.Lock()
+
+    def _board(self, db: Session, key: str) -> SkipList:
+        self._sync_if_due(db)
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None:
+                return board
+
+        board = SkipList()
+        for user_id, points in _load_board(db, key):
+            board.set(str(user_id), points)
+        with self._lock:
+            # Keep a board another thread loaded meanwhile; it may already hold newer awards
+            return self._boards.setdefault(key, board)
+
+    def _sync(self, db: Session, since: datetime):
+        super()._sync(db, since)
+        today = date.today()
+        with self._lock:
+            for key in [key for key in self._boards if (_expires_on(key) or date.max) <= today]:
+                del self._boards[key]
+
+    def top(self, db: Session, key: str, limit: int) -> Tuple[List[Tuple[str, int]], int]:
+        board = self._board(db, key)
+        with self._lock:
+            return board.range(0, limit), len(board)
+
+    def standing(self, db: Session, key: str, member: str) -> Optional[Tuple[int, int]]:
+        board = self._board(db, key)
+        with self._lock:
+            rank = board.rank(member)
+            return None if rank is None else (rank, board.score(member))
+
+    def apply(self, updates: List[Tuple[str, str, int]]):
+        with self._lock:
+            for key, member, score in updates:
+                board = self._boards.get(key)
+                # Boards not loaded yet will read the committed value from the database
+                if board is not None:
+                    board.raise_to(member, score)
+
+
+def _changes_since(db: Session, since: datetime) -> List[Tuple[str, str, int]]:
+    """Board updates for awards and class joins recorded at or after `since`"""
+    updates = []
+    totals = {}
+    for user_id, week, weekly, total in db.execute(
+        select(WeeklyPoints.user_id, WeeklyPoints.week_start, WeeklyPoints.points, User.total_points)
+        .join(User, User.id == WeeklyPoints.user_id)
+        .where(WeeklyPoints.updated_at >= since)
+    ):
+        updates.append((board_key(WEEKLY, week), str(user_id), weekly))
+        totals[user_id] = total or 0
+    updates += [(GLOBAL, str(user_id), total) for user_id, total in totals.items()]
+
+    memberships = select(ClassroomMember.classroom_id, ClassroomMember.user_id, User.total_points).join(
+        User, User.id == ClassroomMember.user_id
+    )
+    rows = set(db.execute(memberships.where(ClassroomMember.joined_at >= since)))
+    if totals:
+        rows.update(db.execute(memberships.where(ClassroomMember.user_id.in_(totals))))
+    updates += [
+        (board_key(CLASS, class_id=class_id), str(user_id), total or 0)
+        for class_id, user_id, total in rows
+    ]
+    return updates
+
+
+class RedisBoards(_SweptBoards):
+    """Sorted sets shared by every worker; missing boards are rebuilt from the database
+
+    A board counts as built once it holds the placeholder member "", so awards can
+    ZADD GT into a board that is still being built. The build merges its snapshot
+    in with ZUNIONSTORE ... AGGREGATE MAX, keeping any higher score an award wrote
+    while the snapshot was read. Each worker's sweeps re-push recent awards, so a
+    push that failed while Redis was unreachable is repaired once it is back.
+    """
+
+    PREFIX = "leaderboard:"
+    PLACEHOLDER = ""
+
+    def __init__(self, url: str, refresh_seconds: int):
+        super().__init__(refresh_seconds)
+        self.client = redis.Redis.from_url(url)
+
+    def _ttl(self, key: str) -> Optional[int]:
+        expires = _expires_on(key)
+        if expires is None:
+            return None
+        return max(int((expires - date.today()).total_seconds()), 60)
+
+    def _ensure(self, db: Session, key: str) -> str:
+        self._sync_if_due(db)
+        name = self.PREFIX + key
+        if self.client.zscore(name, self.PLACEHOLDER) is not None:
+            return name
+
+        # Build under a temporary name and merge so readers never see a partial board
+        scratch = f"{name}:building:{random.getrandbits(32):08x}"
+        rows = _load_board(db, key)
+        pipe = self.client.pipeline(transaction=False)
+        for start in range(0, len(rows), 1000):
+            pipe.zadd(scratch, {str(user_id): points for user_id, points in rows[start:start + 1000]})
+        pipe.zadd(scratch, {self.PLACEHOLDER: float("-inf")})
+        pipe.zunionstore(name, [name, scratch], aggregate="MAX")
+        pipe.delete(scratch)
+        ttl = self._ttl(key)
+        if ttl:
+            pipe.expire(name, ttl)
+        pipe.execute()
+        return name
+
+    def top(self, db: Session, key: str, limit: int) -> Tuple[List[Tuple[str, int]], int]:
+        name = self._ensure(db, key)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrevrange(name, 0, limit, withscores=True)
+        pipe.zcount(name, "-inf", "+inf")
+        pipe.zscore(name, self.PLACEHOLDER)
+        entries, total, placeholder = pipe.execute()
+        members = [(member.decode(), int(score)) for member, score in entries if member]
+        return members[:limit], total - (placeholder is not None)
+
+    def standing(self, db: Session, key: str, member: str) -> Optional[Tuple[int, int]]:
+        name = self._ensure(db, key)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrevrank(name, member)
+        pipe.zscore(name, member)
+        rank, score = pipe.execute()
+        return None if rank is None else (rank, int(score))
+
+    def apply(self, updates: List[Tuple[str, str, int]]):
+        # Written even to boards that aren't built yet; a build in progress merges them in
+        pipe = self.client.pipeline(transaction=False)
+        for key, member, score in updates:
+            name = self.PREFIX + key
+            pipe.zadd(name, {member: score}, gt=True)
+            ttl = self._ttl(key)
+            if ttl:
+                pipe.expire(name, ttl)
+        pipe.execute()
+
+
+def _create_boards():
+    if settings.REDIS_URL:
+        if redis is None:
+            logger.warning("REDIS_URL is set but the redis package is not installed; using in-process leaderboards")
+        else:
+            return RedisBoards(settings.REDIS_URL, settings.LEADERBOARD_REFRESH_SECONDS)
+    return MemoryBoards(settings.LEADERBOARD_REFRESH_SECONDS)
+
+
+boards = _create_boards()
+
+
+def _defer(db: Session, updates: List[Tuple[str, str, int]]):
+    db.info.setdefault(_PENDING_KEY, []).extend(updates)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_pending(session: Session):
+    updates = session.info.pop(_PENDING_KEY, None)
+    if updates:
+        try:
+            boards.apply(updates)
+        except Exception as e:
+            # The database is the source of truth; the next sweep re-applies these
+            logger.warning(f"Leaderboard update failed: {e}")
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _drop_pending(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def award_points(db: Session, user_id: int, points: int) -> int:
+    """Add points to a user and return their new total; boards update when the caller commits"""
+    if points <= 0:
+        raise ValueError("points must be positive")
+
+    total = db.execute(
+        update(User).where(User.id == user_id)
+        .values(total_points=func.coalesce(User.total_points, 0) + points)
+        .returning(User.total_points)
+    ).scalar_one()
+
+    week = current_week()
+    table = WeeklyPoints.__table__
+    insert = dialect_insert(db.get_bind(), table).values(user_id=user_id, week_start=week, points=points)
+    weekly = db.execute(
+        insert.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.week_start],
+            set_={"points": table.c.points + insert.excluded.points, "updated_at": func.now()}
+        ).returning(table.c.points)
+    ).scalar_one()
+
+    class_ids = db.execute(
+        select(ClassroomMember.classroom_id).where(ClassroomMember.user_id == user_id)
+    ).scalars().all()
+
+    member = str(user_id)
+    _defer(db, [(GLOBAL, member, total), (board_key(WEEKLY, week), member, weekly)] + [
+        (board_key(CLASS, class_id=class_id), member, total) for class_id in class_ids
+    ])
+    events.publish(db, events.POINTS_AWARDED, user_id, points=points, total_points=total)
+    return total
+
+
+def joined_class(db: Session, class_id: int, user: User):
+    """Put a new class member on the class board once the caller commits"""
+    _defer(db, [(board_key(CLASS, class_id=class_id), str(user.id), user.total_points or 0)])
+
+
+def top(db: Session, key: str, limit: int) -> Tuple[List[Standing], int]:
+    """The first `limit` standings on a board and how many members it has"""
+    entries, total = boards.top(db, key, limit)
+    return [Standing(index + 1, int(member), points) for index, (member, points) in enumerate(entries)], total
+
+
+def standing(db: Session, key: str, user_id: int) -> Optional[Standing]:
+    found = boards.standing(db, key, str(user_id))
+    return None if found is None else Standing(found[0] + 1, user_id, found[1])
@@ -0,0 +1,153 @@
+"""
+Pre-serialized lesson API responses.
+
+The curriculum index and each lesson are rendered to JSON once, gzipped, and stored
+in `lesson_payloads` together with the version of the rows they were built from
+(`updated_at`, falling back to `created_at`). A request reads the current version
+with one indexed query and rebuilds only when it moved; each worker also keeps the
+bytes in memory, so serving a lesson is a version check and a memory copy.
+
+Anything that edits a lesson's sections must also touch the lesson's `updated_at`.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.lesson import Lesson, LessonContent, LessonPayload
+
+INDEX_KEY = "index"
+
+lesson_version = func.coalesce(Lesson.updated_at, Lesson.created_at)
+
+
+class Payload(NamedTuple):
+    digest: str
+    body: bytes
+    body_gzip: bytes
+    version: str
+
+
+def lesson_summary(lesson: Lesson) -> dict:
+    return {
+        "id": lesson.id,
+        "uuid": lesson.uuid,
+        "title": lesson.title,
+        "title_hawaiian": lesson.title_hawaiian,
+        "description": lesson.description,
+        "level": lesson.level.value,
+        "lesson_type": lesson.lesson_type.value,
+        "category": (lesson.content or {}).get("category"),
+        "order_index": lesson.order_index,
+        "estimated_minutes": lesson.estimated_minutes,
+        "points_value": lesson.points_value,
+        "prerequisites": lesson.prerequisites or [],
+        "cultural_notes": lesson.cultural_notes,
+    }
+
+
+def lesson_detail(lesson: Lesson, sections) -> dict:
+    return {
+        **lesson_summary(lesson),
+        "vocabulary": lesson.vocabulary or [],
+        "phrases": lesson.phrases or [],
+        "grammar_points": lesson.grammar_points or [],
+        "moelelo": lesson.moelelo,
+        "slides": [section.content for section in sections],
+    }
+
+
+def serialize(data) -> tuple:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return body, gzip.compress(body, 9, mtime=0), hashlib.sha256(body).hexdigest()
+
+
+class LessonPayloadCache:
+    def __init__(self):
+        self._memory: Dict[str, Payload] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, key: str, version: str, build: Callable[[], object]) -> Payload:
+        cached = self._memory.get(key)
+        if cached is not None and cached.version == version:
+            return cached
+
+        row = db.get(LessonPayload, key)
+        if row is not None and row.source_version == version:
+            payload = Payload(row.etag, row.body, row.body_gzip, version)
+        else:
+            payload = self._store(db, key, version, build())
+
+        with self._lock:
+            self._memory[key] = payload
+        return payload
+
+    def _store(self, db: Session, key: str, version: str, data) -> Payload:
+        body, body_gzip, digest = serialize(data)
+        values = {
+            "key": key, "source_version": version, "etag": digest,
+            "body": body, "body_gzip": body_gzip,
+        }
+        insert = dialect_insert(db.get_bind(), LessonPayload.__table__).values(**values)
+        db.execute(insert.on_conflict_do_update(
+            index_elements=[LessonPayload.key],
+            set_={**{name: value for name, value in values.items() if name != "key"}, "built_at": func.now()}
+        ))
+        db.commit()
+        return Payload(digest, body, body_gzip, version)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+
+payload_cache = LessonPayloadCache()
+
+
+def _version_string(*parts) -> str:
+    return ":".join("" if part is None else str(part) for part in parts)
+
+
+def index_payload(db: Session) -> Payload:
+    count, newest = db.execute(
+        select(func.count(Lesson.id), func.max(lesson_version)).where(Lesson.is_published.is_(True))
+    ).one()
+
+    def build():
+        lessons = db.query(Lesson).filter(Lesson.is_published.is_(True)).order_by(Lesson.order_index).all()
+        return {"lessons": [lesson_summary(lesson) for lesson in lessons]}
+
+    return payload_cache.get(db, INDEX_KEY, _version_string(count, newest), build)
+
+
+def lesson_payload(db: Session, lesson_uuid: str) -> Optional[Payload]:
+    row = db.execute(
+        select(Lesson.id, lesson_version)
+        .where(Lesson.uuid == lesson_uuid, Lesson.is_published.is_(True))
+    ).first()
+    if row is None:
+        return None
+    lesson_id, version = row
+
+    def build():
+        lesson = db.get(Lesson, lesson_id)
+        sections = db.query(LessonContent).filter(
+            LessonContent.lesson_id == lesson_id
+        ).order_by(LessonContent.order_index).all()
+        return lesson_detail(lesson, sections)
+
+    return payload_cache.get(db, lesson_uuid, _version_string(version), build)
+
+
+def prebuild_payloads(db: Session) -> int:
+    """Render the index and every published lesson ahead of the first request"""
+    index_payload(db)
+    uuids = db.execute(select(Lesson.uuid).where(Lesson.is_published.is_(True))).scalars().all()
+    for lesson_uuid in uuids:
+        lesson_payload(db, lesson_uuid)
+    return len(uuids)
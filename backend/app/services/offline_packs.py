@@ -0,0 +1,157 @@
+"""
+Offline study packs.
+
+A build step (scripts/build_offline_packs.py) bundles each curriculum unit (a
+lesson category) into one zip: the lesson payloads, the dictionary entries and
+pronunciation data for their vocabulary, and the smallest rendition of every
+referenced audio clip. A pack is fingerprinted from everything that goes into it
+and only re-zipped when the fingerprint moves, so a rebuild after editing one
+lesson rewrites one pack. Pack files are named after their fingerprint and never
+change once written; manifest.json lists the current ones and, under `retired`,
+the previous build's, which stay downloadable so interrupted downloads can resume.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+from app.core.config import settings
+from app.services.hawaiian_text import fold_word
+from app.services.pronunciation_bundles import BundleIndex, MANIFEST_FILENAME, read_manifest
+
+# Bump when the archive layout changes so every pack is rebuilt
+PACK_FORMAT_VERSION = 1
+
+PACK_PREFIX = "pack"
+PACK_INFO_FILENAME = "pack.json"
+
+# Fixed entry timestamps keep the archive bytes, and so its ETag, reproducible
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_PACK_RE = re.compile(r"^%s-[a-z0-9-]+\.[0-9a-f]{12}\.zip$" % PACK_PREFIX)
+
+
+class UnitContent(NamedTuple):
+    title: str
+    lesson_count: int
+    documents: Dict[str, bytes]  # archive path -> JSON bytes
+    audio: Dict[str, Path]  # archive path -> source file
+
+
+def unit_slug(title: str) -> str:
+    """URL-safe unit key: "Arts & Crafts" becomes arts-crafts"""
+    return re.sub(r"[^a-z0-9]+", "-", fold_word(title)).strip("-") or "general"
+
+
+def pack_fingerprint(unit: UnitContent, audio_hashes: Dict[str, str]) -> str:
+    digest = hashlib.sha256(f"pack-format:{PACK_FORMAT_VERSION}\n".encode("ascii"))
+    for name in sorted(unit.documents):
+        digest.update(f"{name}\n".encode("utf-8"))
+        digest.update(hashlib.sha256(unit.documents[name]).digest())
+    for name in sorted(unit.audio):
+        digest.update(f"{name}\n{audio_hashes[name]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _write_zip(path: Path, unit: UnitContent):
+    """Write the archive next to its final name and move it into place"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp_name, "w") as archive:
+            for name in sorted(unit.documents):
+                info = zipfile.ZipInfo(name, _ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, unit.documents[name], compresslevel=9)
+            for name in sorted(unit.audio):
+                # Audio is already compressed; storing it keeps builds fast
+                info = zipfile.ZipInfo(name, _ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_STORED
+                with open(unit.audio[name], "rb") as source, archive.open(info, "w") as target:
+                    for block in iter(lambda: source.read(1024 * 1024), b""):
+                        target.write(block)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def write_packs(directory, units: Dict[str, UnitContent], audio_hashes: Dict[Path, str], force: bool = False) -> dict:
+    """Build packs for `units` (keyed by slug) whose fingerprint changed and publish a new manifest
+
+    `audio_hashes` maps every referenced audio file to its sha256. Packs from the
+    previous manifest are kept and listed as `retired` for clients still
+    downloading them; anything older is removed. Returns the manifest with a
+    `rebuilt` list of slugs added.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(directory) or {}
+    previous_packs = previous.get("packs", {})
+
+    packs = {}
+    rebuilt = []
+    for slug in sorted(units):
+        unit = units[slug]
+        fingerprint = pack_fingerprint(unit, {name: audio_hashes[path] for name, path in unit.audio.items()})
+        filename = f"{PACK_PREFIX}-{slug}.{fingerprint[:12]}.zip"
+        path = directory / filename
+
+        entry = previous_packs.get(slug)
+        if force or entry is None or entry.get("fingerprint") != fingerprint or not path.exists():
+            _write_zip(path, unit)
+            entry = {"built_at": datetime.now(timezone.utc).isoformat()}
+            rebuilt.append(slug)
+
+        packs[slug] = {
+            "title": unit.title,
+            "filename": filename,
+            "fingerprint": fingerprint,
+            "size": path.stat().st_size,
+            "lesson_count": unit.lesson_count,
+            "audio_count": len(unit.audio),
+            "built_at": entry["built_at"],
+        }
+
+    current = {pack["filename"] for pack in packs.values()}
+    digest = hashlib.sha256("".join(packs[slug]["fingerprint"] for slug in sorted(packs)).encode("ascii"))
+    manifest = {
+        "version": digest.hexdigest()[:12],
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "packs": packs,
+        "retired": [
+            {"filename": pack["filename"], "fingerprint": pack["fingerprint"]}
+            for slug, pack in sorted(previous_packs.items()) if pack.get("filename") not in current
+        ],
+    }
+    tmp_path = directory / f".{MANIFEST_FILENAME}.tmp"
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_path, directory / MANIFEST_FILENAME)
+
+    keep = current | {pack["filename"] for pack in manifest["retired"]}
+    for path in directory.iterdir():
+        if _PACK_RE.match(path.name) and path.name not in keep:
+            path.unlink()
+    return {**manifest, "rebuilt": rebuilt}
+
+
+class PackIndex(BundleIndex):
+    """Size, mtime and fingerprint of the published packs, refreshed when the manifest moves"""
+
+    label = "offline packs"
+
+    def _published(self, manifest: dict) -> List[str]:
+        return list(self._known_hashes(manifest))
+
+    def _known_hashes(self, manifest: dict) -> Dict[str, str]:
+        # Pack names are derived from their fingerprint, so it serves as the ETag
+        packs = list(manifest.get("packs", {}).values()) + manifest.get("retired", [])
+        return {pack["filename"]: pack["fingerprint"] for pack in packs}
+
+
+pack_index = PackIndex(settings.OFFLINE_PACK_DIR)
@@ -0,0 +1,218 @@
+"""
+Lesson progress ingestion.
+
+Clients queue progress events (exercises answered, lessons finished, time spent)
+and post them in batches. A batch is folded per lesson in memory and written
+with one multi-row INSERT ... ON CONFLICT DO UPDATE whose SET clause merges into
+the stored row (sums for attempts and time, the maximum for scores and
+completion, the first completion time), so concurrent batches for the same
+lesson never overwrite each other. Time is summed in seconds and whole minutes
+are derived from the total, so short batches still add up.
+
+Clients tag each batch with an id and resend the same id when they retry; a
+batch whose id was already applied is not counted again.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import delete, func, inspect, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert, greatest
+from app.models.lesson import Lesson
+from app.models.progress import ProgressBatch, UserProgress
+from app.schemas.progress import ProgressEvent
+
+
+class UnknownLessonsError(ValueError):
+    def __init__(self, lesson_ids: List[int]):
+        self.lesson_ids = lesson_ids
+        super().__init__(f"Unknown lessons: {', '.join(str(lesson_id) for lesson_id in lesson_ids)}")
+
+
+# Retries arrive within minutes; older batch ids are pruned
+BATCH_ID_RETENTION = timedelta(days=2)
+
+# Columns each ProgressUpdate is built from
+_RETURNED = [
+    UserProgress.__table__.c[name] for name in (
+        "lesson_id", "is_completed", "completion_percentage", "score",
+        "best_score", "attempts", "time_spent_minutes", "completed_at",
+    )
+]
+
+
+class ProgressUpdate(NamedTuple):
+    lesson_id: int
+    is_completed: bool
+    completion_percentage: float
+    score: Optional[float]
+    best_score: Optional[float]
+    attempts: int
+    time_spent_minutes: int
+    completed_at: Optional[datetime]
+    newly_completed: bool
+
+
+class _LessonFold:
+    __slots__ = ("completion", "score", "score_at", "best_score", "attempts", "seconds", "completed_at")
+
+    def __init__(self):
+        self.completion = 0.0
+        self.score = None
+        self.score_at = None
+        self.best_score = None
+        self.attempts = 0
+        self.seconds = 0
+        self.completed_at = None
+
+    def add(self, event: ProgressEvent, at: datetime):
+        self.seconds += event.time_spent_seconds
+        if event.completion_percentage is not None:
+            self.completion = max(self.completion, event.completion_percentage)
+        if event.score is not None:
+            self.attempts += 1
+            self.best_score = event.score if self.best_score is None else max(self.best_score, event.score)
+            if self.score_at is None or at >= self.score_at:
+                self.score, self.score_at = event.score, at
+        if event.type == "lesson_completed":
+            self.completion = 100.0
+            if self.completed_at is None or at < self.completed_at:
+                self.completed_at = at
+
+
+def _aware(value: Optional[datetime], default: datetime) -> datetime:
+    if value is None:
+        return default
+    # Never trust client clocks past the present
+    value = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return min(value, default)
+
+
+def ensure_progress_columns(engine: Engine):
+    """Add time_spent_seconds to a user_progress table created before it existed"""
+    if "time_spent_seconds" in {column["name"] for column in inspect(engine).get_columns("user_progress")}:
+        return
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Workers start together; only the one holding the lock adds and backfills the column
+            conn.execute(text("LOCK TABLE user_progress IN ACCESS EXCLUSIVE MODE"))
+            if "time_spent_seconds" in {column["name"] for column in inspect(conn).get_columns("user_progress")}:
+                return
+        conn.execute(text("ALTER TABLE user_progress ADD COLUMN time_spent_seconds INTEGER DEFAULT 0"))
+        conn.execute(text("UPDATE user_progress SET time_spent_seconds = coalesce(time_spent_minutes, 0) * 60"))
+
+
+def claim_batch(db: Session, user_id: int, batch_id: str) -> bool:
+    """Record a batch id; False if it was already applied. Takes effect when the caller commits"""
+    table = ProgressBatch.__table__
+    claimed = db.execute(
+        dialect_insert(db.get_bind(), table)
+        .values(user_id=user_id, batch_id=batch_id)
+        .on_conflict_do_nothing(index_elements=[table.c.user_id, table.c.batch_id])
+        .returning(table.c.batch_id)
+    ).first() is not None
+    if claimed:
+        db.execute(delete(ProgressBatch).where(
+            ProgressBatch.user_id == user_id,
+            ProgressBatch.created_at < datetime.now(timezone.utc) - BATCH_ID_RETENTION
+        ))
+    return claimed
+
+
+def fold_events(events: List[ProgressEvent], now: datetime) -> Dict[int, _LessonFold]:
+    folded: Dict[int, _LessonFold] = {}
+    for event in events:
+        folded.setdefault(event.lesson_id, _LessonFold()).add(event, _aware(event.occurred_at, now))
+    return folded
+
+
+def apply_progress_events(db: Session, user_id: int, events: List[ProgressEvent]) -> List[ProgressUpdate]:
+    """Merge a batch of events into user_progress and return the resulting rows
+
+    Raises UnknownLessonsError if an event names a lesson that does not exist.
+    The caller commits.
+    """
+    now = datetime.now(timezone.utc)
+    folded = fold_events(events, now)
+
+    known = set(db.execute(select(Lesson.id).where(Lesson.id.in_(folded))).scalars())
+    unknown = sorted(set(folded) - known)
+    if unknown:
+        raise UnknownLessonsError(unknown)
+
+    bind = db.get_bind()
+    table = UserProgress.__table__
+    # Sorted rows take row locks in a fixed order, so overlapping batches can't deadlock
+    insert = dialect_insert(bind, table).values([
+        {
+            "user_id": user_id,
+            "lesson_id": lesson_id,
+            "is_completed": fold.completed_at is not None,
+            "completion_percentage": fold.completion,
+            "score": fold.score,
+            "best_score": fold.best_score,
+            "attempts": fold.attempts,
+            "time_spent_seconds": fold.seconds,
+            "time_spent_minutes": fold.seconds // 60,
+            "completed_at": fold.completed_at,
+            "last_accessed": now,
+        }
+        for lesson_id, fold in sorted(folded.items())
+    ])
+    excluded = insert.excluded
+    seconds = func.coalesce(table.c.time_spent_seconds, 0) + excluded.time_spent_seconds
+    statement = insert.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.lesson_id],
+        set_={
+            "is_completed": or_(func.coalesce(table.c.is_completed, False), excluded.is_completed),
+            "completion_percentage": greatest(bind, func.coalesce(table.c.completion_percentage, 0), excluded.completion_percentage),
+            "score": func.coalesce(excluded.score, table.c.score),
+            "best_score": greatest(bind, table.c.best_score, excluded.best_score),
+            "attempts": func.coalesce(table.c.attempts, 0) + excluded.attempts,
+            "time_spent_seconds": seconds,
+            "time_spent_minutes": seconds // 60,
+            "completed_at": func.coalesce(table.c.completed_at, excluded.completed_at),
+            "last_accessed": excluded.last_accessed,
+        }
+    ).returning(*_RETURNED)
+
+    updates = []
+    for row in db.execute(statement):
+        fold = folded[row.lesson_id]
+        update = _update_from_row(row)
+        # The stored completion time is ours only if no earlier batch completed the lesson
+        updates.append(update._replace(
+            newly_completed=fold.completed_at is not None and update.completed_at == fold.completed_at
+        ))
+    return sorted(updates, key=lambda update: update.lesson_id)
+
+
+def progress_for(db: Session, user_id: int, lesson_ids: Iterable[int]) -> List[ProgressUpdate]:
+    """Stored progress for some lessons, as returned for a batch that was already applied"""
+    table = UserProgress.__table__
+    rows = db.execute(
+        select(*_RETURNED)
+        .where(table.c.user_id == user_id, table.c.lesson_id.in_(set(lesson_ids)))
+        .order_by(table.c.lesson_id)
+    )
+    return [_update_from_row(row) for row in rows]
+
+
+def _update_from_row(row) -> ProgressUpdate:
+    completed_at = row.completed_at
+    if completed_at is not None and completed_at.tzinfo is None:
+        completed_at = completed_at.replace(tzinfo=timezone.utc)
+    return ProgressUpdate(
+        lesson_id=row.lesson_id,
+        is_completed=bool(row.is_completed),
+        completion_percentage=row.completion_percentage,
+        score=row.score,
+        best_score=row.best_score,
+        attempts=row.attempts,
+        time_spent_minutes=row.time_spent_minutes,
+        completed_at=completed_at,
+        newly_completed=False,
+    )
@@ -0,0 +1,192 @@
+"""
+Static pronunciation bundles.
+
+A build step (scripts/build_pronunciation_bundles.py) writes the pronunciation
+data for every known word into JSON shards grouped by first letter. Each shard is
+named after its content hash and has a gzip twin; manifest.json maps letters to
+the current shard names and lists the previous build's shards as `retired`, which
+stay published for clients still holding the old manifest. Shards never change
+once written, so they are served with year-long immutable caching and clients
+only revalidate the small manifest.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from app.core.config import settings
+from app.services.audio_index import file_sha256
+from app.services.hawaiian_text import fold_word
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+SHARD_PREFIX = "pronunciations"
+HAWAIIAN_LETTERS = "aeiouhklmnpw"
+OTHER_SHARD = "_"
+
+_SHARD_RE = re.compile(r"^%s-[a-z_]\.[0-9a-f]{12}\.json$" % SHARD_PREFIX)
+
+
+class BundleFile(NamedTuple):
+    path: Path
+    size: int
+    mtime: float
+    sha256: str
+
+
+class Bundle(NamedTuple):
+    plain: BundleFile
+    gzipped: Optional[BundleFile]
+
+
+def shard_key(word: str) -> str:
+    """Shard letter for a word; ʻokina and kahakō are ignored so ʻohana files under o"""
+    folded = fold_word(word)
+    return folded[0] if folded and folded[0] in HAWAIIAN_LETTERS else OTHER_SHARD
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_bundles(directory, entries: Dict[str, dict]) -> dict:
+    """Write shards for `entries` (keyed by normalized word) and publish a new manifest
+
+    Unchanged shards keep their names. Shards from the previous manifest are kept
+    and listed as `retired` for clients still holding it; anything older is removed.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    shards: Dict[str, Dict[str, dict]] = {}
+    for key, entry in entries.items():
+        shards.setdefault(shard_key(key), {})[key] = entry
+
+    manifest_shards = {}
+    digest = hashlib.sha256()
+    for letter in sorted(shards):
+        data = json.dumps(
+            {"words": shards[letter]}, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+        ).encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        filename = f"{SHARD_PREFIX}-{letter}.{content_hash[:12]}.json"
+        if not (directory / filename).exists():
+            # mtime=0 keeps the gzip bytes (and so their ETag) reproducible
+            _write_atomic(directory / (filename + ".gz"), gzip.compress(data, 9, mtime=0))
+            _write_atomic(directory / filename, data)
+        manifest_shards[letter] = filename
+        digest.update(content_hash.encode("ascii"))
+
+    previous = read_manifest(directory) or {}
+    current = set(manifest_shards.values())
+    manifest = {
+        "version": digest.hexdigest()[:12],
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "word_count": len(entries),
+        "shards": manifest_shards,
+        "retired": sorted(set(previous.get("shards", {}).values()) - current),
+    }
+    _write_atomic(directory / MANIFEST_FILENAME, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    keep = current | set(manifest["retired"])
+    for path in directory.iterdir():
+        name = path.name[:-3] if path.name.endswith(".gz") else path.name
+        if _SHARD_RE.match(name) and name not in keep:
+            path.unlink()
+    return manifest
+
+
+def read_manifest(directory) -> Optional[dict]:
+    try:
+        with open(Path(directory) / MANIFEST_FILENAME, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class BundleIndex:
+    """Size, mtime and hash of the published bundle files, refreshed when the manifest moves"""
+
+    label = "pronunciation bundles"
+
+    def __init__(self, directory, refresh_seconds: int = 10):
+        self.directory = Path(directory)
+        self.refresh_seconds = refresh_seconds
+        self._bundles: Dict[str, Bundle] = {}
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, filename: str) -> Optional[Bundle]:
+        self._refresh_if_due()
+        return self._bundles.get(filename)
+
+    def build(self):
+        with self._lock:
+            self._build()
+
+    def _describe(self, path: Path, sha256: Optional[str] = None) -> Optional[BundleFile]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return BundleFile(path, stat.st_size, stat.st_mtime, sha256 or file_sha256(path))
+
+    def _build(self):
+        signature = self._signature_now()
+        manifest = read_manifest(self.directory) or {}
+        hashes = self._known_hashes(manifest)
+        bundles = {}
+        for filename in [MANIFEST_FILENAME] + self._published(manifest):
+            plain = self._describe(self.directory / filename, hashes.get(filename))
+            if plain:
+                bundles[filename] = Bundle(plain, self._describe(self.directory / (filename + ".gz")))
+
+        self._bundles = bundles
+        self._signature = signature
+        self._checked_at = time.monotonic()
+        if manifest:
+            logger.info(f"Loaded {self.label} {manifest.get('version')} ({len(bundles) - 1} files)")
+
+    def _published(self, manifest: dict) -> List[str]:
+        """Filenames the manifest points at, plus the previous build's it still serves"""
+        return list(manifest.get("shards", {}).values()) + manifest.get("retired", [])
+
+    def _known_hashes(self, manifest: dict) -> Dict[str, str]:
+        """Content hashes the manifest already records, so those files aren't read again"""
+        return {}
+
+    def _signature_now(self):
+        try:
+            return (self.directory / MANIFEST_FILENAME).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _refresh_if_due(self):
+        if time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+
+        try:
+            self._checked_at = time.monotonic()
+            if self._signature_now() != self._signature:
+                self._build()
+        except Exception as e:
+            logger.warning(f"Pronunciation bundle refresh failed: {e}")
+        finally:
+            self._lock.release()
+
+
+bundle_index = BundleIndex(settings.PRONUNCIATION_BUNDLE_DIR)
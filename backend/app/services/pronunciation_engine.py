@@ -0,0 +1,214 @@
+"""
+Table-driven pronunciation transducer for Hawaiian words.
+
+One left-to-right pass over a word drives a small finite-state machine whose
+transition table decides, per character class, whether the character extends the
+current syllable or closes it. Hawaiian syllables are (C)V or (C)VV where VV is a
+diphthong, and the ʻokina is a consonant, so the table alone yields the syllable
+split; phonetic respelling and IPA are emitted per syllable from lookup tables as
+each one closes. Stress falls on the syllable holding the penultimate mora, where
+long vowels and diphthongs count as two. Results are memoized per normalized word.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+from app.services.hawaiian_text import OKINA, normalize_word
+
+# Bump when the rules change so stored transcriptions are recomputed
+ENGINE_VERSION = 1
+
+VOWELS = "aeiouāēīōū"
+
+# Vowel pairs that glide into one syllable; any other pair is two syllables
+DIPHTHONGS = {
+    "ai", "ae", "ao", "au", "ei", "eu", "oi", "ou", "iu",
+    "āi", "āe", "āo", "āu", "ēi", "ōi", "ōu",
+}
+
+NUCLEUS_PHONETIC: Dict[str, str] = {
+    "a": "ah", "e": "eh", "i": "ee", "o": "oh", "u": "oo",
+    "ā": "ahh", "ē": "ehh", "ī": "eee", "ō": "ohh", "ū": "ooo",
+    "ai": "ai", "ae": "ai", "ao": "ow", "au": "ow", "ei": "ay",
+    "eu": "ay-oo", "oi": "oy", "ou": "oh", "iu": "ew",
+    "āi": "aai", "āe": "aai", "āo": "aow", "āu": "aow", "ēi": "aay", "ōi": "ooy", "ōu": "ohh",
+}
+
+NUCLEUS_IPA: Dict[str, str] = {
+    "a": "ɐ", "e": "ɛ", "i": "i", "o": "o", "u": "u",
+    "ā": "aː", "ē": "eː", "ī": "iː", "ō": "oː", "ū": "uː",
+    "ai": "ɐj", "ae": "ɐj", "ao": "ɐw", "au": "ɐw", "ei": "ej",
+    "eu": "ew", "oi": "oj", "ou": "ow", "iu": "iw",
+    "āi": "aːj", "āe": "aːj", "āo": "aːw", "āu": "aːw", "ēi": "eːj", "ōi": "oːj", "ōu": "oːw",
+}
+
+CONSONANT_IPA: Dict[str, str] = {
+    "h": "h", "k": "k", "l": "l", "m": "m", "n": "n", "p": "p", "w": "w", OKINA: "ʔ",
+}
+
+# States
+START, ONSET, NUCLEUS, CLOSED = range(4)
+# Character classes
+CONSONANT, VOWEL, GLIDE = range(3)
+# Actions
+APPEND, BREAK = range(2)
+
+TRANSITIONS: Dict[Tuple[int, int], Tuple[int, int]] = {
+    (START, CONSONANT): (ONSET, APPEND),
+    (START, VOWEL): (NUCLEUS, APPEND),
+    (ONSET, CONSONANT): (ONSET, APPEND),  # Clusters only occur in loanwords
+    (ONSET, VOWEL): (NUCLEUS, APPEND),
+    (NUCLEUS, CONSONANT): (ONSET, BREAK),
+    (NUCLEUS, VOWEL): (NUCLEUS, BREAK),
+    (NUCLEUS, GLIDE): (CLOSED, APPEND),
+    (CLOSED, CONSONANT): (ONSET, BREAK),
+    (CLOSED, VOWEL): (NUCLEUS, BREAK),
+}
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:%s[^\W\d_]+)*|%s[^\W\d_]+" % (OKINA, OKINA))
+
+TIP_W = "W sounds like 'v' before i and e"
+TIP_OKINA = "The ʻokina (ʻ) is a glottal stop - make a brief pause"
+TIP_KAHAKO = "Hold vowels with macrons (lines above) longer"
+TIP_STRESS = "Stress usually falls on the second-to-last syllable"
+TIP_HIATUS = "Pronounce each vowel separately"
+TIP_DIPHTHONG = "Vowel pairs like 'ai', 'au' and 'ei' glide together as one sound"
+
+
+class Transcription(NamedTuple):
+    word: str
+    syllables: Tuple[str, ...]
+    phonetic: str
+    ipa: str
+    tips: Tuple[str, ...]
+    stressed: int = -1  # Index into syllables, -1 for single-syllable words and phrases
+
+
+def _voiced_w(onset: str, nucleus: str, previous: str) -> bool:
+    """W is pronounced v next to i and e"""
+    return onset == "w" and (nucleus[:1] in "ieīē" or previous[-1:] in "ieīē")
+
+
+def _stressed_syllable(nuclei: List[str]) -> int:
+    """Index of the syllable holding the penultimate mora"""
+    morae = 0
+    for index in range(len(nuclei) - 1, -1, -1):
+        morae += 2 if len(nuclei[index]) > 1 or nuclei[index] in "āēīōū" else 1
+        if morae >= 2:
+            return index
+    return 0
+
+
+def _transcribe_word(word: str) -> Transcription:
+    syllables: List[str] = []
+    phonetic: List[str] = []
+    ipa: List[str] = []
+    onset: List[str] = []
+    nuclei: List[str] = []
+    nucleus = ""
+    previous = ""
+    state = START
+    hiatus = diphthong = voiced_w = False
+
+    def close():
+        nonlocal onset, nucleus, previous, voiced_w
+        sounds = []
+        sounds_ipa = []
+        for c in onset:
+            if _voiced_w(c, nucleus, previous):
+                voiced_w = True
+                sounds.append("v")
+                sounds_ipa.append("v")
+            else:
+                sounds.append(c)
+                sounds_ipa.append(CONSONANT_IPA.get(c, c))
+        syllables.append("".join(onset) + nucleus)
+        phonetic.append("".join(sounds) + NUCLEUS_PHONETIC.get(nucleus, nucleus))
+        ipa.append("".join(sounds_ipa) + NUCLEUS_IPA.get(nucleus, nucleus))
+        nuclei.append(nucleus)
+        previous = nucleus
+        onset = []
+        nucleus = ""
+
+    for char in word:
+        if char in VOWELS:
+            char_class = GLIDE if state == NUCLEUS and nucleus + char in DIPHTHONGS else VOWEL
+        else:
+            char_class = CONSONANT
+
+        state_after, action = TRANSITIONS[(state, char_class)]
+        if action == BREAK:
+            if char_class == VOWEL:
+                hiatus = True
+            close()
+        if char_class == CONSONANT:
+            onset.append(char)
+        else:
+            nucleus += char
+            diphthong = diphthong or char_class == GLIDE
+        state = state_after
+
+    if nucleus:
+        close()
+    elif onset:
+        # A trailing consonant (loanwords only) joins the last syllable
+        tail = "".join(onset)
+        if syllables:
+            syllables[-1] += tail
+            phonetic[-1] += tail
+            ipa[-1] += "".join(CONSONANT_IPA.get(c, c) for c in onset)
+        else:
+            syllables.append(tail)
+            phonetic.append(tail)
+            ipa.append(tail)
+
+    stressed = -1
+    if len(syllables) > 1:
+        stressed = _stressed_syllable(nuclei)
+        phonetic[stressed] = phonetic[stressed].upper()
+        ipa[stressed] = "ˈ" + ipa[stressed]
+
+    tips = []
+    if voiced_w:
+        tips.append(TIP_W)
+    if OKINA in word:
+        tips.append(TIP_OKINA)
+    if any(c in "āēīōū" for c in word):
+        tips.append(TIP_KAHAKO)
+    if len(syllables) > 2 and stressed == len(syllables) - 2:
+        tips.append(TIP_STRESS)
+    if hiatus:
+        tips.append(TIP_HIATUS)
+    if diphthong:
+        tips.append(TIP_DIPHTHONG)
+
+    return Transcription(word, tuple(syllables), "-".join(phonetic), f"[{''.join(ipa)}]", tuple(tips), stressed)
+
+
+@lru_cache(maxsize=8192)
+def _transcribe(key: str) -> Transcription:
+    words = words_in(key)
+    if len(words) == 1:
+        return _transcribe_word(words[0])
+
+    parts = [_transcribe_word(word) for word in words]
+    tips = []
+    for part in parts:
+        tips.extend(tip for tip in part.tips if tip not in tips)
+    return Transcription(
+        key,
+        tuple(syllable for part in parts for syllable in part.syllables),
+        " ".join(part.phonetic for part in parts),
+        " ".join(part.ipa for part in parts),
+        tuple(tips)
+    )
+
+
+def words_in(text: str) -> List[str]:
+    """Split running text into normalized words, keeping ʻokina inside them"""
+    return _WORD_RE.findall(normalize_word(text))
+
+
+def transcribe(word: str) -> Transcription:
+    """Syllables, phonetic respelling, IPA and tips for a word or short phrase"""
+    return _transcribe(normalize_word(word))
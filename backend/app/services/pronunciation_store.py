@@ -0,0 +1,240 @@
+"""
+Database-backed pronunciation entries with a hot in-memory map.
+
+Curated entries live in the `pronunciations` table; every other dictionary word
+is served from the `dictionary_pronunciations` rows written by
+scripts/precompute_pronunciations.py, as long as they are current for both the
+dictionary row and the engine. Each worker loads both once into a dict of compact
+tuples and serves `get_pronunciation` from memory. Writers bump the
+`pronunciations` change counter; workers notice via Postgres NOTIFY or by polling
+the counter every PRONUNCIATION_CACHE_POLL_SECONDS, then reload on a background
+thread while lookups keep serving the current map.
+"""
+import logging
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.pronunciation import DictionaryPronunciation, Pronunciation
+from app.models.translation import Dictionary
+from app.services import change_counters
+from app.services.hawaiian_text import fold_word, normalize_word
+from app.services.pronunciation_engine import ENGINE_VERSION
+
+logger = logging.getLogger(__name__)
+
+COUNTER_NAME = "pronunciations"
+
+# Seed entries for an empty table (formerly the PRONUNCIATION_DATA literal)
+DEFAULT_PRONUNCIATIONS: Dict[str, dict] = {
+    "aloha": {
+        "phonetic": "ah-LOH-hah",
+        "ipa": "[ɐˈloːhɐ]",
+        "syllables": ["a", "lo", "ha"],
+        "audio_file": "aloha.mp3",
+        "tips": [
+            "Stress on the second syllable 'LO'",
+            "Each vowel is pronounced separately",
+            "The 'a' sounds like 'ah' in 'father'"
+        ]
+    },
+    "mahalo": {
+        "phonetic": "mah-HAH-loh",
+        "ipa": "[mɐˈhaːlo]",
+        "syllables": ["ma", "ha", "lo"],
+        "audio_file": "mahalo.mp3",
+        "tips": [
+            "Stress on the second syllable 'HA'",
+            "The 'o' at the end is pronounced like 'oh'"
+        ]
+    },
+    "ohana": {
+        "phonetic": "oh-HAH-nah",
+        "ipa": "[oˈhaːnɐ]",
+        "syllables": ["o", "ha", "na"],
+        "audio_file": "ohana.mp3",
+        "tips": [
+            "Stress on the second syllable 'HA'",
+            "Each vowel is distinct"
+        ]
+    },
+    "keiki": {
+        "phonetic": "KAY-kee",
+        "ipa": "[ˈkejki]",
+        "syllables": ["kei", "ki"],
+        "audio_file": "keiki.mp3",
+        "tips": [
+            "Stress on the first syllable 'KAY'",
+            "The 'ei' makes an 'ay' sound"
+        ]
+    },
+    "wiki": {
+        "phonetic": "VEE-kee",
+        "ipa": "[ˈviki]",
+        "syllables": ["wi", "ki"],
+        "audio_file": "wiki.mp3",
+        "tips": [
+            "W sounds like 'v' before 'i'",
+            "Stress on the first syllable"
+        ]
+    }
+}
+
+
+class PronunciationEntry(NamedTuple):
+    word: str
+    phonetic: str
+    ipa: str
+    syllables: Tuple[str, ...]
+    tips: Tuple[str, ...]
+    audio_file: Optional[str]
+
+
+class PronunciationStore:
+    def __init__(self, poll_seconds: Optional[int] = None):
+        self.poll_seconds = settings.PRONUNCIATION_CACHE_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self._entries: Dict[str, PronunciationEntry] = {}
+        self._folded: Dict[str, str] = {}
+        self._version = -1
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, word: str) -> Optional[PronunciationEntry]:
+        """Exact lookup first, then the ʻokina/kahakō-insensitive key"""
+        self._refresh_if_due()
+        key = normalize_word(word)
+        entry = self._entries.get(key)
+        if entry is None:
+            exact = self._folded.get(fold_word(key))
+            entry = self._entries.get(exact) if exact else None
+        return entry
+
+    def invalidate(self):
+        """Force a version check on the next lookup"""
+        self._checked_at = 0.0
+
+    def load(self, db: Optional[Session] = None):
+        owns_session = db is None
+        db = db or SessionLocal()
+        try:
+            with self._lock:
+                version = change_counters.read(db, COUNTER_NAME)
+                self._load_entries(db)
+                self._version = version
+                self._checked_at = time.monotonic()
+        finally:
+            if owns_session:
+                db.close()
+        logger.info(f"Loaded {len(self._entries)} pronunciation entries (version {self._version})")
+
+    def _load_entries(self, db: Session):
+        rows = db.execute(select(
+            Pronunciation.word, Pronunciation.display_word, Pronunciation.phonetic,
+            Pronunciation.ipa, Pronunciation.syllables, Pronunciation.tips, Pronunciation.audio_file
+        ))
+        entries = {}
+        for key, display, phonetic, ipa, syllables, tips, audio_file in rows:
+            entries[key] = PronunciationEntry(
+                display, phonetic, ipa, tuple(syllables or ()), tuple(tips or ()), audio_file
+            )
+
+        # Precomputed rows fill in the rest of the dictionary; curated entries win
+        computed = db.execute(
+            select(
+                Dictionary.hawaiian_word, DictionaryPronunciation.phonetic, DictionaryPronunciation.ipa,
+                DictionaryPronunciation.syllables, DictionaryPronunciation.tips
+            )
+            .join(DictionaryPronunciation, DictionaryPronunciation.dictionary_id == Dictionary.id)
+            .where(
+                DictionaryPronunciation.engine_version == ENGINE_VERSION,
+                DictionaryPronunciation.source_updated_at == func.coalesce(Dictionary.updated_at, Dictionary.created_at)
+            )
+            .order_by(Dictionary.id)
+            .execution_options(yield_per=1000)
+        )
+        for display, phonetic, ipa, syllables, tips in computed:
+            key = normalize_word(display)
+            if key and key not in entries:
+                entries[key] = PronunciationEntry(
+                    display.strip(), phonetic, ipa, tuple(syllables or ()), tuple(tips or ()), None
+                )
+
+        folded = {}
+        for key in entries:
+            # Ambiguous folded keys (e.g. pau / paʻu) are left out rather than guessed
+            fold = fold_word(key)
+            folded[fold] = None if fold in folded and folded[fold] != key else key
+
+        # Swap whole maps so readers never see a half-built cache
+        self._entries = entries
+        self._folded = {fold: key for fold, key in folded.items() if key}
+
+    def _refresh_if_due(self):
+        if time.monotonic() - self._checked_at < self.poll_seconds:
+            return
+        if not self._lock.acquire(blocking=False):
+            return  # Another thread is already refreshing; serve the current map
+
+        # Lookups run on the event loop from async handlers, so the database check
+        # happens on a background thread and this lookup serves the current map
+        self._checked_at = time.monotonic()
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        try:
+            db = SessionLocal()
+            try:
+                version = change_counters.read(db, COUNTER_NAME)
+                if version != self._version:
+                    self._load_entries(db)
+                    self._version = version
+                    logger.info(f"Reloaded {len(self._entries)} pronunciation entries (version {version})")
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"Pronunciation cache refresh failed: {e}")
+        finally:
+            self._lock.release()
+
+
+def upsert_pronunciation(db: Session, word: str, **fields) -> Pronunciation:
+    """Create or update an entry, link it to the dictionary, and signal other workers"""
+    key = normalize_word(word)
+    entry = db.query(Pronunciation).filter(Pronunciation.word == key).first()
+    if entry is None:
+        entry = Pronunciation(word=key, display_word=word.strip())
+        db.add(entry)
+
+    for name, value in fields.items():
+        setattr(entry, name, value)
+
+    if entry.dictionary_id is None:
+        entry.dictionary_id = db.execute(
+            select(Dictionary.id).where(func.lower(Dictionary.hawaiian_word) == key).limit(1)
+        ).scalar()
+
+    change_counters.bump(db, COUNTER_NAME)
+    return entry
+
+
+def seed_pronunciations(db: Session):
+    """Populate an empty table with the built-in entries"""
+    if db.query(Pronunciation.id).first() is not None:
+        return
+
+    for word, data in DEFAULT_PRONUNCIATIONS.items():
+        upsert_pronunciation(db, word, **data)
+    db.commit()
+    logger.info(f"Seeded {len(DEFAULT_PRONUNCIATIONS)} pronunciation entries")
+
+
+pronunciation_store = PronunciationStore()
+change_counters.change_listener.subscribe(COUNTER_NAME, pronunciation_store.invalidate)
@@ -0,0 +1,90 @@
+"""
+Size-bounded LRU cache of rendered files on local disk.
+
+Recency is tracked in memory and mirrored to file access times, so a restarted
+worker rebuilds the same order from a directory scan. Modification times are
+left alone and keep meaning "when this file was rendered", which Last-Modified
+reports. Entries written by other workers are adopted on first access.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRUCache:
+    def __init__(self, directory, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # filename -> size
+        self._total = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.is_file() and not entry.name.startswith("."):
+                    stat = entry.stat()
+                    entries.append((stat.st_atime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._total += size
+        self._loaded = True
+
+    def get(self, filename: str) -> Optional[os.stat_result]:
+        """Return the cached file's stat (marking it most recently used), or None"""
+        path = self.directory / filename
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                if filename in self._entries:
+                    self._total -= self._entries.pop(filename)
+            return None
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if filename not in self._entries:
+                self._entries[filename] = stat.st_size
+                self._total += stat.st_size
+            self._entries.move_to_end(filename)
+        try:
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except OSError:
+            pass
+        return stat
+
+    def put(self, filename: str, source: Path) -> os.stat_result:
+        """Move a finished file into the cache, evict the least recently used entries
+        and return the new file's stat"""
+        target = self.directory / filename
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            os.replace(source, target)
+            stat = target.stat()
+            size = stat.st_size
+            self._total += size - self._entries.pop(filename, 0)
+            self._entries[filename] = size
+
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                evicted, evicted_size = self._entries.popitem(last=False)
+                self._total -= evicted_size
+                try:
+                    (self.directory / evicted).unlink()
+                except FileNotFoundError:
+                    pass
+                logger.debug(f"Evicted {evicted} from {self.directory}")
+        return stat
+
+    def path(self, filename: str) -> Path:
+        return self.directory / filename
@@ -0,0 +1,213 @@
+"""
+Spaced-repetition review scheduling.
+
+Every word a learner studies becomes a `review_cards` row carrying its SM-2 state
+(ease, interval, repetitions) and `due_at`. The due queue is a range scan of the
+(user_id, due_at) index. Grades arrive in batches: the graded cards are read in
+one query, rescheduled in memory and written back with a single executemany
+UPDATE, so a thousand grades cost three statements. Learners coming back after
+a long break can spread their overdue backlog over the following days the same
+way instead of facing it all at once.
+
+Lesson vocabulary is added automatically when a lesson is first completed;
+dictionary words are added on request.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.lesson import Lesson
+from app.models.review import ReviewCard
+from app.models.translation import Dictionary
+from app.schemas.review import ReviewGrade
+from app.services import events
+from app.services.hawaiian_text import normalize_word
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_GRADE = 3
+MAX_INTERVAL_DAYS = 365
+
+SCHEDULE_FIELDS = ("ease", "interval_days", "repetitions", "lapses", "due_at", "last_reviewed_at")
+
+
+class UnknownCardsError(ValueError):
+    def __init__(self, card_ids: List[int]):
+        self.card_ids = card_ids
+        super().__init__(f"Unknown review cards: {', '.join(str(card_id) for card_id in card_ids)}")
+
+
+class Schedule(NamedTuple):
+    ease: float
+    interval_days: float
+    repetitions: int
+    lapses: int
+    due_at: datetime
+    last_reviewed_at: datetime
+
+
+class RebalanceReport(NamedTuple):
+    overdue: int
+    rescheduled: int
+    days: int
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def schedule(card: Dict, grade: int, reviewed_at: datetime) -> Schedule:
+    """SM-2 step for one review of `card` (a dict of its scheduling columns)
+
+    Late reviews that still pass earn half the extra time the learner
+    remembered the word for, so cards that survived a long break grow faster.
+    """
+    ease = max(MIN_EASE, card["ease"] + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    repetitions = card["repetitions"]
+    lapses = card["lapses"]
+
+    if grade < PASSING_GRADE:
+        lapses += 1 if repetitions else 0
+        repetitions = 0
+        interval = 1.0
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            previous = card["interval_days"]
+            last = card["last_reviewed_at"]
+            elapsed = (reviewed_at - _utc(last)).total_seconds() / 86400 if last else previous
+            interval = max(previous + 1, (previous + max(0.0, elapsed - previous) / 2) * ease)
+    interval = min(interval, MAX_INTERVAL_DAYS)
+
+    return Schedule(ease, interval, repetitions, lapses, reviewed_at + timedelta(days=interval), reviewed_at)
+
+
+def due_cards(db: Session, user_id: int, limit: int, now: Optional[datetime] = None) -> List[ReviewCard]:
+    """The next `limit` cards due, most overdue first"""
+    now = now or datetime.now(timezone.utc)
+    return db.execute(
+        select(ReviewCard)
+        .where(ReviewCard.user_id == user_id, ReviewCard.due_at <= now)
+        .order_by(ReviewCard.due_at)
+        .limit(limit)
+    ).scalars().all()
+
+
+def grade_cards(db: Session, user_id: int, grades: List[ReviewGrade]) -> List[Dict]:
+    """Apply a batch of grades in review order and return the updated cards; the caller commits"""
+    now = datetime.now(timezone.utc)
+    table = ReviewCard.__table__
+    card_ids = sorted({grade.card_id for grade in grades})
+    cards = {
+        row["id"]: dict(row)
+        for row in db.execute(
+            select(table).where(table.c.user_id == user_id, table.c.id.in_(card_ids))
+        ).mappings()
+    }
+    missing = [card_id for card_id in card_ids if card_id not in cards]
+    if missing:
+        raise UnknownCardsError(missing)
+
+    timed = sorted(((min(_utc(grade.reviewed_at), now) if grade.reviewed_at else now, grade) for grade in grades),
+                   key=lambda item: item[0])
+    for reviewed_at, grade in timed:
+        cards[grade.card_id].update(schedule(cards[grade.card_id], grade.grade, reviewed_at)._asdict())
+
+    db.execute(update(ReviewCard), [
+        {"id": card["id"], **{field: card[field] for field in SCHEDULE_FIELDS}} for card in cards.values()
+    ])
+    events.publish(db, events.REVIEWS_GRADED, user_id, graded=len(grades))
+    return [cards[card_id] for card_id in card_ids]
+
+
+def rebalance_overdue(db: Session, user_id: int, max_per_day: int, now: Optional[datetime] = None) -> RebalanceReport:
+    """Leave `max_per_day` overdue cards due now and spread the rest over the following days
+
+    Cards with the shortest intervals, the ones most likely forgotten, stay at
+    the front. The caller commits.
+    """
+    now = now or datetime.now(timezone.utc)
+    overdue = db.execute(
+        select(ReviewCard.id, ReviewCard.interval_days, ReviewCard.due_at)
+        .where(ReviewCard.user_id == user_id, ReviewCard.due_at <= now)
+    ).all()
+    overdue.sort(key=lambda card: (card.interval_days, _utc(card.due_at)))
+
+    moves = [
+        {"id": card.id, "due_at": now + timedelta(days=position // max_per_day, seconds=position % max_per_day)}
+        for position, card in enumerate(overdue) if position >= max_per_day
+    ]
+    if moves:
+        db.execute(update(ReviewCard), moves)
+        events.publish(db, events.REVIEW_QUEUE_CHANGED, user_id, rescheduled=len(moves))
+    days = (len(overdue) - 1) // max_per_day + 1 if overdue else 0
+    return RebalanceReport(overdue=len(overdue), rescheduled=len(moves), days=days)
+
+
+def add_cards(db: Session, user_id: int, cards: Iterable[Dict]) -> int:
+    """Create cards for new words (dicts with word, translation and optional sources); returns how many were added"""
+    now = datetime.now(timezone.utc)
+    rows = {}
+    for card in cards:
+        word = normalize_word(card.get("word") or "")
+        if word and card.get("translation") and word not in rows:
+            rows[word] = {
+                "user_id": user_id,
+                "word": word,
+                "translation": card["translation"],
+                "dictionary_id": card.get("dictionary_id"),
+                "lesson_id": card.get("lesson_id"),
+                "ease": DEFAULT_EASE,
+                "interval_days": 0,
+                "repetitions": 0,
+                "lapses": 0,
+                "due_at": now,
+            }
+    if not rows:
+        return 0
+
+    table = ReviewCard.__table__
+    added = db.execute(
+        dialect_insert(db.get_bind(), table).values(list(rows.values()))
+        .on_conflict_do_nothing(index_elements=[table.c.user_id, table.c.word])
+        .returning(table.c.id)
+    ).scalars().all()
+    if added:
+        events.publish(db, events.REVIEW_QUEUE_CHANGED, user_id, added=len(added))
+    return len(added)
+
+
+def dictionary_cards(db: Session, dictionary_ids: List[int]) -> List[Dict]:
+    entries = db.execute(
+        select(Dictionary.id, Dictionary.hawaiian_word, Dictionary.english_translation)
+        .where(Dictionary.id.in_(dictionary_ids))
+    )
+    return [
+        {"word": word, "translation": translation, "dictionary_id": entry_id}
+        for entry_id, word, translation in entries
+    ]
+
+
+def vocabulary_cards(db: Session, lesson_ids: List[int]) -> List[Dict]:
+    lessons = db.execute(
+        select(Lesson.id, Lesson.vocabulary).where(Lesson.id.in_(lesson_ids)).order_by(Lesson.order_index)
+    )
+    return [
+        {"word": item.get("word"), "translation": item.get("translation"), "lesson_id": lesson_id}
+        for lesson_id, vocabulary in lessons
+        for item in vocabulary or []
+    ]
+
+
+@events.subscribe(events.PROGRESS_RECORDED)
+def _on_progress(db: Session, event: events.Event):
+    completed = [progress.lesson_id for progress in event.data["updates"] if progress.newly_completed]
+    if completed:
+        add_cards(db, event.user_id, vocabulary_cards(db, completed))
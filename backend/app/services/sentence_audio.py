@@ -0,0 +1,146 @@
+"""
+Sentence-level pronunciation audio stitched from per-word native speaker clips.
+
+Words are resolved through the audio manifest and joined with short crossfades by
+ffmpeg into one AAC stream. Renders are stored in a disk LRU cache keyed by the
+normalized text plus the content hashes of the clips used, so re-recording a word
+naturally produces a fresh render.
+"""
+import hashlib
+import logging
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, NamedTuple
+
+from app.core.config import settings
+from app.services.audio_index import AudioAsset, audio_index
+from app.services.hawaiian_text import normalize_word
+from app.services.pronunciation_store import pronunciation_store
+from app.services.render_cache import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+MAX_WORDS = 30
+CROSSFADE_SECONDS = 0.03
+RENDER_EXTENSION = ".m4a"
+RENDER_MIME_TYPE = "audio/mp4"
+RENDER_TIMEOUT_SECONDS = 30
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+sentence_cache = DiskLRUCache(
+    settings.AUDIO_RENDER_CACHE_DIR,
+    settings.AUDIO_RENDER_CACHE_MAX_MB * 1024 * 1024
+)
+
+
+class MissingAudioError(Exception):
+    def __init__(self, words: List[str]):
+        super().__init__(f"No recording for: {', '.join(words)}")
+        self.words = words
+
+
+class AudioToolUnavailable(Exception):
+    pass
+
+
+class RenderFailed(Exception):
+    pass
+
+
+class RenderTimedOut(RenderFailed):
+    pass
+
+
+class RenderedAudio(NamedTuple):
+    path: Path
+    key: str
+    size: int
+    mtime: float
+
+
+def sentence_words(text: str) -> List[str]:
+    return _WORD_RE.findall(normalize_word(text))
+
+
+def resolve_clip(word: str):
+    """Find the recording for a word via the manifest, then via its pronunciation entry"""
+    asset = audio_index.for_word(word)
+    if asset is None:
+        entry = pronunciation_store.get(word)
+        if entry is not None and entry.audio_file:
+            asset = audio_index.get(entry.audio_file)
+    return asset
+
+
+def render_key(words: List[str], clips: List[AudioAsset]) -> str:
+    digest = hashlib.sha256(" ".join(words).encode("utf-8"))
+    for clip in clips:
+        digest.update(clip.sha256.encode("ascii"))
+    return digest.hexdigest()
+
+
+def _stitch(clips: List[AudioAsset], output: Path):
+    command = ["ffmpeg", "-v", "error", "-y"]
+    for clip in clips:
+        command += ["-i", str(clip.path)]
+
+    # Resample every clip to one format, then fold them together with acrossfade
+    filters = [
+        f"[{i}]aformat=sample_rates=48000:channel_layouts=mono[c{i}]"
+        for i in range(len(clips))
+    ]
+    current = "c0"
+    for i in range(1, len(clips)):
+        label = f"x{i}"
+        filters.append(
+            f"[{current}][c{i}]acrossfade=d={CROSSFADE_SECONDS}:c1=tri:c2=tri[{label}]"
+        )
+        current = label
+
+    command += [
+        "-filter_complex", ";".join(filters), "-map", f"[{current}]",
+        "-c:a", "aac", "-b:a", "64k", "-movflags", "+faststart", str(output)
+    ]
+    try:
+        subprocess.run(command, check=True, capture_output=True, timeout=RENDER_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        raise RenderTimedOut(f"Rendering took longer than {RENDER_TIMEOUT_SECONDS}s")
+    except subprocess.CalledProcessError as e:
+        logger.warning(f"ffmpeg failed stitching {len(clips)} clips: {e.stderr.decode(errors='replace').strip()}")
+        raise RenderFailed("ffmpeg could not render the sentence")
+
+
+def render_sentence(text: str) -> RenderedAudio:
+    words = sentence_words(text)[:MAX_WORDS]
+    if not words:
+        raise ValueError("No Hawaiian words in text")
+
+    clips = []
+    missing = []
+    for word in words:
+        clip = resolve_clip(word)
+        if clip is None:
+            missing.append(word)
+        clips.append(clip)
+    if missing:
+        raise MissingAudioError(missing)
+
+    key = render_key(words, clips)
+    filename = key[:40] + RENDER_EXTENSION
+
+    stat = sentence_cache.get(filename)
+    if stat is None:
+        if not shutil.which("ffmpeg"):
+            raise AudioToolUnavailable("ffmpeg is required to render sentence audio")
+        # Render next to the cache so the final move is an atomic same-filesystem rename
+        sentence_cache.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=sentence_cache.directory, prefix=".render-") as tmp:
+            output = Path(tmp) / filename
+            _stitch(clips, output)
+            stat = sentence_cache.put(filename, output)
+
+    return RenderedAudio(sentence_cache.path(filename), key, stat.st_size, stat.st_mtime)
@@ -0,0 +1,106 @@
+"""
+Daily study streaks.
+
+A streak counts consecutive days, in the learner's own timezone, with at least one
+study session or lesson activity. `record_activity` maintains it as activity
+arrives: the first activity of a day extends the streak when the previous active
+day was yesterday and starts a new one otherwise, so nothing ever scans session
+history. Each update also stores `breaks_at`, the UTC instant the streak lapses
+(local midnight at the end of the day after the last active day).
+
+`reset_broken_streaks` zeroes every streak whose `breaks_at` has passed with one
+set-based UPDATE driven by the index on that column, then clears `breaks_at`, so
+each run only touches the users it resets however many users there are.
+"""
+import logging
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timezones import is_timezone
+from app.models.progress import UserStreak
+from app.models.user import User
+from app.services import events
+
+logger = logging.getLogger(__name__)
+
+
+def user_timezone(user: User) -> ZoneInfo:
+    """The user's preferred timezone, falling back to DEFAULT_TIMEZONE"""
+    name = (user.preferences or {}).get("timezone")
+    return ZoneInfo(name if name and is_timezone(name) else settings.DEFAULT_TIMEZONE)
+
+
+def _utc(moment: datetime) -> datetime:
+    # Naive datetimes from clients are taken as UTC
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def record_activity(db: Session, user_id: int, at: Optional[datetime] = None) -> bool:
+    """Count activity at `at` (default now) towards the user's streak; returns whether it changed"""
+    now = datetime.now(timezone.utc)
+    at = min(_utc(at), now) if at else now
+
+    # Lock the user row so concurrent requests can't both extend the same day
+    user = db.get(User, user_id, with_for_update=True, populate_existing=True)
+    tz = user_timezone(user)
+    day = at.astimezone(tz).date()
+
+    streak = db.get(UserStreak, user_id)
+    if streak is not None and streak.last_active_date >= day:
+        return False  # Already counted, or late activity from an earlier day
+
+    extends = streak is not None and streak.last_active_date == day - timedelta(days=1)
+    current = (user.current_streak or 0) + 1 if extends else 1
+    longest = max(user.longest_streak or 0, current)
+    breaks_at = datetime.combine(day + timedelta(days=2), time.min, tzinfo=tz).astimezone(timezone.utc)
+
+    if streak is None:
+        db.add(UserStreak(user_id=user_id, last_active_date=day, breaks_at=breaks_at))
+    else:
+        streak.last_active_date = day
+        streak.breaks_at = breaks_at
+    user.current_streak = current
+    user.longest_streak = longest
+    db.flush()
+
+    events.publish(
+        db, events.STREAK_UPDATED, user_id, current_streak=current, longest_streak=longest, breaks_at=breaks_at
+    )
+    return True
+
+
+def reset_broken_streaks(db: Session, now: Optional[datetime] = None) -> int:
+    """Zero every streak that lapsed before `now` and return how many were reset"""
+    now = _utc(now) if now else datetime.now(timezone.utc)
+    lapsed = UserStreak.breaks_at <= now
+
+    reset = db.execute(
+        update(User)
+        .where(User.id.in_(select(UserStreak.user_id).where(lapsed)))
+        .where(User.current_streak != 0)
+        .values(current_streak=0)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.execute(
+        update(UserStreak).where(lapsed).values(breaks_at=None).execution_options(synchronize_session=False)
+    )
+    db.commit()
+    logger.info(f"Reset {reset} lapsed streaks")
+    return reset
+
+
+@events.subscribe(events.STUDY_SESSION_RECORDED)
+def _on_study_session(db: Session, event: events.Event):
+    record_activity(db, event.user_id, event.data.get("occurred_at"))
+
+
+@events.subscribe(events.PROGRESS_RECORDED)
+def _on_progress(db: Session, event: events.Event):
+    # Queued offline events carry when they happened; the latest one decides the day
+    occurred = [_utc(e.occurred_at) for e in event.data["events"] if e.occurred_at]
+    record_activity(db, event.user_id, max(occurred) if occurred else None)
@@ -0,0 +1,177 @@
+"""
+Study analytics rollups.
+
+Study sessions are summed into `study_rollups` per hour and per day (UTC) for
+each learner, each class the learner belongs to, and everyone. Charts then
+read at most a few hundred rollup rows with one primary-key range scan, however
+many sessions there are.
+
+`rollup_sessions` is incremental. A watermark records the highest session id
+already rolled up; each run reads only newer sessions in id order, adds their
+totals into the rollup rows with multi-row upserts and advances the watermark
+in the same transaction, batch by batch, so an interrupted run resumes where it
+stopped. A run only reads up to the highest id the previous run saw: ids are
+handed out before their transactions commit, and waiting one run guarantees no
+lower id can still appear. Totals therefore lag by one run interval.
+
+Sessions count towards the classes their learner is in when they are rolled up.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.analytics import RollupWatermark, StudyRollup
+from app.models.leaderboard import ClassroomMember
+from app.models.progress import StudySession
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "study_sessions"
+
+HOUR = "hour"
+DAY = "day"
+PERIODS = (HOUR, DAY)
+
+USER = "user"
+CLASS = "class"
+ALL = "all"
+
+MEASURES = ("sessions", "minutes", "translations", "exercises")
+
+UPSERT_ROWS = 500
+
+
+class RollupReport(NamedTuple):
+    sessions: int
+    buckets: int
+    last_id: int
+
+
+def as_utc(moment: datetime) -> datetime:
+    """Aware UTC datetime; naive values are taken to be UTC already"""
+    return moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def ensure_rollup_columns(engine: Engine):
+    """Drop the never-filled points column from a study_rollups table created with it"""
+    if "points" not in {column["name"] for column in inspect(engine).get_columns("study_rollups")}:
+        return
+
+    # Workers start together; on Postgres the ones that lose the race find it gone
+    if_exists = "IF EXISTS " if engine.dialect.name == "postgresql" else ""
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE study_rollups DROP COLUMN {if_exists}points"))
+
+
+def bucket_start(moment: datetime, period: str) -> datetime:
+    moment = as_utc(moment)
+    if period == DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _aggregate(db: Session, sessions) -> Dict[Tuple[str, str, int, datetime], List[int]]:
+    user_ids = {session.user_id for session in sessions}
+    classes = defaultdict(list)
+    for user_id, classroom_id in db.execute(
+        select(ClassroomMember.user_id, ClassroomMember.classroom_id).where(ClassroomMember.user_id.in_(user_ids))
+    ):
+        classes[user_id].append(classroom_id)
+
+    totals = defaultdict(lambda: [0] * len(MEASURES))
+    for session in sessions:
+        if session.started_at is None:
+            continue
+        values = (
+            1,
+            session.duration_minutes or 0,
+            session.translations_made or 0,
+            session.exercises_completed or 0,
+        )
+        scopes = [(USER, session.user_id), (ALL, 0)] + [(CLASS, class_id) for class_id in classes[session.user_id]]
+        for period in PERIODS:
+            start = bucket_start(session.started_at, period)
+            for scope, scope_id in scopes:
+                bucket = totals[period, scope, scope_id, start]
+                for index, value in enumerate(values):
+                    bucket[index] += value
+    return totals
+
+
+def _add_totals(db: Session, totals: Dict[Tuple[str, str, int, datetime], List[int]]):
+    table = StudyRollup.__table__
+    rows = [
+        {"period": period, "scope": scope, "scope_id": scope_id, "bucket_start": start, **dict(zip(MEASURES, values))}
+        for (period, scope, scope_id, start), values in sorted(totals.items())
+    ]
+    for offset in range(0, len(rows), UPSERT_ROWS):
+        insert = dialect_insert(db.get_bind(), table).values(rows[offset:offset + UPSERT_ROWS])
+        db.execute(insert.on_conflict_do_update(
+            index_elements=[table.c.period, table.c.scope, table.c.scope_id, table.c.bucket_start],
+            set_={measure: table.c[measure] + insert.excluded[measure] for measure in MEASURES}
+        ))
+
+
+def rollup_sessions(db: Session, batch_size: int = 5000) -> RollupReport:
+    """Roll up sessions recorded since the last run, committing after each batch"""
+    newest = db.execute(select(func.max(StudySession.id))).scalar() or 0
+    if db.get(RollupWatermark, WATERMARK) is None:
+        # Sessions that existed before the first run have long been committed
+        db.execute(
+            dialect_insert(db.get_bind(), RollupWatermark.__table__)
+            .values(name=WATERMARK, last_id=0, horizon_id=newest)
+            .on_conflict_do_nothing(index_elements=[RollupWatermark.__table__.c.name])
+        )
+        db.commit()
+
+    processed = buckets = 0
+    while True:
+        # The row lock keeps overlapping runs from rolling up the same sessions twice
+        mark = db.get(RollupWatermark, WATERMARK, with_for_update=True, populate_existing=True)
+        sessions = db.execute(
+            select(StudySession)
+            .where(StudySession.id > mark.last_id, StudySession.id <= mark.horizon_id)
+            .order_by(StudySession.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not sessions:
+            mark.horizon_id = max(newest, mark.last_id)
+            db.commit()
+            break
+
+        totals = _aggregate(db, sessions)
+        _add_totals(db, totals)
+        mark.last_id = sessions[-1].id
+        db.commit()
+        processed += len(sessions)
+        buckets += len(totals)
+
+    logger.info(f"Rolled up {processed} study sessions into {buckets} buckets")
+    return RollupReport(sessions=processed, buckets=buckets, last_id=mark.last_id)
+
+
+def study_series(db: Session, period: str, scope: str, scope_id: int,
+                 start: datetime, end: datetime) -> List[StudyRollup]:
+    """Non-empty buckets in [start, end), oldest first"""
+    return db.execute(
+        select(StudyRollup)
+        .where(
+            StudyRollup.period == period,
+            StudyRollup.scope == scope,
+            StudyRollup.scope_id == scope_id,
+            StudyRollup.bucket_start >= bucket_start(start, period),
+            StudyRollup.bucket_start < end,
+        )
+        .order_by(StudyRollup.bucket_start)
+    ).scalars().all()
+
+
+def rolled_up_at(db: Session) -> Optional[datetime]:
+    """When the rollup job last advanced"""
+    return db.execute(select(RollupWatermark.updated_at).where(RollupWatermark.name == WATERMARK)).scalar()
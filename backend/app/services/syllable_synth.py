@@ -0,0 +1,235 @@
+"""
+Concatenative word synthesis from recorded Hawaiian syllable units.
+
+Hawaiian has a closed syllable inventory (a vowel, optionally after one of
+h k l m n p w), so a library of roughly 45 short recordings covers every word.
+Units live in SYLLABLE_UNITS_DIR as mono 16-bit WAV files named by their text
+(`ka.wav`, `a.wav`, optionally diphthong units such as `kai.wav`). A word is
+split by the pronunciation engine, each syllable is matched greedily against the
+longest available units, the syllable the engine marks as stressed is made louder
+and slightly longer, kahakō vowels are lengthened, ʻokina become a short closure,
+and units are joined with brief crossfades.
+
+Everything is plain Python (`wave` and `array`), so rendering needs no external
+services; the batch job in scripts/synthesize_audio.py pre-renders every
+dictionary word into SYNTH_AUDIO_DIR, which is served through its own audio index.
+"""
+import hashlib
+import io
+import math
+import re
+import wave
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from app.core.config import settings
+from app.services.audio_index import AudioIndex
+from app.services.hawaiian_text import OKINA, normalize_word
+
+# Bump when the rendering rules change so cached words are re-rendered
+SYNTH_VERSION = 2
+
+STRESS_GAIN = 1.3
+STRESS_LENGTH = 1.15
+LONG_VOWEL_LENGTH = 1.7
+CROSSFADE_SECONDS = 0.012
+GLOTTAL_STOP_SECONDS = 0.05
+ONSET_SECONDS = 0.06  # Leading consonant portion left unstretched
+MAX_UNIT_LENGTH = 4
+
+_LONG_VOWELS = {"ā": "a", "ē": "e", "ī": "i", "ō": "o", "ū": "u"}
+_WORD_RE = re.compile(r"^[a-zāēīōū%s]+$" % OKINA)
+
+
+class MissingUnitsError(Exception):
+    def __init__(self, units: List[str]):
+        super().__init__(f"No syllable units for: {', '.join(units)}")
+        self.units = units
+
+
+class Segment(NamedTuple):
+    unit: Optional[str]  # None is a glottal closure
+    length: float
+    gain: float
+
+
+class UnitLibrary:
+    """Decoded syllable units, all at one sample rate"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.units: Dict[str, array] = {}
+        self.sample_rate = 0
+        self.fingerprint = ""
+
+    def __len__(self):
+        return len(self.units)
+
+    def load(self) -> "UnitLibrary":
+        units = {}
+        sample_rate = 0
+        digest = hashlib.sha256(f"v{SYNTH_VERSION}".encode("ascii"))
+        paths = sorted(self.directory.glob("*.wav")) if self.directory.is_dir() else []
+        for path in paths:
+            with wave.open(str(path), "rb") as f:
+                if f.getnchannels() != 1 or f.getsampwidth() != 2:
+                    raise ValueError(f"{path.name}: syllable units must be mono 16-bit WAV")
+                if sample_rate and f.getframerate() != sample_rate:
+                    raise ValueError(f"{path.name}: expected {sample_rate} Hz like the other units")
+                sample_rate = f.getframerate()
+                frames = f.readframes(f.getnframes())
+            samples = array("h")
+            samples.frombytes(frames)
+            name = normalize_word(path.stem)
+            units[name] = samples
+            digest.update(name.encode("utf-8"))
+            digest.update(hashlib.sha256(frames).digest())
+
+        self.units = units
+        self.sample_rate = sample_rate
+        self.fingerprint = digest.hexdigest()
+        return self
+
+
+def is_synthesizable(word: str) -> bool:
+    return bool(_WORD_RE.match(normalize_word(word)))
+
+
+def plan_segments(syllables: Sequence[str], available, stressed: Optional[int] = None) -> List[Segment]:
+    """Map syllables onto library units, carrying stress and vowel length
+
+    `stressed` defaults to the penultimate syllable. Raises MissingUnitsError
+    naming every piece the library cannot cover.
+    """
+    segments = []
+    missing = []
+    if stressed is None:
+        stressed = len(syllables) - 2 if len(syllables) > 1 else -1
+
+    for index, syllable in enumerate(syllables):
+        text = normalize_word(syllable)
+        position = 0
+        while position < len(text):
+            if text[position] == OKINA:
+                segments.append(Segment(None, 1.0, 1.0))
+                position += 1
+                continue
+
+            end = min(len(text), position + MAX_UNIT_LENGTH)
+            while end > position:
+                piece = text[position:end]
+                if OKINA not in piece:
+                    plain = "".join(_LONG_VOWELS.get(c, c) for c in piece)
+                    if plain in available:
+                        break
+                end -= 1
+            if end == position:
+                # Report the consonant-vowel unit a recording session would need
+                size = 2 if text[position] not in "aeiouāēīōū" and position + 1 < len(text) else 1
+                missing.append("".join(_LONG_VOWELS.get(c, c) for c in text[position:position + size]))
+                position += size
+                continue
+
+            is_long = any(c in _LONG_VOWELS for c in piece)
+            length = (LONG_VOWEL_LENGTH if is_long else 1.0) * (STRESS_LENGTH if index == stressed else 1.0)
+            # Long vowels draw stress in Hawaiian as well
+            gain = STRESS_GAIN if index == stressed or is_long else 1.0
+            segments.append(Segment(plain, length, gain))
+            position = end
+
+    if missing:
+        raise MissingUnitsError(sorted(set(missing)))
+    return segments
+
+
+def _stretch(samples: Sequence[float], factor: float, sample_rate: int) -> List[float]:
+    """Lengthen audio without changing pitch (waveform-similarity overlap-add)"""
+    frame = max(int(sample_rate * 0.03), 16)
+    hop = frame // 2
+    tolerance = hop // 2
+    if factor <= 1.0 or len(samples) < frame * 2:
+        return list(samples)
+
+    window = [0.5 - 0.5 * math.cos(2 * math.pi * i / frame) for i in range(frame)]
+    out_length = int(len(samples) * factor)
+    output = [0.0] * (out_length + frame)
+    weights = [0.0] * (out_length + frame)
+    last_start = len(samples) - frame
+    previous = 0
+    out_position = 0
+
+    while out_position < out_length:
+        target = min(int(out_position / factor), last_start)
+        start = target
+        natural = previous + hop
+        if out_position and natural + hop <= len(samples):
+            # Pick the offset whose frame best continues the previous one
+            best = -math.inf
+            for offset in range(-tolerance, tolerance + 1, 4):
+                candidate = min(max(target + offset, 0), last_start)
+                score = sum(samples[candidate + j] * samples[natural + j] for j in range(0, hop, 4))
+                if score > best:
+                    best, start = score, candidate
+
+        for j in range(frame):
+            w = window[j]
+            output[out_position + j] += samples[start + j] * w
+            weights[out_position + j] += w
+        previous = start
+        out_position += hop
+
+    return [value / weight if weight > 1e-3 else 0.0 for value, weight in zip(output[:out_length], weights[:out_length])]
+
+
+@lru_cache(maxsize=512)
+def _render_unit(library: UnitLibrary, unit: str, length: float, gain: float) -> List[float]:
+    samples = library.units[unit]
+    if length > 1.0:
+        # Keep the consonant onset intact and stretch the vowel that follows
+        onset = min(int(library.sample_rate * ONSET_SECONDS), len(samples) * 2 // 5) if unit[0] not in "aeiou" else 0
+        tail_factor = (len(samples) * length - onset) / max(len(samples) - onset, 1)
+        rendered = list(samples[:onset]) + _stretch(samples[onset:], tail_factor, library.sample_rate)
+    else:
+        rendered = list(samples)
+    return [value * gain for value in rendered]
+
+
+def synthesize(syllables: Sequence[str], library: UnitLibrary, stressed: Optional[int] = None) -> bytes:
+    """Render a word as WAV bytes"""
+    segments = plan_segments(syllables, library.units, stressed)
+    rate = library.sample_rate
+    fade = int(rate * CROSSFADE_SECONDS)
+    output: List[float] = []
+
+    for segment in segments:
+        if segment.unit is None:
+            output.extend([0.0] * int(rate * GLOTTAL_STOP_SECONDS))
+            continue
+
+        rendered = _render_unit(library, segment.unit, segment.length, segment.gain)
+        overlap = min(fade, len(output), len(rendered) // 2)
+        if overlap and output[-1] != 0.0:
+            for j in range(overlap):
+                mix = (j + 1) / (overlap + 1)
+                output[len(output) - overlap + j] = output[len(output) - overlap + j] * (1 - mix) + rendered[j] * mix
+            output.extend(rendered[overlap:])
+        else:
+            output.extend(rendered)
+
+    pcm = array("h", (max(-32768, min(32767, int(round(value)))) for value in output))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def synth_filename(word: str) -> str:
+    return normalize_word(word) + ".wav"
+
+
+synth_index = AudioIndex(settings.SYNTH_AUDIO_DIR)
@@ -2,6 +2,7 @@ import openai
 from typing import Dict, List, Optional
 from app.core.config import settings
 from app.models.translation import Dictionary
+from app.services.pronunciation_engine import transcribe
 from sqlalchemy.orm import Session
 import json
 import logging
@@ -309,7 +310,8 @@ Format your response as JSON:
             return {
                 'hawaiian': word.hawaiian_word,
                 'english': word.english_translation,
-                'pronunciation': word.pronunciation_ipa,
+                # Filled in bulk by scripts/precompute_pronunciations.py; generate for rows it hasn't reached
+                'pronunciation': word.pronunciation_ipa or transcribe(word.hawaiian_word).ipa,
                 'part_of_speech': word.part_of_speech,
                 'example': word.example_sentences[0] if word.example_sentences else None,
                 'cultural_notes': word.cultural_notes
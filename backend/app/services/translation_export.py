@@ -0,0 +1,138 @@
+"""
+Streaming export of translation history.
+
+Rows are read from a server-side cursor in `yield_per` batches and written straight
+into NDJSON or CSV chunks, optionally gzipped on the fly, so memory stays constant
+however long the history is. Rows are ordered by id; pass the last id a client
+received as `after_id` to resume an interrupted export.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.base import SessionLocal
+from app.models.translation import Translation
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+EXPORT_COLUMNS = [
+    Translation.id,
+    Translation.user_id,
+    Translation.source_text,
+    Translation.translated_text,
+    Translation.source_language,
+    Translation.target_language,
+    Translation.cultural_context,
+    Translation.word_meanings,
+    Translation.created_at,
+    Translation.is_favorite,
+]
+
+FIELD_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+# Rows fetched per round trip and bytes buffered per yielded chunk
+BATCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+
+def iter_rows(db: Session, statement, batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+    """Stream rows of a column select without loading them into the identity map"""
+    result = db.execute(statement.execution_options(yield_per=batch_size))
+    for row in result:
+        yield dict(row._mapping)
+
+
+def history_statement(user_id: int, after_id: int = 0):
+    return (
+        select(*EXPORT_COLUMNS)
+        .where(Translation.user_id == user_id, Translation.id > after_id)
+        .order_by(Translation.id)
+    )
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def csv_lines(rows: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELD_NAMES)
+    writer.writeheader()
+
+    for row in rows:
+        # Nested JSON goes into a single cell so the deck stays one row per translation
+        if row.get("word_meanings") is not None:
+            row["word_meanings"] = json.dumps(row["word_meanings"], ensure_ascii=False)
+        if isinstance(row.get("created_at"), datetime):
+            row["created_at"] = row["created_at"].isoformat()
+        writer.writerow(row)
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def chunked(lines: Iterable[str], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Group small lines into larger writes"""
+    parts = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        parts.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            yield b"".join(parts)
+            parts = []
+            size = 0
+    if parts:
+        yield b"".join(parts)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into a gzip member incrementally"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode_rows(rows: Iterable[dict], export_format: str, compress: bool = False) -> Iterator[bytes]:
+    lines = ndjson_lines(rows) if export_format == "ndjson" else csv_lines(rows)
+    chunks = chunked(lines)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_history(
+    user_id: int,
+    export_format: str = "ndjson",
+    after_id: int = 0,
+    compress: bool = False,
+    db: Optional[Session] = None
+) -> Iterator[bytes]:
+    """Yield the encoded export; opens its own session so it outlives the request scope"""
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        rows = iter_rows(db, history_statement(user_id, after_id))
+        yield from encode_rows(rows, export_format, compress)
+    finally:
+        if owns_session:
+            db.close()
@@ -0,0 +1,365 @@
+"""
+Partitioning and retention for the translations table.
+
+On Postgres `translations` is range-partitioned by month on created_at, so /history
+reads only touch the per-partition (user_id, created_at) indexes of recent months
+and old months can be dropped wholesale. The retention job compacts old anonymous
+rows into `phrase_frequencies`, archives the raw rows as gzipped NDJSON on local
+disk and then removes them. SQLite runs the same job with range deletes.
+"""
+import hashlib
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.upsert import dialect_insert
+from app.models.translation import PhraseFrequency, Translation
+from app.services.translation_export import EXPORT_COLUMNS, encode_rows, iter_rows
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "translations_y"
+
+
+class ArchiveError(RuntimeError):
+    pass
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month.year}m{month.month:02d}"
+
+
+# Partition management (Postgres only)
+
+def is_partitioned(conn) -> bool:
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'translations'"
+    )).first() is not None
+
+
+def ensure_translation_partitions(engine: Engine, months_ahead: Optional[int] = None):
+    """Convert translations to a monthly partitioned table and create upcoming partitions"""
+    if engine.dialect.name != "postgresql":
+        return
+
+    months_ahead = settings.TRANSLATION_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            _convert_to_partitioned(conn)
+
+        current = month_start(datetime.now(timezone.utc).date())
+        for offset in range(months_ahead + 1):
+            _ensure_partition(conn, add_months(current, offset))
+
+
+def _convert_to_partitioned(conn):
+    """One-off migration of the plain table created by create_all"""
+    logger.info("Converting translations to a monthly partitioned table")
+
+    conn.execute(text("ALTER TABLE translations RENAME TO translations_unpartitioned"))
+    conn.execute(text("ALTER SEQUENCE IF EXISTS translations_id_seq OWNED BY NONE"))
+    conn.execute(text(
+        "CREATE TABLE translations (LIKE translations_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    ))
+    conn.execute(text("ALTER TABLE translations ALTER COLUMN created_at SET NOT NULL"))
+    conn.execute(text("CREATE TABLE translations_default PARTITION OF translations DEFAULT"))
+
+    bounds = conn.execute(text(
+        "SELECT min(created_at), max(created_at) FROM translations_unpartitioned"
+    )).first()
+    if bounds[0] is not None:
+        month = month_start(bounds[0].date())
+        while month <= bounds[1].date():
+            _ensure_partition(conn, month)
+            month = add_months(month, 1)
+
+    conn.execute(text(
+        "INSERT INTO translations SELECT id, user_id, source_text, translated_text, "
+        "source_language, target_language, cultural_context, word_meanings, "
+        "coalesce(created_at, now()), is_favorite FROM translations_unpartitioned"
+    ))
+    conn.execute(text("DROP TABLE translations_unpartitioned"))
+    conn.execute(text("ALTER SEQUENCE IF EXISTS translations_id_seq OWNED BY translations.id"))
+
+    # Constraints and indexes on the parent cascade to every partition
+    conn.execute(text("ALTER TABLE translations ADD PRIMARY KEY (id, created_at)"))
+    conn.execute(text("ALTER TABLE translations ADD FOREIGN KEY (user_id) REFERENCES users (id)"))
+    conn.execute(text("CREATE INDEX ix_translations_id ON translations (id)"))
+    conn.execute(text(
+        "CREATE INDEX ix_translations_user_created ON translations (user_id, created_at)"
+    ))
+
+
+def _ensure_partition(conn, month: date):
+    name = partition_name(month)
+    exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+    if exists:
+        return
+
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+
+    # Build the partition standalone so rows that landed in the default partition can move in first
+    conn.execute(text(f"CREATE TABLE {name} (LIKE translations INCLUDING DEFAULTS)"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM translations_default "
+        f"WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), {"lower": lower, "upper": upper})
+    conn.execute(text(
+        f"ALTER TABLE translations ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    ))
+    logger.info(f"Created partition {name}")
+
+
+def _drop_partition_if_empty(conn, month: date) -> bool:
+    name = partition_name(month)
+    if not conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+        return False
+    if conn.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first():
+        return False
+
+    conn.execute(text(f"ALTER TABLE translations DETACH PARTITION {name}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    logger.info(f"Dropped empty partition {name}")
+    return True
+
+
+# Retention job
+
+@dataclass
+class RetentionReport:
+    months: List[str] = field(default_factory=list)
+    anonymous_archived: int = 0
+    user_archived: int = 0
+    phrases_compacted: int = 0
+    partitions_dropped: int = 0
+    archive_files: List[str] = field(default_factory=list)
+
+
+def phrase_hash(source_language: str, target_language: str, source_text: str, translated_text: str) -> str:
+    key = "\x1f".join([source_language, target_language, source_text, translated_text])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _month_filter(month: date, anonymous: bool):
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    nxt = add_months(month, 1)
+    end = datetime(nxt.year, nxt.month, 1, tzinfo=timezone.utc)
+    owner = Translation.user_id.is_(None) if anonymous else Translation.user_id.isnot(None)
+    return and_(owner, Translation.created_at >= start, Translation.created_at < end)
+
+
+def _archive(db: Session, condition, path: Path) -> int:
+    """Stream matching rows to a gzipped NDJSON temp file, synced to disk, returning the row count"""
+    statement = select(*EXPORT_COLUMNS).where(condition).order_by(Translation.id)
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        f = open(tmp_path, "xb")
+    except FileExistsError:
+        # A leftover temp file may hold the only copy of rows a crashed run deleted
+        raise ArchiveError(
+            f"{tmp_path} is left over from an interrupted run; check it against the "
+            f"database and move it aside before running retention again"
+        )
+    try:
+        with f:
+            for chunk in encode_rows(counted(iter_rows(db, statement)), "ndjson", compress=True):
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if count == 0:
+        tmp_path.unlink()
+    return count
+
+
+def _finalize_archive(path: Path) -> Path:
+    """Move a completed archive into place without clobbering an earlier run"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    target = path
+    part = 1
+    while target.exists():
+        target = path.with_name(path.name.replace(".ndjson.gz", f".{part}.ndjson.gz"))
+        part += 1
+    os.replace(tmp_path, target)
+
+    # Make the rename itself durable before any rows are deleted
+    directory = os.open(target.parent, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+    return target
+
+
+def _compact(db: Session, month: date) -> int:
+    """Fold a month of anonymous rows into phrase_frequencies"""
+    source = func.lower(func.trim(Translation.source_text))
+    grouped = (
+        select(
+            Translation.source_language,
+            Translation.target_language,
+            source.label("source_text"),
+            Translation.translated_text,
+            func.count().label("count"),
+            func.min(Translation.created_at).label("first_seen"),
+            func.max(Translation.created_at).label("last_seen"),
+        )
+        .where(_month_filter(month, anonymous=True))
+        .group_by(Translation.source_language, Translation.target_language, source, Translation.translated_text)
+    )
+
+    batch: List[Dict] = []
+    total = 0
+    for row in iter_rows(db, grouped):
+        row["phrase_hash"] = phrase_hash(
+            row["source_language"], row["target_language"], row["source_text"], row["translated_text"]
+        )
+        row["period"] = month
+        batch.append(row)
+        if len(batch) >= 1000:
+            total += _upsert_phrases(db, batch)
+            batch = []
+    if batch:
+        total += _upsert_phrases(db, batch)
+    return total
+
+
+def _upsert_phrases(db: Session, rows: List[Dict]) -> int:
+    table = PhraseFrequency.__table__
+    insert = dialect_insert(db.get_bind(), table)
+    statement = insert.on_conflict_do_update(
+        index_elements=[table.c.phrase_hash, table.c.period],
+        set_={
+            "count": table.c.count + insert.excluded.count,
+            "first_seen": func.coalesce(table.c.first_seen, insert.excluded.first_seen),
+            "last_seen": insert.excluded.last_seen,
+        }
+    )
+    db.execute(statement, rows)
+    return len(rows)
+
+
+def _oldest_month(db: Session) -> Optional[date]:
+    if db.get_bind().dialect.name == "postgresql":
+        # Read the oldest month off the partition catalog instead of scanning every row
+        names = db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = 'translations'"
+        )).scalars().all()
+        months = [
+            date(int(name[len(PARTITION_PREFIX):][:4]), int(name[-2:]), 1)
+            for name in names if name.startswith(PARTITION_PREFIX)
+        ]
+        stray = db.execute(text("SELECT min(created_at) FROM translations_default")).scalar()
+        if stray is not None:
+            months.append(month_start(stray.date()))
+        return min(months) if months else None
+
+    oldest = db.execute(select(func.min(Translation.created_at))).scalar()
+    return month_start(oldest.date()) if oldest else None
+
+
+def run_retention(
+    db: Session,
+    archive_dir: Optional[Path] = None,
+    anonymous_months: Optional[int] = None,
+    user_months: Optional[int] = None,
+    today: Optional[date] = None
+) -> RetentionReport:
+    """Compact, archive and remove translations older than the retention windows"""
+    archive_dir = Path(archive_dir or settings.TRANSLATION_ARCHIVE_DIR)
+    anonymous_months = settings.TRANSLATION_ANON_RETENTION_MONTHS if anonymous_months is None else anonymous_months
+    if user_months is None:
+        user_months = settings.TRANSLATION_USER_RETENTION_MONTHS
+    current = month_start(today or datetime.now(timezone.utc).date())
+    report = RetentionReport()
+
+    anonymous_cutoff = add_months(current, -anonymous_months)
+    user_cutoff = add_months(current, -user_months) if user_months is not None else None
+
+    month = _oldest_month(db)
+    if month is None:
+        return report
+
+    while month < anonymous_cutoff or (user_cutoff and month < user_cutoff):
+        label = f"{month.year}-{month.month:02d}"
+        jobs = []
+        if month < anonymous_cutoff:
+            jobs.append(True)
+        if user_cutoff and month < user_cutoff:
+            jobs.append(False)
+
+        for anonymous in jobs:
+            condition = _month_filter(month, anonymous)
+            path = archive_dir / ("anonymous" if anonymous else "users") / f"{label}.ndjson.gz"
+
+            archived = _archive(db, condition, path)
+            if not archived:
+                continue
+
+            # The archive is on disk before the delete commits; a crash in between
+            # leaves the rows in both places and the next run archives them again
+            archive = _finalize_archive(path)
+            try:
+                if anonymous:
+                    report.phrases_compacted += _compact(db, month)
+                db.execute(delete(Translation).where(condition).execution_options(synchronize_session=False))
+                db.commit()
+            except Exception:
+                db.rollback()
+                archive.unlink(missing_ok=True)
+                raise
+
+            report.archive_files.append(str(archive))
+            if anonymous:
+                report.anonymous_archived += archived
+            else:
+                report.user_archived += archived
+            if label not in report.months:
+                report.months.append(label)
+
+        if db.get_bind().dialect.name == "postgresql":
+            with db.get_bind().begin() as conn:
+                if _drop_partition_if_empty(conn, month):
+                    report.partitions_dropped += 1
+
+        month = add_months(month, 1)
+
+    logger.info(
+        f"Retention archived {report.anonymous_archived} anonymous and {report.user_archived} "
+        f"user translations, compacted {report.phrases_compacted} phrases"
+    )
+    return report
@@ -0,0 +1,237 @@
+"""
+Full-text search over a user's translation history.
+
+Postgres uses an expression GIN index over to_tsvector(source_text || translated_text),
+scoped to rows that belong to a user. SQLite uses an FTS5 table kept in sync with
+triggers. In both cases the index is maintained by the database itself, so every
+write path that inserts into `translations` is covered without extra code.
+"""
+import html
+import logging
+import re
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.translation import Translation
+
+logger = logging.getLogger(__name__)
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+# The database marks matches with private-use characters; the text is HTML-escaped
+# before they become <mark> tags, so user input can never inject markup
+_MATCH_START = "\ue000"
+_MATCH_STOP = "\ue001"
+
+# ʻokina and the apostrophes people type in its place split tokens, so "ohana" finds "ʻohana"
+OKINA_CHARS = "ʻ‘’'"
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Postgres: same expression in the index and the query so the planner can use it
+PG_DOCUMENT = (
+    "to_tsvector('simple', translate(coalesce(source_text, '') || ' ' || "
+    "coalesce(translated_text, ''), 'ʻ‘’''', '    '))"
+)
+
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS translations_fts USING fts5(
+        owner, source_text, translated_text,
+        tokenize = "unicode61 remove_diacritics 2 separators 'ʻ‘’'''"
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS translations_fts_insert AFTER INSERT ON translations
+    WHEN new.user_id IS NOT NULL BEGIN
+        INSERT INTO translations_fts(rowid, owner, source_text, translated_text)
+        VALUES (new.id, 'u' || new.user_id, new.source_text, new.translated_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS translations_fts_delete AFTER DELETE ON translations
+    WHEN old.user_id IS NOT NULL BEGIN
+        DELETE FROM translations_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS translations_fts_update
+    AFTER UPDATE OF user_id, source_text, translated_text ON translations BEGIN
+        DELETE FROM translations_fts WHERE rowid = old.id;
+        INSERT INTO translations_fts(rowid, owner, source_text, translated_text)
+        SELECT new.id, 'u' || new.user_id, new.source_text, new.translated_text
+        WHERE new.user_id IS NOT NULL;
+    END
+    """,
+]
+
+
+def ensure_search_index(engine: Engine):
+    """Create the search index for the current database if it is missing"""
+    dialect = engine.dialect.name
+
+    if dialect == "postgresql":
+        _ensure_postgres_index(engine)
+    elif dialect == "sqlite":
+        _ensure_sqlite_index(engine)
+    else:
+        logger.warning(f"No full-text index support for {dialect}, search will scan history")
+
+
+def _ensure_postgres_index(engine: Engine):
+    # btree_gin lets one GIN index cover (user_id, document); fall back to a plain GIN index
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+        columns = f"user_id, ({PG_DOCUMENT})"
+    except Exception as e:
+        logger.warning(f"btree_gin unavailable, using document-only GIN index: {e}")
+        columns = f"({PG_DOCUMENT})"
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_translations_search ON translations "
+            f"USING GIN ({columns}) WHERE user_id IS NOT NULL"
+        ))
+
+
+def _ensure_sqlite_index(engine: Engine):
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'translations_fts'"
+        )).first()
+
+        for statement in SQLITE_FTS_DDL:
+            conn.execute(text(statement))
+
+        if not exists:
+            # Backfill rows written before the index existed
+            conn.execute(text(
+                "INSERT INTO translations_fts(rowid, owner, source_text, translated_text) "
+                "SELECT id, 'u' || user_id, source_text, translated_text "
+                "FROM translations WHERE user_id IS NOT NULL"
+            ))
+            logger.info("Built translations_fts index")
+
+
+def _query_tokens(query: str) -> List[str]:
+    for char in OKINA_CHARS:
+        query = query.replace(char, " ")
+    return _TOKEN_RE.findall(query.lower())[:16]
+
+
+def search_history(db: Session, user_id: int, query: str, limit: int = 20, skip: int = 0) -> List[Dict]:
+    """Rank a user's translations against `query`, best matches first"""
+    tokens = _query_tokens(query)
+    if not tokens:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        rows = _search_postgres(db, user_id, tokens, limit, skip)
+    elif dialect == "sqlite":
+        rows = _search_sqlite(db, user_id, tokens, limit, skip)
+    else:
+        rows = _search_fallback(db, user_id, tokens, limit, skip)
+
+    results = []
+    for row in rows:
+        result = dict(row._mapping)
+        result["source_highlight"] = _render_highlight(result["source_highlight"])
+        result["translated_highlight"] = _render_highlight(result["translated_highlight"])
+        results.append(result)
+    return results
+
+
+def _render_highlight(value):
+    """Escape highlighted text as HTML, then turn the match markers into <mark> tags"""
+    if value is None:
+        return None
+    return html.escape(value).replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_STOP, HIGHLIGHT_STOP)
+
+
+def _search_postgres(db: Session, user_id: int, tokens: List[str], limit: int, skip: int):
+    # Prefix match every term so partial words work while typing
+    ts_query = " & ".join(f"{token}:*" for token in tokens)
+    options = f"StartSel={_MATCH_START}, StopSel={_MATCH_STOP}, HighlightAll=true"
+
+    # Headlines are only computed for the page of hits, not every match
+    return db.execute(text(f"""
+        SELECT hit.id, hit.source_text, hit.translated_text, hit.source_language,
+               hit.target_language, hit.cultural_context, hit.created_at, hit.is_favorite,
+               hit.rank,
+               ts_headline('simple', hit.source_text, q, :options) AS source_highlight,
+               ts_headline('simple', hit.translated_text, q, :options) AS translated_highlight
+        FROM (
+            SELECT t.*, ts_rank_cd({PG_DOCUMENT}, q) AS rank
+            FROM translations t, to_tsquery('simple', :ts_query) q
+            WHERE t.user_id = :user_id AND {PG_DOCUMENT} @@ q
+            ORDER BY rank DESC, t.created_at DESC
+            LIMIT :limit OFFSET :skip
+        ) hit, to_tsquery('simple', :ts_query) q
+        ORDER BY hit.rank DESC, hit.created_at DESC
+    """), {
+        "ts_query": ts_query,
+        "options": options,
+        "user_id": user_id,
+        "limit": limit,
+        "skip": skip,
+    }).all()
+
+
+def _search_sqlite(db: Session, user_id: int, tokens: List[str], limit: int, skip: int):
+    # The owner column narrows the match to one user inside the FTS index itself
+    terms = " ".join(f'"{token}"*' for token in tokens)
+    match = f'owner : "u{user_id}" AND {{source_text translated_text}} : ({terms})'
+
+    return db.execute(text("""
+        SELECT t.id, t.source_text, t.translated_text, t.source_language,
+               t.target_language, t.cultural_context, t.created_at, t.is_favorite,
+               -bm25(translations_fts) AS rank,
+               highlight(translations_fts, 1, :start, :stop) AS source_highlight,
+               highlight(translations_fts, 2, :start, :stop) AS translated_highlight
+        FROM translations_fts
+        JOIN translations t ON t.id = translations_fts.rowid
+        WHERE translations_fts MATCH :match
+        ORDER BY bm25(translations_fts), t.created_at DESC
+        LIMIT :limit OFFSET :skip
+    """), {
+        "match": match,
+        "start": _MATCH_START,
+        "stop": _MATCH_STOP,
+        "limit": limit,
+        "skip": skip,
+    }).all()
+
+
+def _search_fallback(db: Session, user_id: int, tokens: List[str], limit: int, skip: int):
+    query = db.query(
+        Translation.id, Translation.source_text, Translation.translated_text,
+        Translation.source_language, Translation.target_language,
+        Translation.cultural_context, Translation.created_at, Translation.is_favorite
+    ).filter(Translation.user_id == user_id)
+
+    for token in tokens:
+        pattern = f"%{token}%"
+        query = query.filter(
+            Translation.source_text.ilike(pattern) | Translation.translated_text.ilike(pattern)
+        )
+
+    rows = query.order_by(Translation.created_at.desc()).offset(skip).limit(limit).all()
+    return [_FallbackRow(row) for row in rows]
+
+
+class _FallbackRow:
+    """Adapts a plain history row to the ranked/highlighted result shape"""
+
+    def __init__(self, row):
+        self._mapping = dict(row._mapping)
+        self._mapping.update({
+            "rank": 0.0,
+            "source_highlight": row.source_text,
+            "translated_highlight": row.translated_text,
+        })
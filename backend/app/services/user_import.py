@@ -0,0 +1,234 @@
+"""
+Bulk user import from CSV.
+
+Admins onboard whole classes at once. The file is parsed and validated in
+memory, duplicates (inside the file and against existing accounts) are found
+with one query over all emails and usernames, passwords are bcrypt-hashed in
+a long-lived process pool so every available core works on them, and users
+are inserted with multi-row INSERTs. Every input row gets a status in the
+report, so one bad row never sinks the rest of the class.
+
+Columns: email, username, password, full_name, learning_level,
+daily_goal_minutes, timezone. Only email and username are required; rows
+without a password get a generated one, returned in the report so it can be
+handed out.
+"""
+import csv
+import io
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, NamedTuple, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db.upsert import dialect_insert
+from app.models.leaderboard import ClassroomMember
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+logger = logging.getLogger(__name__)
+
+MAX_IMPORT_ROWS = 2000
+MAX_IMPORT_BYTES = 1024 * 1024  # Ample for MAX_IMPORT_ROWS rows
+REQUIRED_COLUMNS = ("email", "username")
+OPTIONAL_COLUMNS = ("password", "full_name", "learning_level", "daily_goal_minutes", "timezone")
+
+# Hashing a handful of passwords isn't worth starting worker processes
+POOL_THRESHOLD = 8
+INSERT_ROWS = 500
+
+CREATED = "created"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+class ImportRow(NamedTuple):
+    line: int
+    email: Optional[str]
+    username: Optional[str]
+    status: str
+    error: Optional[str] = None
+    user_id: Optional[int] = None
+    password: Optional[str] = None  # Only when it was generated
+
+
+class ImportReport(NamedTuple):
+    created: int
+    duplicates: int
+    invalid: int
+    rows: List[ImportRow]
+
+
+def generate_password() -> str:
+    return secrets.token_urlsafe(9)
+
+
+def parse_csv(text: str) -> List[Dict[str, str]]:
+    """Rows keyed by lowercased header, each with its 1-based line number under "line" """
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    headers = {(name or "").strip().lower() for name in reader.fieldnames or []}
+    missing = [column for column in REQUIRED_COLUMNS if column not in headers]
+    if missing:
+        raise ImportFileError(f"CSV is missing columns: {', '.join(missing)}")
+
+    rows = []
+    for record in reader:
+        row = {
+            (key or "").strip().lower(): (value or "").strip()
+            for key, value in record.items() if isinstance(value, str)
+        }
+        if not any(row.values()):
+            continue
+        row["line"] = reader.line_num
+        rows.append(row)
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise ImportFileError(f"CSV has more than {MAX_IMPORT_ROWS} users")
+    return rows
+
+
+def _cpu_count() -> int:
+    """CPUs this process may run on, which respects container CPU limits"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _hash_pool() -> ProcessPoolExecutor:
+    """One pool per process, started on first use and reused by every import"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked: the web worker has threads and open connections
+            _pool = ProcessPoolExecutor(max_workers=_cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    if len(passwords) < POOL_THRESHOLD:
+        return [get_password_hash(password) for password in passwords]
+    global _pool
+    chunksize = max(1, len(passwords) // (_cpu_count() * 4))
+    pool = _hash_pool()
+    try:
+        return list(pool.map(get_password_hash, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool next time and finish this import here
+        logger.warning("Password hashing pool broke; hashing in process")
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        return [get_password_hash(password) for password in passwords]
+
+
+def import_users(db: Session, rows: List[Dict[str, str]], classroom_id: Optional[int] = None) -> ImportReport:
+    """Create users for valid, new rows and enroll them in `classroom_id`; commits"""
+    report: Dict[int, ImportRow] = {}
+    accepted = []
+    generated = {}
+    for row in rows:
+        line = row["line"]
+        password = row.get("password") or None
+        if password is None:
+            password = generated[line] = generate_password()
+        fields = {column: row[column] for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if row.get(column)}
+        try:
+            user = UserCreate(**{**fields, "password": password})
+        except ValidationError as e:
+            error = "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in e.errors())
+            report[line] = ImportRow(line, row.get("email"), row.get("username"), INVALID, error)
+            continue
+        accepted.append((line, user))
+
+    # Repeats inside the file: the first occurrence wins
+    seen_emails, seen_usernames, unique = set(), set(), []
+    for line, user in accepted:
+        if user.email in seen_emails or user.username in seen_usernames:
+            report[line] = ImportRow(line, user.email, user.username, DUPLICATE, "Repeated in this file")
+            continue
+        seen_emails.add(user.email)
+        seen_usernames.add(user.username)
+        unique.append((line, user))
+
+    taken_emails, taken_usernames = set(), set()
+    if unique:
+        for email, username in db.execute(
+            select(User.email, User.username).where(or_(User.email.in_(seen_emails), User.username.in_(seen_usernames)))
+        ):
+            taken_emails.add(email)
+            taken_usernames.add(username)
+
+    new = []
+    for line, user in unique:
+        if user.email in taken_emails:
+            report[line] = ImportRow(line, user.email, user.username, DUPLICATE, "Email already registered")
+        elif user.username in taken_usernames:
+            report[line] = ImportRow(line, user.email, user.username, DUPLICATE, "Username already taken")
+        else:
+            new.append((line, user))
+
+    hashes = _hash_passwords([user.password for _, user in new])
+    table = User.__table__
+    created_ids = {}
+    for offset in range(0, len(new), INSERT_ROWS):
+        batch = new[offset:offset + INSERT_ROWS]
+        values = [
+            {
+                "email": user.email,
+                "username": user.username,
+                "full_name": user.full_name,
+                "hashed_password": hashed,
+                "is_active": True,
+                "is_superuser": False,
+                "preferred_language": user.preferred_language,
+                "learning_level": user.learning_level,
+                "daily_goal_minutes": user.daily_goal_minutes,
+                "total_points": 0,
+                "current_streak": 0,
+                "longest_streak": 0,
+                "lessons_completed": 0,
+                "preferences": {"timezone": user.timezone} if user.timezone else {},
+            }
+            for (_, user), hashed in zip(batch, hashes[offset:offset + INSERT_ROWS])
+        ]
+        # Accounts registered since the duplicate check are skipped, not fatal
+        inserted = db.execute(
+            dialect_insert(db.get_bind(), table).values(values).on_conflict_do_nothing().returning(table.c.id, table.c.email)
+        )
+        created_ids.update({email: user_id for user_id, email in inserted})
+
+    for line, user in new:
+        user_id = created_ids.get(user.email)
+        if user_id is None:
+            report[line] = ImportRow(line, user.email, user.username, DUPLICATE, "Registered during the import")
+        else:
+            report[line] = ImportRow(line, user.email, user.username, CREATED, user_id=user_id, password=generated.get(line))
+
+    if classroom_id is not None and created_ids:
+        db.execute(
+            dialect_insert(db.get_bind(), ClassroomMember.__table__)
+            .values([{"classroom_id": classroom_id, "user_id": user_id} for user_id in created_ids.values()])
+            .on_conflict_do_nothing()
+        )
+    db.commit()
+
+    rows_out = [report[line] for line in sorted(report)]
+    counts = {status: sum(1 for row in rows_out if row.status == status) for status in (CREATED, DUPLICATE, INVALID)}
+    logger.info(f"Imported {counts[CREATED]} users ({counts[DUPLICATE]} duplicates, {counts[INVALID]} invalid)")
+    return ImportReport(counts[CREATED], counts[DUPLICATE], counts[INVALID], rows_out)
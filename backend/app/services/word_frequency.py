@@ -0,0 +1,158 @@
+"""
+Word usage counts for translation history.
+
+Every saved translation adds its words (folded, so ʻokina and kahakō don't split
+counts) to `word_frequencies`, so reports such as the audio coverage ranking
+read a handful of rows instead of tokenizing the whole history. Counts are
+gathered in memory once the translation commits and written by a background
+thread every WORD_FREQUENCY_FLUSH_SECONDS in its own short transaction, so
+translate requests never wait on the row locks of common words. Counts are
+cumulative: rows later archived by the retention job stay counted. A worker
+that dies loses at most one interval of counts; `rebuild_word_frequencies`
+recounts from scratch and backfills history saved before the table existed.
+"""
+import atexit
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.upsert import dialect_insert
+from app.models.translation import PhraseFrequency, Translation, WordFrequency
+from app.services import events
+from app.services.hawaiian_text import fold_word
+from app.services.translation_export import iter_rows
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+UPSERT_ROWS = 500
+LOOKUP_KEYS = 1000
+
+_PENDING_KEY = "word_frequency_counts"
+
+
+def count_words(*texts: str, weight: int = 1, counts: Counter = None) -> Counter:
+    counts = Counter() if counts is None else counts
+    for text in texts:
+        for token in _TOKEN_RE.findall(text or ""):
+            key = fold_word(token)
+            if key:
+                counts[key] += weight
+    return counts
+
+
+def add_counts(db: Session, counts: Counter):
+    """Add to the stored counts; takes effect when the caller commits"""
+    table = WordFrequency.__table__
+    # Sorted so concurrent writers lock shared words in the same order
+    rows = [{"word": word, "count": count} for word, count in sorted(counts.items()) if count]
+    for offset in range(0, len(rows), UPSERT_ROWS):
+        insert = dialect_insert(db.get_bind(), table).values(rows[offset:offset + UPSERT_ROWS])
+        db.execute(insert.on_conflict_do_update(
+            index_elements=[table.c.word],
+            set_={"count": table.c.count + insert.excluded.count}
+        ))
+
+
+def word_counts(db: Session, words: Iterable[str]) -> Dict[str, int]:
+    """Stored counts for the given folded words; missing words are left out"""
+    words = list(words)
+    counts = {}
+    for offset in range(0, len(words), LOOKUP_KEYS):
+        counts.update(db.execute(
+            select(WordFrequency.word, WordFrequency.count)
+            .where(WordFrequency.word.in_(words[offset:offset + LOOKUP_KEYS]))
+        ).all())
+    return counts
+
+
+def is_empty(db: Session) -> bool:
+    return db.execute(select(WordFrequency.word).limit(1)).first() is None
+
+
+def rebuild_word_frequencies(db: Session) -> int:
+    """Recount every word in translation history and archived phrase counts; commits"""
+    counts = Counter()
+    for row in iter_rows(db, select(Translation.source_text, Translation.translated_text)):
+        count_words(row["source_text"], row["translated_text"], counts=counts)
+    statement = select(PhraseFrequency.source_text, PhraseFrequency.translated_text, PhraseFrequency.count)
+    for row in iter_rows(db, statement):
+        count_words(row["source_text"], row["translated_text"], weight=row["count"], counts=counts)
+
+    db.execute(delete(WordFrequency))
+    add_counts(db, counts)
+    db.commit()
+    logger.info(f"Rebuilt word frequencies for {len(counts)} words")
+    return len(counts)
+
+
+class CountBuffer:
+    """Word counts from committed translations, waiting to be written"""
+
+    def __init__(self, flush_seconds: int):
+        self.flush_seconds = flush_seconds
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, counts: Counter):
+        with self._lock:
+            self._counts.update(counts)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return
+        db = SessionLocal()
+        try:
+            add_counts(db, counts)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Word frequency flush failed: {e}")
+            with self._lock:
+                self._counts.update(counts)
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+
+count_buffer = CountBuffer(settings.WORD_FREQUENCY_FLUSH_SECONDS)
+atexit.register(count_buffer.flush)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _buffer_pending(session: Session):
+    counts = session.info.pop(_PENDING_KEY, None)
+    if counts:
+        count_buffer.add(counts)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _drop_pending(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+@events.subscribe(events.TRANSLATION_CREATED)
+def _on_translation(db: Session, event: events.Event):
+    count_words(
+        event.data["source_text"], event.data["translated_text"],
+        counts=db.info.setdefault(_PENDING_KEY, Counter())
+    )
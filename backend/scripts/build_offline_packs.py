@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Build offline study packs
+
+Groups published lessons into units by category and writes one zip per unit
+containing the lesson payloads, the dictionary entries and pronunciation data for
+the unit's vocabulary, and the smallest rendition of every clip the lessons
+reference. Packs whose contents are unchanged are left alone, so run it after
+seeding lessons or adding recordings; --force rebuilds every pack.
+
+Usage:
+    python build_offline_packs.py [--force]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlparse
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.lesson import Lesson
+from app.models.translation import Dictionary
+from app.services.audio_index import AudioIndex
+from app.services.hawaiian_text import normalize_word
+from app.services.lesson_payloads import lesson_payload
+from app.services.offline_packs import PACK_INFO_FILENAME, UnitContent, unit_slug, write_packs
+from app.services.pronunciation_engine import words_in
+
+PACK_DIR = Path(__file__).parent.parent / settings.OFFLINE_PACK_DIR
+AUDIO_DIR = Path(__file__).parent.parent / settings.AUDIO_DIR
+SYNTH_DIR = Path(__file__).parent.parent / settings.SYNTH_AUDIO_DIR
+
+# Built once in build(); script-relative like the directories above
+audio_index = AudioIndex(AUDIO_DIR)
+synth_index = AudioIndex(SYNTH_DIR)
+
+DICTIONARY_FIELDS = (
+    "hawaiian_word", "english_translation", "part_of_speech", "pronunciation_ipa",
+    "definitions", "example_sentences", "cultural_notes", "related_words",
+)
+
+def to_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def smallest_audio(word: str):
+    """Lowest-bitrate native clip for a word, else its synthesized clip"""
+    variants = audio_index.renditions(word)
+    return variants[0] if variants else audio_index.for_word(word) or synth_index.for_word(word)
+
+def audio_for_url(url: str):
+    """Resolve a lesson audio URL to the smallest rendition of the same clip"""
+    name = Path(urlparse(url).path).name
+    for index in (audio_index, synth_index):
+        asset, _ = index.resolve(name)
+        if asset is not None:
+            return smallest_audio(asset.word) if index is audio_index else asset
+    return None
+
+def build_unit(db, title: str, lessons: List[Lesson], audio_hashes: Dict[Path, str]) -> UnitContent:
+    from app.api.v1.pronunciation import pronunciation_for
+
+    documents: Dict[str, bytes] = {}
+    audio: Dict[str, Path] = {}
+
+    def add_audio(asset) -> str:
+        name = f"audio/{AudioIndex.versioned_name(asset)}"
+        audio[name] = asset.path
+        audio_hashes[asset.path] = asset.sha256
+        return name
+
+    words = set()
+    audio_map = {}
+    for lesson in lessons:
+        payload = lesson_payload(db, lesson.uuid)
+        documents[f"lessons/{lesson.uuid}.json"] = payload.body
+        for item in lesson.vocabulary or []:
+            if item.get("word"):
+                words.add(normalize_word(item["word"]))
+                words.update(words_in(item["word"]))
+        for url in lesson.audio_urls or []:
+            asset = audio_for_url(url)
+            if asset is not None:
+                audio_map[url] = add_audio(asset)
+
+    entries = db.execute(
+        select(Dictionary).where(func.lower(Dictionary.hawaiian_word).in_(sorted(words))).order_by(Dictionary.id)
+    ).scalars().all()
+    documents["dictionary.json"] = to_json({
+        "entries": [{field: getattr(entry, field) for field in DICTIONARY_FIELDS} for entry in entries]
+    })
+
+    pronunciations = {}
+    for word in sorted(words):
+        entry = pronunciation_for(word).model_dump(exclude_none=True, exclude={"word", "audio_renditions"})
+        asset = smallest_audio(word)
+        if asset is not None:
+            entry["audio_url"] = add_audio(asset)
+        else:
+            entry.pop("audio_url", None)
+            entry.pop("audio_source", None)
+        pronunciations[word] = entry
+    documents["pronunciations.json"] = to_json({"words": pronunciations})
+
+    documents[PACK_INFO_FILENAME] = to_json({
+        "unit": unit_slug(title),
+        "title": title,
+        "lessons": [
+            {"uuid": lesson.uuid, "id": lesson.id, "title": lesson.title, "order_index": lesson.order_index}
+            for lesson in lessons
+        ],
+        # Lets clients swap Lesson.audio_urls for the copies inside the pack
+        "audio": audio_map,
+    })
+    return UnitContent(title, len(lessons), documents, audio)
+
+def build(force: bool = False) -> bool:
+    from app.services.pronunciation_store import pronunciation_store
+
+    started = time.monotonic()
+    audio_index.build()
+    synth_index.build()
+
+    db = SessionLocal()
+    try:
+        pronunciation_store.load(db)
+        lessons = db.query(Lesson).filter(Lesson.is_published.is_(True)).order_by(Lesson.order_index).all()
+        if not lessons:
+            print("No published lessons. Run scripts/seed_lessons.py first.")
+            return False
+
+        by_unit: Dict[str, List[Lesson]] = {}
+        for lesson in lessons:
+            title = (lesson.content or {}).get("category") or lesson.lesson_type.value.title()
+            by_unit.setdefault(title, []).append(lesson)
+
+        audio_hashes: Dict[Path, str] = {}
+        units = {
+            unit_slug(title): build_unit(db, title, unit_lessons, audio_hashes)
+            for title, unit_lessons in by_unit.items()
+        }
+    finally:
+        db.close()
+
+    manifest = write_packs(PACK_DIR, units, audio_hashes, force)
+    print(f"✓ {len(manifest['rebuilt'])} of {len(manifest['packs'])} packs rebuilt "
+          f"(version {manifest['version']}, {time.monotonic() - started:.1f}s)")
+    for slug, pack in sorted(manifest["packs"].items()):
+        marker = "*" if slug in manifest["rebuilt"] else " "
+        print(f"  {marker} {pack['filename']}: {pack['lesson_count']} lessons, "
+              f"{pack['audio_count']} clips, {pack['size'] / 1024:.0f} KB")
+    return True
+
+def main():
+    """Main CLI handler"""
+    args = sys.argv[1:]
+    if args not in ([], ["--force"]):
+        print(__doc__)
+        sys.exit(1)
+    success = build("--force" in args)
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
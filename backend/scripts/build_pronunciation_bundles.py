@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Build static pronunciation bundles
+
+Collects every known word (curated pronunciation entries plus the dictionary),
+renders the same data the pronunciation API returns, including audio URLs, and
+writes content-hashed JSON shards plus manifest.json. Run it as a deploy step and
+again after adding recordings; shards whose content is unchanged keep their names,
+so clients keep their cached copies.
+
+Usage:
+    python build_pronunciation_bundles.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.pronunciation import Pronunciation
+from app.models.translation import Dictionary
+from app.services.hawaiian_text import normalize_word
+from app.services.pronunciation_bundles import write_bundles
+
+BUNDLE_DIR = Path(__file__).parent.parent / settings.PRONUNCIATION_BUNDLE_DIR
+
+def build() -> bool:
+    from app.api.v1.pronunciation import pronunciation_for
+    from app.services.audio_index import audio_index
+    from app.services.pronunciation_store import pronunciation_store
+    from app.services.syllable_synth import synth_index
+
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        pronunciation_store.load(db)
+        words = set(db.execute(select(Pronunciation.word)).scalars())
+        for word in db.execute(select(Dictionary.hawaiian_word).execution_options(yield_per=1000)).scalars():
+            if word and word.strip():
+                words.add(normalize_word(word))
+    finally:
+        db.close()
+
+    audio_index.build()
+    synth_index.build()
+
+    entries = {}
+    for key in sorted(words):
+        entry = pronunciation_for(key).model_dump(exclude_none=True)
+        entry.pop("word")
+        entries[key] = entry
+
+    manifest = write_bundles(BUNDLE_DIR, entries)
+    print(f"✓ Wrote {len(manifest['shards'])} shards for {manifest['word_count']} words "
+          f"(version {manifest['version']}, {time.monotonic() - started:.1f}s)")
+    for letter, filename in sorted(manifest["shards"].items()):
+        print(f"  {letter}: {filename}")
+    return True
+
+def main():
+    """Main CLI handler"""
+    if len(sys.argv) > 1:
+        print(__doc__)
+        sys.exit(1)
+    success = build()
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+User Import
+
+Creates accounts from a CSV file with the columns email and username, plus
+optionally password, full_name, learning_level, daily_goal_minutes and
+timezone. Rows without a password get a generated one, printed below so it can
+be handed out. Existing accounts and invalid rows are reported and skipped.
+
+Usage:
+    python import_users.py FILE [--class-id N]
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.base import SessionLocal
+from app.models.leaderboard import Classroom
+from app.services.user_import import CREATED, ImportFileError, import_users, parse_csv
+
+
+def main():
+    """Main CLI handler"""
+    args = sys.argv[1:]
+    if len(args) not in (1, 3) or (len(args) == 3 and (args[1] != "--class-id" or not args[2].isdigit())):
+        print(__doc__)
+        sys.exit(1)
+    classroom_id = int(args[2]) if len(args) == 3 else None
+
+    try:
+        rows = parse_csv(Path(args[0]).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, ImportFileError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        if classroom_id is not None and db.get(Classroom, classroom_id) is None:
+            print(f"✗ Classroom {classroom_id} not found")
+            sys.exit(1)
+        report = import_users(db, rows, classroom_id=classroom_id)
+    finally:
+        db.close()
+
+    for row in report.rows:
+        if row.status == CREATED:
+            password = f"  password: {row.password}" if row.password else ""
+            print(f"✓ line {row.line}: {row.username} <{row.email}>{password}")
+        else:
+            print(f"✗ line {row.line}: {row.username or '?'} <{row.email or '?'}> {row.status}: {row.error}")
+
+    print(f"\nCreated: {report.created}")
+    print(f"Duplicates: {report.duplicates}")
+    print(f"Invalid: {report.invalid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,26 @@ Audio File Management Script for Native Hawaiian Speaker Recordings
 
 Usage:
     python manage_audio.py add <word> <audio_file>
+    python manage_audio.py ingest <directory> [--workers N]
     python manage_audio.py list
     python manage_audio.py check
+    python manage_audio.py coverage [--limit N] [--recount]
 """
 
 import os
 import sys
 import json
 import shutil
+import hashlib
+import subprocess
+from collections import Counter, defaultdict
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Audio directory configuration
 AUDIO_DIR = Path(__file__).parent.parent / "static" / "audio" / "hawaiian"
@@ -22,6 +32,27 @@ METADATA_FILE = AUDIO_DIR / "metadata.json"
 # Supported audio formats
 SUPPORTED_FORMATS = {'.mp3', '.wav', '.ogg', '.m4a'}
 
+# Ingest input formats (anything ffmpeg decodes that recorders commonly produce)
+INGEST_FORMATS = SUPPORTED_FORMATS | {'.flac', '.aiff', '.aif', '.opus', '.webm'}
+
+# Compact renditions produced by ingest: (name, codec, bitrate, extension)
+# The first AAC rendition is the default clip because every browser can play it
+RENDITIONS = [
+    ("aac64", "aac", "64k", ".m4a"),
+    ("aac32", "aac", "32k", ".m4a"),
+    ("opus32", "libopus", "32k", ".ogg"),
+    ("opus16", "libopus", "16k", ".ogg"),
+]
+
+# Trim leading/trailing silence, then normalize loudness to a speech-friendly target
+SPEECH_FILTER = (
+    "silenceremove=start_periods=1:start_threshold=-50dB:start_silence=0.05,"
+    "areverse,"
+    "silenceremove=start_periods=1:start_threshold=-50dB:start_silence=0.05,"
+    "areverse,"
+    "loudnorm=I=-16:TP=-1.5:LRA=11"
+)
+
 def ensure_directories():
     """Ensure audio directories exist"""
     AUDIO_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,9 +65,11 @@ def load_metadata() -> Dict:
     return {}
 
 def save_metadata(metadata: Dict):
-    """Save audio metadata"""
-    with open(METADATA_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    """Save audio metadata atomically so the server never reads a partial file"""
+    tmp_file = METADATA_FILE.with_suffix(".json.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, METADATA_FILE)
 
 def add_audio(word: str, audio_file: Path):
     """Add a new audio file for a Hawaiian word"""
@@ -84,14 +117,162 @@ def add_audio(word: str, audio_file: Path):
         return False
 
 def update_pronunciation_data(word: str, filename: str):
-    """Update the pronunciation.py file with new audio reference"""
-    pronunciation_file = Path(__file__).parent.parent / "app" / "api" / "v1" / "pronunciation.py"
-    
-    print(f"Note: Remember to update PRONUNCIATION_DATA in pronunciation.py:")
-    print(f'    "{word}": {{')
-    print(f'        "audio_file": "{filename}",')
-    print(f'        # ... other pronunciation data')
-    print(f'    }}')
+    """Point the word's pronunciation entry at the new audio file"""
+    update_pronunciation_entries({word: filename})
+
+def update_pronunciation_entries(audio_files: Dict[str, str]):
+    """Point pronunciation entries at their audio files in one transaction"""
+    from app.db.base import SessionLocal
+    from app.services.pronunciation_store import upsert_pronunciation
+    from app.api.v1.pronunciation import generate_pronunciation
+    from app.models.pronunciation import Pronunciation
+    from app.services.hawaiian_text import normalize_word
+
+    db = SessionLocal()
+    try:
+        for word, filename in audio_files.items():
+            exists = db.query(Pronunciation.id).filter(Pronunciation.word == normalize_word(word)).first()
+            fields = {"audio_file": filename}
+            if not exists:
+                # New words start from the generated pronunciation; edit the row to refine it
+                generated = generate_pronunciation(word)
+                fields.update(
+                    phonetic=generated.phonetic,
+                    ipa=generated.ipa,
+                    syllables=generated.syllables,
+                    tips=generated.tips
+                )
+            upsert_pronunciation(db, word, **fields)
+        db.commit()
+        for word, filename in audio_files.items():
+            print(f"✓ Pronunciation entry for '{word}' now uses {filename}")
+    except Exception as e:
+        db.rollback()
+        print(f"Error updating pronunciation entries: {e}")
+    finally:
+        db.close()
+
+def file_sha256(path: Path) -> str:
+    """Content hash used to skip recordings that were already ingested"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def probe_duration(path: Path) -> Optional[float]:
+    """Duration in seconds according to ffprobe"""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", str(path)],
+        capture_output=True, text=True
+    )
+    try:
+        return round(float(result.stdout.strip()), 3)
+    except ValueError:
+        return None
+
+def process_recording(source: str, word_key: str, source_hash: str) -> Dict:
+    """Decode, trim, normalize and encode one recording (runs in a worker process)"""
+    source_path = Path(source)
+    with tempfile.TemporaryDirectory() as tmp:
+        master = Path(tmp) / "master.wav"
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-i", str(source_path),
+             "-af", SPEECH_FILTER, "-ac", "1", "-ar", "48000", str(master)],
+            check=True, capture_output=True
+        )
+
+        renditions = []
+        for name, codec, bitrate, extension in RENDITIONS:
+            filename = f"{word_key}.{name}{extension}"
+            tmp_target = Path(tmp) / filename
+            subprocess.run(
+                ["ffmpeg", "-v", "error", "-y", "-i", str(master),
+                 "-c:a", codec, "-b:a", bitrate, "-vn", str(tmp_target)],
+                check=True, capture_output=True
+            )
+            # Move into place atomically so the server never indexes a half-written clip
+            target = AUDIO_DIR / filename
+            shutil.copyfile(tmp_target, AUDIO_DIR / f".{filename}.tmp")
+            os.replace(AUDIO_DIR / f".{filename}.tmp", target)
+            renditions.append({
+                "name": name,
+                "filename": filename,
+                "codec": codec.replace("lib", ""),
+                "bitrate": bitrate,
+                "size_bytes": target.stat().st_size,
+                "sha256": file_sha256(target),
+            })
+
+        duration = probe_duration(master)
+
+    primary = renditions[0]
+    return {
+        "filename": primary["filename"],
+        "original_file": str(source_path),
+        "word": source_path.stem,
+        "format": primary["filename"].rsplit(".", 1)[1],
+        "size_kb": round(primary["size_bytes"] / 1024, 2),
+        "duration_seconds": duration,
+        "source_sha256": source_hash,
+        "renditions": sorted(renditions, key=lambda r: r["size_bytes"]),
+    }
+
+def ingest_directory(directory: Path, workers: Optional[int] = None) -> bool:
+    """Process a directory of recordings named <word>.<ext> in a process pool"""
+    ensure_directories()
+
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        print("Error: ingest requires ffmpeg and ffprobe on PATH")
+        return False
+    if not directory.is_dir():
+        print(f"Error: '{directory}' is not a directory")
+        return False
+
+    from app.services.hawaiian_text import normalize_word
+
+    metadata = load_metadata()
+    jobs = []
+    skipped = 0
+    for source in sorted(directory.iterdir()):
+        if source.suffix.lower() not in INGEST_FORMATS or not source.is_file():
+            continue
+        word_key = normalize_word(source.stem)
+        source_hash = file_sha256(source)
+        # Re-running ingest over the same folder only processes new or re-recorded files
+        if metadata.get(word_key, {}).get("source_sha256") == source_hash:
+            skipped += 1
+            continue
+        jobs.append((str(source), word_key, source_hash))
+
+    print(f"Ingesting {len(jobs)} recordings ({skipped} unchanged)")
+    if not jobs:
+        return True
+
+    results = {}
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_recording, *job): job for job in jobs}
+        for future in as_completed(futures):
+            source, word_key, _ = futures[future]
+            try:
+                results[word_key] = future.result()
+                smallest = results[word_key]["renditions"][0]
+                print(f"  ✓ {word_key} ({results[word_key]['duration_seconds']}s, "
+                      f"smallest {smallest['size_bytes'] / 1024:.1f} KB)")
+            except Exception as e:
+                failures += 1
+                detail = e.stderr.decode(errors="ignore").strip() if isinstance(e, subprocess.CalledProcessError) else e
+                print(f"  ✗ {Path(source).name}: {detail}")
+
+    # One metadata write for the whole batch
+    metadata.update(results)
+    save_metadata(metadata)
+    update_pronunciation_entries({word_key: info["filename"] for word_key, info in results.items()})
+
+    print(f"\nIngested {len(results)} recordings, {failures} failed")
+    return failures == 0
 
 def list_audio():
     """List all available audio files"""
@@ -152,6 +333,93 @@ def check_audio():
     
     return len(missing_priority) == 0
 
+def word_frequencies(keys: set, recount: bool = False) -> Counter:
+    """How often each folded word key appears in translation history
+
+    Reads the counts kept up to date as translations are saved; history is only
+    scanned to backfill an empty table or when a recount is asked for.
+    """
+    from app.db.base import SessionLocal
+    from app.services.word_frequency import is_empty, rebuild_word_frequencies, word_counts
+
+    db = SessionLocal()
+    try:
+        if recount or is_empty(db):
+            words = rebuild_word_frequencies(db)
+            print(f"✓ Recounted {words} words in translation history\n")
+        return Counter(word_counts(db, keys))
+    finally:
+        db.close()
+
+def coverage_report(limit: int = 50, recount: bool = False):
+    """Compare recordings on disk against every dictionary word"""
+    ensure_directories()
+
+    from sqlalchemy import select
+    from app.db.base import SessionLocal
+    from app.models.translation import Dictionary
+    from app.services.audio_index import AudioIndex
+    from app.services.hawaiian_text import fold_word
+    from app.services.translation_export import iter_rows
+
+    # The index keeps a (size, mtime) -> sha256 cache, so reruns only hash changed files
+    index = AudioIndex(AUDIO_DIR, refresh_seconds=0)
+    index.build()
+    assets = index.assets()
+
+    dictionary_words = {}
+    db = SessionLocal()
+    try:
+        for row in iter_rows(db, select(Dictionary.hawaiian_word)):
+            dictionary_words.setdefault(fold_word(row["hawaiian_word"]), row["hawaiian_word"])
+    finally:
+        db.close()
+
+    # Group files into recordings: an ingest rendition set counts as one recording
+    rendition_sets = {}
+    for key, info in load_metadata().items():
+        for rendition in info.get("renditions", []):
+            rendition_sets[rendition["filename"]] = key
+    recordings = defaultdict(set)
+    files_by_hash = defaultdict(list)
+    for asset in assets:
+        recordings[fold_word(asset.word)].add(rendition_sets.get(asset.filename, asset.filename))
+        files_by_hash[asset.sha256].append(asset.filename)
+
+    missing = [key for key in dictionary_words if key not in recordings]
+    orphaned = [key for key in recordings if key not in dictionary_words]
+    duplicates = {key: sorted(sources) for key, sources in recordings.items() if len(sources) > 1}
+    identical = [sorted(names) for names in files_by_hash.values() if len(names) > 1]
+
+    frequencies = word_frequencies(set(dictionary_words) | set(recordings), recount)
+
+    def by_frequency(keys):
+        return sorted(keys, key=lambda key: (-frequencies[key], key))
+
+    print("Audio Coverage Report")
+    print("=" * 40)
+    print(f"  Dictionary words: {len(dictionary_words)}")
+    print(f"  Audio files: {len(assets)} ({len(recordings)} words)")
+    covered = len(dictionary_words) - len(missing)
+    if dictionary_words:
+        print(f"  Coverage: {covered}/{len(dictionary_words)} ({covered / len(dictionary_words):.1%})")
+
+    print(f"\nMissing recordings ({len(missing)}), most used first:")
+    for key in by_frequency(missing)[:limit]:
+        print(f"  ✗ {dictionary_words[key]:<20} used {frequencies[key]}x")
+
+    print(f"\nOrphaned recordings ({len(orphaned)}), not in the dictionary:")
+    for key in by_frequency(orphaned)[:limit]:
+        print(f"  ? {key:<20} {', '.join(sorted(recordings[key]))}")
+
+    print(f"\nDuplicate recordings ({len(duplicates) + len(identical)}):")
+    for key in by_frequency(duplicates)[:limit]:
+        print(f"  ≠ {key:<20} {', '.join(duplicates[key])}")
+    for names in identical[:limit]:
+        print(f"  = identical content: {', '.join(names)}")
+
+    return not missing
+
 def main():
     """Main CLI handler"""
     if len(sys.argv) < 2:
@@ -169,12 +437,25 @@ def main():
         success = add_audio(word, audio_file)
         sys.exit(0 if success else 1)
     
+    elif command == "ingest":
+        if len(sys.argv) not in (3, 5) or (len(sys.argv) == 5 and sys.argv[3] != "--workers"):
+            print("Usage: python manage_audio.py ingest <directory> [--workers N]")
+            sys.exit(1)
+        workers = int(sys.argv[4]) if len(sys.argv) == 5 else None
+        success = ingest_directory(Path(sys.argv[2]), workers)
+        sys.exit(0 if success else 1)
+    
     elif command == "list":
         list_audio()
     
     elif command == "check":
         check_audio()
     
+    elif command == "coverage":
+        args = sys.argv[2:]
+        limit = int(args[args.index("--limit") + 1]) if "--limit" in args[:-1] else 50
+        coverage_report(limit, recount="--recount" in args)
+    
     else:
         print(f"Unknown command: {command}")
         print(__doc__)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Precompute pronunciations for the whole dictionary
+
+Streams dictionary rows in id order, transcribes them with the pronunciation
+engine in a process pool, and writes the results back in chunked bulk updates:
+`Dictionary.pronunciation_ipa` (unless someone has edited it by hand) plus a
+`dictionary_pronunciations` row recording syllables, phonetic, IPA, tips and the
+row version they were computed from. Rows are skipped while their `updated_at`
+and the engine version are unchanged, so re-running is cheap and an interrupted
+run resumes where it stopped. Finishing bumps the `pronunciations` change counter
+so API workers reload and serve the new rows.
+
+Usage:
+    python precompute_pronunciations.py run [--workers N] [--chunk N] [--force]
+    python precompute_pronunciations.py status
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.base import SessionLocal
+from app.db.upsert import dialect_insert
+from app.models.pronunciation import DictionaryPronunciation
+from app.models.translation import Dictionary
+from app.services import change_counters
+from app.services.pronunciation_engine import ENGINE_VERSION, transcribe
+from app.services.pronunciation_store import COUNTER_NAME
+
+CHUNK_SIZE = 1000
+
+dictionary = Dictionary.__table__
+computed = DictionaryPronunciation.__table__
+row_version = func.coalesce(dictionary.c.updated_at, dictionary.c.created_at)
+
+def stale_rows(force: bool = False):
+    """Dictionary rows with no transcription, or one computed from an older row or engine"""
+    statement = (
+        select(
+            dictionary.c.id, dictionary.c.hawaiian_word, dictionary.c.pronunciation_ipa,
+            computed.c.ipa.label("previous_ipa")
+        )
+        .select_from(dictionary.outerjoin(computed, computed.c.dictionary_id == dictionary.c.id))
+    )
+    if not force:
+        statement = statement.where(or_(
+            computed.c.dictionary_id.is_(None),
+            computed.c.engine_version != ENGINE_VERSION,
+            computed.c.source_updated_at.is_(None),
+            computed.c.source_updated_at != row_version,
+        ))
+    return statement
+
+def transcribe_chunk(words: List[str]) -> List[tuple]:
+    """Runs in a worker process"""
+    results = []
+    for word in words:
+        transcription = transcribe(word)
+        results.append((
+            transcription.phonetic, transcription.ipa,
+            list(transcription.syllables), list(transcription.tips)
+        ))
+    return results
+
+def write_chunk(db: Session, rows, results) -> int:
+    """Bulk-write one chunk; returns how many dictionary rows had their IPA filled"""
+    # Carry updated_at over explicitly so the write does not count as an edit
+    fill_ipa = (
+        update(dictionary)
+        .where(and_(
+            dictionary.c.id == bindparam("row_id"),
+            or_(
+                dictionary.c.pronunciation_ipa.is_(None),
+                dictionary.c.pronunciation_ipa == bindparam("previous_ipa"),
+            ),
+        ))
+        .values(pronunciation_ipa=bindparam("ipa"), updated_at=dictionary.c.updated_at)
+    )
+    ipa_updates = [
+        {"row_id": row.id, "ipa": ipa, "previous_ipa": row.previous_ipa}
+        for row, (_, ipa, _, _) in zip(rows, results)
+        if row.pronunciation_ipa != ipa and (row.pronunciation_ipa is None or row.pronunciation_ipa == row.previous_ipa)
+    ]
+    if ipa_updates:
+        db.execute(fill_ipa, ipa_updates)
+
+    # The row version is copied inside the database so it compares equal to the source column
+    insert = dialect_insert(db.get_bind(), computed).values(
+        dictionary_id=bindparam("row_id"),
+        source_updated_at=select(row_version).where(dictionary.c.id == bindparam("row_id")).scalar_subquery(),
+        engine_version=ENGINE_VERSION,
+        phonetic=bindparam("phonetic"),
+        ipa=bindparam("ipa"),
+        syllables=bindparam("syllables", type_=computed.c.syllables.type),
+        tips=bindparam("tips", type_=computed.c.tips.type),
+    )
+    db.execute(
+        insert.on_conflict_do_update(
+            index_elements=[computed.c.dictionary_id],
+            set_={
+                "source_updated_at": insert.excluded.source_updated_at,
+                "engine_version": insert.excluded.engine_version,
+                "phonetic": insert.excluded.phonetic,
+                "ipa": insert.excluded.ipa,
+                "syllables": insert.excluded.syllables,
+                "tips": insert.excluded.tips,
+                "computed_at": func.now(),
+            }
+        ),
+        [
+            {"row_id": row.id, "phonetic": phonetic, "ipa": ipa, "syllables": syllables, "tips": tips}
+            for row, (phonetic, ipa, syllables, tips) in zip(rows, results)
+        ]
+    )
+    # Commit per chunk so an interrupted run keeps its progress
+    db.commit()
+    return len(ipa_updates)
+
+def run(workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE, force: bool = False) -> bool:
+    started = time.monotonic()
+    db = SessionLocal()
+    processed = 0
+    filled = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            max_in_flight = (workers or os.cpu_count() or 1) * 2
+            last_id = 0
+
+            while True:
+                # Keyset pagination keeps every page an index range scan
+                rows = db.execute(
+                    stale_rows(force).where(dictionary.c.id > last_id)
+                    .order_by(dictionary.c.id).limit(chunk_size)
+                ).all()
+                if rows:
+                    last_id = rows[-1].id
+                    in_flight.append((rows, pool.submit(transcribe_chunk, [row.hawaiian_word for row in rows])))
+
+                # Write finished chunks in order while the pool works on the rest
+                while in_flight and (not rows or len(in_flight) >= max_in_flight or in_flight[0][1].done()):
+                    chunk_rows, future = in_flight.popleft()
+                    filled += write_chunk(db, chunk_rows, future.result())
+                    processed += len(chunk_rows)
+                    print(f"  ✓ {processed} rows (through id {chunk_rows[-1].id})")
+
+                if not rows:
+                    break
+    except KeyboardInterrupt:
+        print(f"\nInterrupted after {processed} rows; re-run to continue")
+        return False
+    finally:
+        if processed:
+            # Workers reload their pronunciation cache, which serves these rows
+            db.rollback()
+            change_counters.bump(db, COUNTER_NAME)
+            db.commit()
+        db.close()
+
+    print(f"\nTranscribed {processed} rows, filled pronunciation_ipa on {filled} "
+          f"({time.monotonic() - started:.1f}s)")
+    return True
+
+def status():
+    db = SessionLocal()
+    try:
+        total = db.execute(select(func.count()).select_from(dictionary)).scalar()
+        stale = db.execute(select(func.count()).select_from(stale_rows().subquery())).scalar()
+        missing_ipa = db.execute(
+            select(func.count()).select_from(dictionary).where(dictionary.c.pronunciation_ipa.is_(None))
+        ).scalar()
+    finally:
+        db.close()
+
+    print(f"Dictionary rows:           {total}")
+    print(f"Up to date:                {total - stale}")
+    print(f"Pending (new or changed):  {stale}")
+    print(f"Without pronunciation_ipa: {missing_ipa}")
+
+def main():
+    """Main CLI handler"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = sys.argv[2:]
+
+    if command == "run":
+        workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+        chunk_size = int(args[args.index("--chunk") + 1]) if "--chunk" in args else CHUNK_SIZE
+        success = run(workers, chunk_size, "--force" in args)
+        sys.exit(0 if success else 1)
+
+    elif command == "status":
+        status()
+
+    else:
+        print(f"Unknown command: {command}")
+        print(__doc__)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
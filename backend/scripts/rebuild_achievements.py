@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Rebuild achievement counters
+
+Recomputes every learner's achievement counters (lessons completed, translations
+made, study time, points, streaks) from the stored history and grants any
+achievements those counters already satisfy. Run it once after deploying the
+incremental achievement engine, and again whenever achievements with new
+requirements are added. Safe to re-run: counters never decrease and existing
+unlocks are left alone.
+
+Usage:
+    python rebuild_achievements.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.base import SessionLocal
+from app.services.achievements import rebuild_achievements, seed_achievements
+from app.services.dashboard import invalidate_dashboards
+
+
+def main():
+    """Main CLI handler"""
+    if len(sys.argv) > 1:
+        print(__doc__)
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        seed_achievements(db)
+        report = rebuild_achievements(db)
+        # Retroactive unlocks bypass events, so let dashboards rebuild from the tables
+        invalidate_dashboards(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Rebuild failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✓ Counters rebuilt: {report.counters}")
+    print(f"✓ Achievements granted: {report.granted}")
+
+
+if __name__ == "__main__":
+    main()
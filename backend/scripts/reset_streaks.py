@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Streak Reset Job
+
+Zeroes the current streak of every learner whose last active day, in their own
+timezone, ended before yesterday. Streaks lapse at each learner's local
+midnight, so run it at least nightly; running it hourly from cron keeps every
+timezone exact.
+
+Usage:
+    python reset_streaks.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.base import SessionLocal
+from app.services.streaks import reset_broken_streaks
+
+
+def main():
+    """Main CLI handler"""
+    if len(sys.argv) > 1:
+        print(__doc__)
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        reset = reset_broken_streaks(db)
+    finally:
+        db.close()
+
+    print(f"✓ Streaks reset: {reset}")
+
+
+if __name__ == "__main__":
+    main()
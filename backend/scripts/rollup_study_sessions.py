@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Study Rollup Job
+
+Adds study sessions recorded since the last run to the hourly and daily
+analytics rollups (per learner, per class and overall). Each run picks up
+where the previous one stopped, so run it from cron every few minutes; the
+first run rolls up the whole history.
+
+Usage:
+    python rollup_study_sessions.py [--batch-size N]
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.base import SessionLocal
+from app.services.study_rollups import rollup_sessions
+
+
+def main():
+    """Main CLI handler"""
+    args = sys.argv[1:]
+    if args and (args[0] != "--batch-size" or len(args) != 2 or not args[1].isdigit()):
+        print(__doc__)
+        sys.exit(1)
+    batch_size = int(args[1]) if args else 5000
+
+    db = SessionLocal()
+    try:
+        report = rollup_sessions(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+    print(f"✓ Sessions rolled up: {report.sessions}")
+    print(f"✓ Buckets updated: {report.buckets}")
+    print(f"Watermark: session {report.last_id}")
+
+
+if __name__ == "__main__":
+    main()
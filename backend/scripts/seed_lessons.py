@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Import the curriculum into the lessons tables
+
+Reads the lesson catalogue (curriculum.ts) and slide content (lessonContent.ts)
+that the frontend authors in frontend/src/data, upserts one `lessons` row per
+lesson and one `lesson_contents` row per slide, then pre-renders the API payloads.
+Lessons keep stable UUIDs across imports, and only lessons whose content changed
+get a new `updated_at` and content version, so clients keep their cached copies
+of the rest. Lessons no longer in the curriculum are unpublished.
+
+Usage:
+    python seed_lessons.py [--source DIR]
+"""
+
+import re
+import sys
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.sql import func
+
+from app.db.base import SessionLocal
+from app.models.lesson import Lesson, LessonContent, LessonLevel, LessonType
+from app.services.lesson_payloads import prebuild_payloads
+from app.services.lesson_sync import record_lesson_changes, untracked_lessons
+
+DEFAULT_SOURCE = Path(__file__).parent.parent.parent / "frontend" / "src" / "data"
+
+# Stable lesson UUIDs derived from the curriculum id
+LESSON_NAMESPACE = uuid.UUID("5b0f3c55-2f0d-4c39-9a57-0a1e1f6c2d8e")
+
+LESSON_TYPES = {
+    "Foundations": LessonType.PRONUNCIATION,
+    "Conversation": LessonType.CONVERSATION,
+    "Grammar": LessonType.GRAMMAR,
+    "Culture": LessonType.CULTURE,
+    "History": LessonType.CULTURE,
+    "Arts": LessonType.CULTURE,
+    "Literature": LessonType.CULTURE,
+}
+
+class LiteralParser:
+    """Parses the JavaScript object/array literals used in the data files
+
+    Supports objects with bare, quoted or numeric keys, arrays, single and double
+    quoted strings, numbers, true/false/null/undefined, comments and trailing commas.
+    """
+
+    _NUMBER = re.compile(r"-?\d+(\.\d+)?([eE][+-]?\d+)?")
+    _IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+    _ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "0": "\0"}
+
+    def __init__(self, text: str, position: int = 0):
+        self.text = text
+        self.position = position
+
+    def error(self, message: str):
+        line = self.text.count("\n", 0, self.position) + 1
+        raise ValueError(f"{message} at line {line}")
+
+    def skip(self):
+        while self.position < len(self.text):
+            if self.text[self.position].isspace():
+                self.position += 1
+            elif self.text.startswith("//", self.position):
+                end = self.text.find("\n", self.position)
+                self.position = len(self.text) if end == -1 else end
+            elif self.text.startswith("/*", self.position):
+                end = self.text.find("*/", self.position)
+                if end == -1:
+                    self.error("Unterminated comment")
+                self.position = end + 2
+            else:
+                break
+
+    def peek(self) -> str:
+        self.skip()
+        return self.text[self.position] if self.position < len(self.text) else ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            self.error(f"Expected '{char}'")
+        self.position += 1
+
+    def value(self):
+        char = self.peek()
+        if char == "{":
+            return self.object()
+        if char == "[":
+            return self.array()
+        if char in "\"'":
+            return self.string()
+        match = self._NUMBER.match(self.text, self.position)
+        if match:
+            self.position = match.end()
+            return float(match.group()) if match.group(1) or match.group(2) else int(match.group())
+        match = self._IDENTIFIER.match(self.text, self.position)
+        if match and match.group() in ("true", "false", "null", "undefined"):
+            self.position = match.end()
+            return {"true": True, "false": False}.get(match.group())
+        self.error("Unexpected value")
+
+    def string(self) -> str:
+        quote = self.text[self.position]
+        self.position += 1
+        parts = []
+        while True:
+            if self.position >= len(self.text):
+                self.error("Unterminated string")
+            char = self.text[self.position]
+            if char == quote:
+                self.position += 1
+                return "".join(parts)
+            if char == "\\":
+                escaped = self.text[self.position + 1]
+                if escaped == "u":
+                    parts.append(chr(int(self.text[self.position + 2:self.position + 6], 16)))
+                    self.position += 6
+                    continue
+                parts.append(self._ESCAPES.get(escaped, escaped))
+                self.position += 2
+                continue
+            parts.append(char)
+            self.position += 1
+
+    def key(self) -> str:
+        char = self.peek()
+        if char in "\"'":
+            return self.string()
+        match = self._NUMBER.match(self.text, self.position) or self._IDENTIFIER.match(self.text, self.position)
+        if not match:
+            self.error("Expected property name")
+        self.position = match.end()
+        return match.group()
+
+    def object(self) -> Dict:
+        self.expect("{")
+        result = {}
+        while self.peek() != "}":
+            name = self.key()
+            self.expect(":")
+            result[name] = self.value()
+            if self.peek() == ",":
+                self.position += 1
+            elif self.peek() != "}":
+                self.error("Expected ',' or '}'")
+        self.position += 1
+        return result
+
+    def array(self) -> List:
+        self.expect("[")
+        result = []
+        while self.peek() != "]":
+            result.append(self.value())
+            if self.peek() == ",":
+                self.position += 1
+            elif self.peek() != "]":
+                self.error("Expected ',' or ']'")
+        self.position += 1
+        return result
+
+def parse_export(path: Path, name: str):
+    """Parse the literal assigned to `export const <name>` in a TypeScript file"""
+    text = path.read_text(encoding="utf-8")
+    match = re.search(r"export\s+const\s+%s\b[^=]*=" % re.escape(name), text)
+    if not match:
+        raise ValueError(f"{path.name}: no 'export const {name}'")
+    return LiteralParser(text, match.end()).value()
+
+def lesson_uuid(lesson_id: int) -> str:
+    return str(uuid.uuid5(LESSON_NAMESPACE, str(lesson_id)))
+
+def lesson_fields(info: Dict, slides: List[Dict]) -> Dict:
+    return {
+        "title": info["title"],
+        "title_hawaiian": info.get("titleHawaiian"),
+        "description": info.get("description"),
+        "level": LessonLevel(info["level"]),
+        "lesson_type": LESSON_TYPES.get(info.get("category"), LessonType.VOCABULARY),
+        "order_index": info["id"],
+        "content": {"category": info.get("category"), "slide_count": len(slides)},
+        "vocabulary": [
+            {key: slide[key] for key in ("word", "translation", "pronunciation") if slide.get(key)}
+            for slide in slides if slide.get("type") == "vocabulary"
+        ],
+        "grammar_points": [
+            {key: slide[key] for key in ("grammarPoint", "explanation", "examples") if slide.get(key)}
+            for slide in slides if slide.get("type") == "grammar"
+        ],
+        "cultural_notes": info.get("culturalNote"),
+        "prerequisites": info.get("prerequisites") or [],
+        "estimated_minutes": info.get("duration", 15),
+        "points_value": info.get("points", 100),
+        "is_published": True,
+    }
+
+def seed(source: Path) -> bool:
+    try:
+        curriculum = parse_export(source / "curriculum.ts", "curriculum")
+        contents = parse_export(source / "lessonContent.ts", "lessonContents")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return False
+
+    db = SessionLocal()
+    created = updated = unchanged = removed = 0
+    try:
+        existing = {lesson.id: lesson for lesson in db.query(Lesson).all()}
+        touched = {lesson.id: lesson for lesson in untracked_lessons(db)}
+        for info in curriculum:
+            lesson_id = info["id"]
+            slides = (contents.get(str(lesson_id)) or {}).get("slides", [])
+            fields = lesson_fields(info, slides)
+
+            lesson = existing.get(lesson_id)
+            if lesson is None:
+                lesson = Lesson(id=lesson_id, uuid=lesson_uuid(lesson_id), **fields)
+                db.add(lesson)
+                db.flush()
+                created += 1
+                touched[lesson_id] = lesson
+                changed = False
+            else:
+                changed = any(getattr(lesson, name) != value for name, value in fields.items())
+                for name, value in fields.items():
+                    setattr(lesson, name, value)
+
+            sections = db.query(LessonContent).filter(
+                LessonContent.lesson_id == lesson_id
+            ).order_by(LessonContent.order_index).all()
+            if [section.content for section in sections] != slides:
+                changed = True
+                for section in sections:
+                    db.delete(section)
+                for index, slide in enumerate(slides):
+                    db.add(LessonContent(
+                        lesson_id=lesson_id,
+                        content_type=slide.get("type", "intro"),
+                        order_index=index,
+                        title=slide.get("title") or slide.get("grammarPoint") or slide.get("word"),
+                        content=slide,
+                        exercises=[slide] if slide.get("type") == "practice" else None,
+                    ))
+
+            if lesson_id not in existing:
+                continue
+            if changed:
+                # Slide edits alone don't touch the lessons row; bump it so payloads rebuild
+                lesson.updated_at = func.now()
+                touched[lesson_id] = lesson
+                updated += 1
+            else:
+                unchanged += 1
+
+        # Lessons dropped from the curriculum are unpublished, which clients sync as a deletion
+        current = {info["id"] for info in curriculum}
+        for lesson_id, lesson in existing.items():
+            if lesson_id not in current and lesson.is_published:
+                lesson.is_published = False
+                lesson.updated_at = func.now()
+                touched[lesson_id] = lesson
+                removed += 1
+
+        version = record_lesson_changes(db, touched.values()) if touched else None
+        if db.get_bind().dialect.name == "postgresql":
+            # Lessons are inserted with curriculum ids, which don't advance the serial sequence
+            db.execute(text(
+                "SELECT setval(pg_get_serial_sequence('lessons', 'id'), coalesce(max(id), 1), max(id) IS NOT NULL) "
+                "FROM lessons"
+            ))
+        db.commit()
+
+        built = prebuild_payloads(db)
+    finally:
+        db.close()
+
+    print(f"✓ Lessons: {created} created, {updated} updated, {removed} unpublished, {unchanged} unchanged")
+    if version is not None:
+        print(f"✓ Recorded {len(touched)} lesson changes as content version {version}")
+    print(f"✓ Pre-rendered payloads for {built} lessons and the index")
+    return True
+
+def main():
+    """Main CLI handler"""
+    args = sys.argv[1:]
+    if args and (args[0] != "--source" or len(args) != 2):
+        print(__doc__)
+        sys.exit(1)
+    source = Path(args[1]) if args else DEFAULT_SOURCE
+    success = seed(source)
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
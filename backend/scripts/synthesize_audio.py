@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Pre-render word audio from recorded Hawaiian syllable units
+
+Words without a native speaker recording are assembled from the syllable library
+(see app/services/syllable_synth.py) and written to the synthesized audio cache,
+which the pronunciation endpoint falls back to. Re-running only renders words that
+are new or whose units changed since their last render.
+
+Usage:
+    python synthesize_audio.py build [--workers N] [--force]
+    python synthesize_audio.py units
+"""
+
+import os
+import sys
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.hawaiian_text import normalize_word
+from app.services.pronunciation_engine import transcribe
+from app.services.syllable_synth import (
+    MissingUnitsError, UnitLibrary, is_synthesizable, plan_segments, synth_filename, synthesize
+)
+
+AUDIO_DIR = Path(__file__).parent.parent / settings.AUDIO_DIR
+SYNTH_DIR = Path(__file__).parent.parent / settings.SYNTH_AUDIO_DIR
+UNITS_DIR = Path(__file__).parent.parent / settings.SYLLABLE_UNITS_DIR
+METADATA_FILE = SYNTH_DIR / "metadata.json"
+
+BATCH_SIZE = 200
+
+# Loaded once per worker process
+_library: Optional[UnitLibrary] = None
+
+def load_metadata() -> Dict:
+    if METADATA_FILE.exists():
+        with open(METADATA_FILE, 'r') as f:
+            return json.load(f)
+    return {}
+
+def save_metadata(metadata: Dict):
+    """Save metadata atomically so the server never reads a partial file"""
+    tmp_file = METADATA_FILE.with_suffix(".json.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, METADATA_FILE)
+
+def dictionary_words() -> Iterator[str]:
+    """Every distinct single word in the dictionary and pronunciation tables"""
+    from sqlalchemy import select
+    from app.db.base import SessionLocal
+    from app.models.pronunciation import Pronunciation
+    from app.models.translation import Dictionary
+
+    db = SessionLocal()
+    try:
+        seen = set()
+        for statement in (select(Dictionary.hawaiian_word), select(Pronunciation.word)):
+            for word in db.execute(statement.execution_options(yield_per=1000)).scalars():
+                key = normalize_word(word or "")
+                if key and key not in seen and is_synthesizable(key):
+                    seen.add(key)
+                    yield key
+    finally:
+        db.close()
+
+def _init_worker(units_dir: str):
+    global _library
+    _library = UnitLibrary(units_dir).load()
+
+def render_batch(words: List[str]) -> List[tuple]:
+    """Render words in a worker; returns (word, filename, syllables, error) per word"""
+    results = []
+    for word in words:
+        transcription = transcribe(word)
+        syllables = list(transcription.syllables)
+        filename = synth_filename(word)
+        try:
+            data = synthesize(syllables, _library, transcription.stressed)
+        except MissingUnitsError as e:
+            results.append((word, None, syllables, f"missing units {', '.join(e.units)}"))
+            continue
+
+        tmp_path = SYNTH_DIR / f".{filename}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, SYNTH_DIR / filename)
+        results.append((word, filename, syllables, None))
+    return results
+
+def build(workers: Optional[int] = None, force: bool = False) -> bool:
+    """Render every word that lacks native audio and an up-to-date synthesized clip"""
+    from app.services.audio_index import AudioIndex
+
+    try:
+        library = UnitLibrary(UNITS_DIR).load()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
+    if not library:
+        print(f"Error: no syllable units found in {UNITS_DIR}")
+        return False
+
+    SYNTH_DIR.mkdir(parents=True, exist_ok=True)
+    metadata = load_metadata()
+    audio_index = AudioIndex(AUDIO_DIR)
+    audio_index.build()
+
+    pending = []
+    native = 0
+    current = 0
+    for word in dictionary_words():
+        if audio_index.for_word(word):
+            native += 1
+            continue
+        entry = metadata.get(word)
+        if not force and entry and entry.get("units_version") == library.fingerprint \
+                and (SYNTH_DIR / entry["filename"]).exists():
+            current += 1
+            continue
+        pending.append(word)
+
+    print(f"Rendering {len(pending)} words ({current} up to date, {native} have native recordings)")
+    if not pending:
+        return True
+
+    rendered = 0
+    failed = Counter()
+    batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(UNITS_DIR),)) as pool:
+        for future in as_completed([pool.submit(render_batch, batch) for batch in batches]):
+            for word, filename, syllables, error in future.result():
+                if error:
+                    failed[error] += 1
+                    continue
+                metadata[word] = {
+                    "word": word,
+                    "filename": filename,
+                    "syllables": syllables,
+                    "units_version": library.fingerprint,
+                }
+                rendered += 1
+            print(f"  ✓ {rendered} rendered, {sum(failed.values())} skipped")
+
+    # One metadata write for the whole run; the server index picks it up on its next check
+    save_metadata(metadata)
+
+    print(f"\nRendered {rendered} words")
+    for error, count in failed.most_common():
+        print(f"  ✗ {count} words: {error}")
+    return True
+
+def units_report():
+    """List syllable units the dictionary needs but the library lacks, most needed first"""
+    library = UnitLibrary(UNITS_DIR).load()
+    print(f"Syllable library: {len(library)} units in {UNITS_DIR}")
+
+    needed = Counter()
+    words = 0
+    for word in dictionary_words():
+        words += 1
+        try:
+            transcription = transcribe(word)
+            plan_segments(transcription.syllables, library.units, transcription.stressed)
+        except MissingUnitsError as e:
+            needed.update(e.units)
+
+    if not needed:
+        print(f"✓ All {words} words can be synthesized")
+        return
+    print(f"\n{'Missing unit':<15} {'Words':<8}")
+    print("-" * 25)
+    for unit, count in needed.most_common():
+        print(f"{unit:<15} {count:<8}")
+
+def main():
+    """Main CLI handler"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "build":
+        args = sys.argv[2:]
+        force = "--force" in args
+        workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+        success = build(workers, force)
+        sys.exit(0 if success else 1)
+
+    elif command == "units":
+        units_report()
+
+    else:
+        print(f"Unknown command: {command}")
+        print(__doc__)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
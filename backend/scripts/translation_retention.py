@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Translation Retention Job
+
+Compacts old anonymous translations into phrase frequencies, archives old rows to
+gzipped NDJSON files and removes them. On Postgres it also creates upcoming monthly
+partitions and drops emptied ones. Run it nightly from cron.
+
+Usage:
+    python translation_retention.py run [--archive-dir DIR] [--anonymous-months N] [--user-months N]
+    python translation_retention.py partitions
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.base import SessionLocal, engine
+from app.services.translation_retention import ArchiveError, ensure_translation_partitions, run_retention
+
+
+def parse_options(args):
+    """Parse --name value pairs"""
+    options = {}
+    for i in range(0, len(args), 2):
+        if not args[i].startswith("--") or i + 1 >= len(args):
+            print(__doc__)
+            sys.exit(1)
+        options[args[i][2:].replace("-", "_")] = args[i + 1]
+    return options
+
+
+def main():
+    """Main CLI handler"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "partitions":
+        ensure_translation_partitions(engine)
+        print("✓ Partitions up to date")
+
+    elif command == "run":
+        options = parse_options(sys.argv[2:])
+        ensure_translation_partitions(engine)
+
+        db = SessionLocal()
+        try:
+            report = run_retention(
+                db,
+                archive_dir=options.get("archive_dir"),
+                anonymous_months=int(options["anonymous_months"]) if "anonymous_months" in options else None,
+                user_months=int(options["user_months"]) if "user_months" in options else None,
+            )
+        except ArchiveError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        finally:
+            db.close()
+
+        print(f"Months processed: {', '.join(report.months) or 'none'}")
+        print(f"Anonymous rows archived: {report.anonymous_archived}")
+        print(f"User rows archived: {report.user_archived}")
+        print(f"Phrase frequencies updated: {report.phrases_compacted}")
+        print(f"Partitions dropped: {report.partitions_dropped}")
+        for path in report.archive_files:
+            print(f"  ✓ {path}")
+
+    else:
+        print(f"Unknown command: {command}")
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
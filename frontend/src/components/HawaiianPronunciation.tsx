@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { Volume2, Info, Loader2 } from 'lucide-react';
-import api from '../services/api';
+import { fetchPronunciation } from '../services/pronunciation';
 
 interface HawaiianPronunciationProps {
   text: string;
@@ -18,6 +18,7 @@ export const HawaiianPronunciation: React.FC<HawaiianPronunciationProps> = ({
   const [audioUrl, setAudioUrl] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [hasNativeAudio, setHasNativeAudio] = useState(false);
+  const [hasSyllableAudio, setHasSyllableAudio] = useState(false);
 
   useEffect(() => {
     const loadVoices = () => {
@@ -50,17 +51,21 @@ export const HawaiianPronunciation: React.FC<HawaiianPronunciationProps> = ({
       
       setIsLoading(true);
       try {
-        const response = await api.get(`/pronunciation/word/${text.toLowerCase()}`);
-        if (response.data.audio_url) {
-          setAudioUrl(response.data.audio_url);
-          setHasNativeAudio(true);
+        const pronunciation = await fetchPronunciation(text);
+        if (pronunciation.audio_url) {
+          const synthesized = pronunciation.audio_source === 'synthesized';
+          setAudioUrl(pronunciation.audio_url);
+          setHasNativeAudio(!synthesized);
+          setHasSyllableAudio(synthesized);
         } else {
           setAudioUrl(null);
           setHasNativeAudio(false);
+          setHasSyllableAudio(false);
         }
       } catch (error) {
         setAudioUrl(null);
         setHasNativeAudio(false);
+        setHasSyllableAudio(false);
       } finally {
         setIsLoading(false);
       }
@@ -70,8 +75,8 @@ export const HawaiianPronunciation: React.FC<HawaiianPronunciationProps> = ({
   }, [text]);
 
   const speakHawaiian = async () => {
-    // If we have native audio, play that first
-    if (audioUrl && hasNativeAudio) {
+    // If we have native or syllable-assembled audio, play that first
+    if (audioUrl && (hasNativeAudio || hasSyllableAudio)) {
       try {
         const audio = new Audio(audioUrl);
         audio.play();
@@ -135,6 +140,7 @@ export const HawaiianPronunciation: React.FC<HawaiianPronunciationProps> = ({
   const getButtonTitle = () => {
     if (isLoading) return 'Loading pronunciation...';
     if (hasNativeAudio) return 'Play native speaker pronunciation';
+    if (hasSyllableAudio) return 'Play pronunciation built from native syllables';
     if (hasHawaiianVoice) return 'Play with Hawaiian voice';
     return 'Play approximated pronunciation';
   };
@@ -154,7 +160,7 @@ export const HawaiianPronunciation: React.FC<HawaiianPronunciationProps> = ({
         )}
         {showInfo && (
           <div className="absolute bottom-full left-1/2 transform -translate-x-1/2 mb-2 px-3 py-1 bg-gray-800 text-white text-xs rounded opacity-0 group-hover:opacity-100 transition-opacity whitespace-nowrap">
-            {hasNativeAudio ? '🎵 Native speaker audio' : !hasHawaiianVoice ? '🔊 Approximated pronunciation' : '🗣️ Hawaiian voice'}
+            {hasNativeAudio ? '🎵 Native speaker audio' : hasSyllableAudio ? '🎶 Assembled from native syllables' : !hasHawaiianVoice ? '🔊 Approximated pronunciation' : '🗣️ Hawaiian voice'}
           </div>
         )}
       </button>
@@ -165,7 +171,7 @@ export const HawaiianPronunciation: React.FC<HawaiianPronunciationProps> = ({
         </span>
       )}
       
-      {showInfo && !hasNativeAudio && !hasHawaiianVoice && (
+      {showInfo && !hasNativeAudio && !hasSyllableAudio && !hasHawaiianVoice && (
         <div className="text-xs text-gray-500 flex items-center gap-1">
           <Info className="w-3 h-3" />
           <span>Native audio will be added as recordings become available</span>
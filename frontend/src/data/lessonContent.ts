@@ -1,4 +1,4 @@
-interface Slide {
+export interface Slide {
   type: 'intro' | 'vocabulary' | 'grammar' | 'culture' | 'practice' | 'complete';
   title?: string;
   content?: string;
@@ -19,7 +19,7 @@ interface Slide {
   examples?: { hawaiian: string; english: string }[];
 }
 
-interface LessonContent {
+export interface LessonContent {
   id: number;
   title: string;
   slides: Slide[];
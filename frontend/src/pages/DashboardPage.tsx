@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { motion } from 'framer-motion';
 import { useAuth } from '../contexts/AuthContext';
 import { 
@@ -7,21 +7,31 @@ import {
   Clock, 
   BookOpen,
   TrendingUp,
-  Calendar,
-  Star,
-  Award
+  Award,
+  Layers
 } from 'lucide-react';
+import { Dashboard, fetchDashboard } from '../services/dashboard';
 
 const DashboardPage: React.FC = () => {
   const { user } = useAuth();
+  const [dashboard, setDashboard] = useState<Dashboard | null>(null);
+
+  useEffect(() => {
+    if (!user) return;
+    fetchDashboard()
+      .then(setDashboard)
+      .catch(error => console.error('Failed to load dashboard:', error));
+  }, [user]);
 
   if (!user) return null;
 
   const stats = [
-    { icon: BookOpen, label: 'Lessons Completed', value: user.lessons_completed },
-    { icon: Trophy, label: 'Total Points', value: user.total_points },
-    { icon: Target, label: 'Current Streak', value: `${user.current_streak} days` },
-    { icon: Clock, label: 'Daily Goal', value: `${user.daily_goal_minutes} min` },
+    { icon: BookOpen, label: 'Lessons Completed', value: dashboard?.lessons_completed ?? user.lessons_completed },
+    { icon: Trophy, label: 'Total Points', value: dashboard?.total_points ?? user.total_points },
+    { icon: Target, label: 'Current Streak', value: `${dashboard?.current_streak ?? user.current_streak} days` },
+    dashboard
+      ? { icon: Layers, label: 'Reviews Due', value: `${dashboard.reviews_due}${dashboard.reviews_due_capped ? '+' : ''}` }
+      : { icon: Clock, label: 'Daily Goal', value: `${user.daily_goal_minutes} min` },
   ];
 
   return (
@@ -68,26 +78,19 @@ const DashboardPage: React.FC = () => {
           <div className="lg:col-span-2 card">
             <h2 className="text-xl font-bold mb-4 flex items-center gap-2">
               <TrendingUp className="w-5 h-5 text-ocean" />
-              Recent Progress
+              Recent Translations
             </h2>
             <div className="space-y-4">
-              <div className="flex items-center justify-between p-4 bg-gray-50 rounded-lg">
-                <div>
-                  <p className="font-semibold">Basic Greetings</p>
-                  <p className="text-sm text-gray-600">Completed 2 days ago</p>
-                </div>
-                <div className="flex items-center gap-2">
-                  <Star className="w-5 h-5 text-yellow-500 fill-yellow-500" />
-                  <span className="font-semibold">100 pts</span>
-                </div>
-              </div>
-              <div className="flex items-center justify-between p-4 bg-gray-50 rounded-lg">
-                <div>
-                  <p className="font-semibold">Numbers 1-10</p>
-                  <p className="text-sm text-gray-600">In progress</p>
-                </div>
-                <div className="text-ocean font-semibold">75%</div>
-              </div>
+              {dashboard?.recent_translations.length ? (
+                dashboard.recent_translations.map(translation => (
+                  <div key={translation.id} className="p-4 bg-gray-50 rounded-lg">
+                    <p className="font-semibold">{translation.source_text}</p>
+                    <p className="text-sm text-gray-600">{translation.translated_text}</p>
+                  </div>
+                ))
+              ) : (
+                <p className="text-gray-600">Translations you make will show up here.</p>
+              )}
             </div>
           </div>
 
@@ -98,24 +101,21 @@ const DashboardPage: React.FC = () => {
               Recent Achievements
             </h2>
             <div className="space-y-3">
-              <div className="flex items-center gap-3">
-                <div className="w-12 h-12 bg-sunset-light rounded-full flex items-center justify-center">
-                  <Trophy className="w-6 h-6 text-sunset" />
-                </div>
-                <div>
-                  <p className="font-semibold">First Steps</p>
-                  <p className="text-sm text-gray-600">Complete your first lesson</p>
-                </div>
-              </div>
-              <div className="flex items-center gap-3">
-                <div className="w-12 h-12 bg-ocean-light rounded-full flex items-center justify-center">
-                  <Calendar className="w-6 h-6 text-ocean" />
-                </div>
-                <div>
-                  <p className="font-semibold">7 Day Streak</p>
-                  <p className="text-sm text-gray-600">Practice 7 days in a row</p>
-                </div>
-              </div>
+              {dashboard?.recent_achievements.length ? (
+                dashboard.recent_achievements.map(achievement => (
+                  <div key={achievement.id} className="flex items-center gap-3">
+                    <div className="w-12 h-12 bg-sunset-light rounded-full flex items-center justify-center">
+                      <Trophy className="w-6 h-6 text-sunset" />
+                    </div>
+                    <div>
+                      <p className="font-semibold">{achievement.name}</p>
+                      <p className="text-sm text-gray-600">{achievement.description}</p>
+                    </div>
+                  </div>
+                ))
+              ) : (
+                <p className="text-gray-600">Complete your first lesson to earn a badge.</p>
+              )}
             </div>
           </div>
         </motion.div>
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { motion } from 'framer-motion';
 import { Link } from 'react-router-dom';
 import { 
@@ -10,19 +10,41 @@ import {
   ChevronDown,
   ChevronUp
 } from 'lucide-react';
-import { curriculum, getCurriculumByLevel } from '../data/curriculum';
+import {
+  CurriculumLesson,
+  LessonStatus,
+  fetchCourseMap,
+  fetchCurriculum,
+  getCurriculumByLevel
+} from '../services/lessons';
 
 const LearnPage: React.FC = () => {
   const [expandedLevel, setExpandedLevel] = useState<'beginner' | 'intermediate' | 'advanced' | null>('beginner');
-  const [completedLessons] = useState<number[]>([1, 2]); // Mock completed lessons
+  const [curriculum, setCurriculum] = useState<CurriculumLesson[]>([]);
+  const [lessonStatus, setLessonStatus] = useState<Map<number, LessonStatus>>(new Map());
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    fetchCurriculum()
+      .then(setCurriculum)
+      .catch(error => console.error('Failed to load curriculum:', error))
+      .finally(() => setLoading(false));
+    fetchCourseMap()
+      .then(map => setLessonStatus(new Map(map.lessons.map(lesson => [lesson.lesson_id, lesson.status]))))
+      .catch(error => console.error('Failed to load course map:', error));
+  }, []);
+
+  const completedLessons = curriculum
+    .filter(lesson => lessonStatus.get(lesson.id) === 'completed')
+    .map(lesson => lesson.id);
   
-  const beginnerLessons = getCurriculumByLevel('beginner');
-  const intermediateLessons = getCurriculumByLevel('intermediate');
-  const advancedLessons = getCurriculumByLevel('advanced');
+  const beginnerLessons = getCurriculumByLevel(curriculum, 'beginner');
+  const intermediateLessons = getCurriculumByLevel(curriculum, 'intermediate');
+  const advancedLessons = getCurriculumByLevel(curriculum, 'advanced');
   
   const totalLessons = curriculum.length;
   const completedCount = completedLessons.length;
-  const progressPercentage = (completedCount / totalLessons) * 100;
+  const progressPercentage = totalLessons ? (completedCount / totalLessons) * 100 : 0;
 
   const levelInfo = {
     beginner: {
@@ -48,9 +70,10 @@ const LearnPage: React.FC = () => {
     }
   };
 
-  const isLessonUnlocked = (lesson: any) => {
-    if (!lesson.prerequisites) return true;
-    return lesson.prerequisites.every((prereq: number) => completedLessons.includes(prereq));
+  const isLessonUnlocked = (lesson: CurriculumLesson) => {
+    const status = lessonStatus.get(lesson.id);
+    if (status) return status !== 'locked';
+    return !lesson.prerequisites;
   };
 
   return (
@@ -89,6 +112,12 @@ const LearnPage: React.FC = () => {
           <p className="text-sm text-gray-600">Keep going! You're making great progress.</p>
         </motion.div>
 
+        {loading && (
+          <div className="card text-center py-12 mb-6">
+            <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-ocean mx-auto"></div>
+          </div>
+        )}
+
         {/* Level Sections */}
         <div className="space-y-6">
           {(['beginner', 'intermediate', 'advanced'] as const).map((level, levelIndex) => {
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import { 
@@ -9,8 +9,8 @@ import {
   AlertCircle,
   Info
 } from 'lucide-react';
-import { getLessonContent } from '../data/lessonContent';
-import { curriculum } from '../data/curriculum';
+import { fetchLesson, LoadedLesson } from '../services/lessons';
+import { recordProgress } from '../services/progress';
 import { HawaiianPronunciation, HawaiianPronunciationGuide } from '../components/HawaiianPronunciation';
 import { getPhoneticPronunciation, getPronunciationTips } from '../services/pronunciation';
 
@@ -26,10 +26,13 @@ const LessonPage: React.FC = () => {
   const [selectedAnswer, setSelectedAnswer] = useState<number | null>(null);
   const [showFeedback, setShowFeedback] = useState(false);
   const [lessonScore, setLessonScore] = useState(0);
+  const [lesson, setLesson] = useState<LoadedLesson | null>(null);
+  const [loading, setLoading] = useState(true);
+  const lastProgressAt = useRef(Date.now());
 
   console.log('LessonPage rendering with id:', id, 'lessonId:', lessonId);
-  const lessonContent = getLessonContent(lessonId);
-  const lessonInfo = curriculum.find(lesson => lesson.id === lessonId);
+  const lessonContent = lesson?.content;
+  const lessonInfo = lesson?.info;
 
   console.log('Lesson data:', { 
     lessonId, 
@@ -51,8 +54,54 @@ const LessonPage: React.FC = () => {
     window.scrollTo(0, 0);
   }, [lessonId]); // Use lessonId to ensure proper re-render
 
+  useEffect(() => {
+    if (isNaN(lessonId)) return;
+
+    let cancelled = false;
+    setLoading(true);
+    fetchLesson(lessonId)
+      .then(loaded => {
+        if (!cancelled) setLesson(loaded);
+      })
+      .catch(error => {
+        console.error('Failed to load lesson:', lessonId, error);
+        if (!cancelled) setLesson(null);
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [lessonId]);
+
+  // Seconds since the previous progress event, so time spent is reported once
+  const takeElapsedSeconds = () => {
+    const now = Date.now();
+    const elapsed = Math.round((now - lastProgressAt.current) / 1000);
+    lastProgressAt.current = now;
+    return Math.min(elapsed, 30 * 60);
+  };
+
+  useEffect(() => {
+    lastProgressAt.current = Date.now();
+  }, [lesson]);
+
+  useEffect(() => {
+    const slides = lesson?.content.slides;
+    if (slides && slides[currentSlide]?.type === 'complete') {
+      recordProgress({
+        lesson_id: lessonId,
+        type: 'lesson_completed',
+        completion_percentage: 100,
+        time_spent_seconds: takeElapsedSeconds()
+      }, true);
+    }
+  }, [lesson, currentSlide]);
+
   // Add loading state to prevent white screen
-  if (!id || isNaN(lessonId)) {
+  if (!id || isNaN(lessonId) || loading) {
     return (
       <div className="min-h-screen bg-gray-50 py-8">
         <div className="container mx-auto px-4 max-w-3xl">
@@ -89,6 +138,15 @@ const LessonPage: React.FC = () => {
     setShowFeedback(true);
     
     const slide = lessonContent.slides[currentSlide];
+    if (slide?.type === 'practice') {
+      recordProgress({
+        lesson_id: lessonId,
+        type: 'exercise_completed',
+        score: index === slide.correctAnswer ? 100 : 0,
+        completion_percentage: ((currentSlide + 1) / lessonContent.slides.length) * 100,
+        time_spent_seconds: takeElapsedSeconds()
+      });
+    }
     // Auto-advance after 2 seconds if correct
     if (slide?.type === 'practice' && index === slide.correctAnswer) {
       setLessonScore(lessonScore + 25); // Add points for correct answer
@@ -0,0 +1,44 @@
+// Dashboard Service
+// Loads the precomputed dashboard summary (totals, streak, recent activity and
+// due reviews) from /me/dashboard in a single request.
+
+import api from './api';
+
+export interface DashboardTranslation {
+  id: number;
+  source_text: string;
+  translated_text: string;
+  created_at?: string | null;
+}
+
+export interface DashboardAchievement {
+  id: number;
+  name: string;
+  name_hawaiian?: string | null;
+  description?: string | null;
+  icon_name?: string | null;
+  badge_tier?: string | null;
+  unlocked_at?: string | null;
+}
+
+export interface Dashboard {
+  total_points: number;
+  current_streak: number;
+  longest_streak: number;
+  lessons_completed: number;
+  translations_made: number;
+  study_sessions: number;
+  study_minutes: number;
+  achievements_count: number;
+  recent_translations: DashboardTranslation[];
+  recent_achievements: DashboardAchievement[];
+  reviews_due: number;
+  reviews_due_capped: boolean;
+  next_review_at?: string | null;
+  updated_at?: string | null;
+}
+
+export const fetchDashboard = async (): Promise<Dashboard> => {
+  const response = await api.get<Dashboard>('/me/dashboard');
+  return response.data;
+};
@@ -0,0 +1,118 @@
+// Lesson Service
+// Loads the curriculum and lesson slides from the lessons API on demand. The
+// files in ../data are only the authoring source for scripts/seed_lessons.py;
+// importing their types here keeps the data itself out of the bundle.
+
+import api from './api';
+import type { Lesson } from '../data/curriculum';
+import type { LessonContent, Slide } from '../data/lessonContent';
+
+type LessonLevel = Lesson['level'];
+
+interface LessonSummaryResponse {
+  id: number;
+  uuid: string;
+  title: string;
+  title_hawaiian?: string | null;
+  description?: string | null;
+  level: LessonLevel;
+  category?: string | null;
+  estimated_minutes: number;
+  points_value: number;
+  prerequisites: number[];
+  cultural_notes?: string | null;
+}
+
+interface LessonDetailResponse extends LessonSummaryResponse {
+  slides: Slide[];
+}
+
+export interface CurriculumLesson extends Lesson {
+  uuid: string;
+}
+
+export interface LoadedLesson {
+  info: CurriculumLesson;
+  content: LessonContent;
+}
+
+const toLesson = (data: LessonSummaryResponse): CurriculumLesson => ({
+  id: data.id,
+  uuid: data.uuid,
+  title: data.title,
+  titleHawaiian: data.title_hawaiian || undefined,
+  description: data.description || '',
+  level: data.level,
+  category: data.category || '',
+  completed: false,
+  locked: false,
+  duration: data.estimated_minutes,
+  points: data.points_value,
+  prerequisites: data.prerequisites.length ? data.prerequisites : undefined,
+  culturalNote: data.cultural_notes || undefined,
+});
+
+// The index is small and shared by every page, so it is fetched once per session
+let curriculumRequest: Promise<CurriculumLesson[]> | null = null;
+const lessonRequests = new Map<number, Promise<LoadedLesson | null>>();
+
+export const fetchCurriculum = (): Promise<CurriculumLesson[]> => {
+  if (!curriculumRequest) {
+    curriculumRequest = api
+      .get<{ lessons: LessonSummaryResponse[] }>('/lessons')
+      .then(response => response.data.lessons.map(toLesson))
+      .catch(error => {
+        curriculumRequest = null;
+        throw error;
+      });
+  }
+  return curriculumRequest;
+};
+
+export const getCurriculumByLevel = (lessons: CurriculumLesson[], level: LessonLevel) => {
+  return lessons.filter(lesson => lesson.level === level);
+};
+
+export type LessonStatus = 'completed' | 'available' | 'locked';
+
+export interface CourseMapLesson {
+  lesson_id: number;
+  status: LessonStatus;
+  missing_prerequisites: number[];
+}
+
+export interface CourseMap {
+  version: number;
+  completed: number;
+  available: number;
+  total: number;
+  lessons: CourseMapLesson[];
+}
+
+// Statuses are per learner and change as they progress, so this is never cached
+export const fetchCourseMap = async (): Promise<CourseMap> => {
+  const response = await api.get<CourseMap>('/lessons/map');
+  return response.data;
+};
+
+// Resolves to null when the curriculum has no lesson with this id
+export const fetchLesson = (lessonId: number): Promise<LoadedLesson | null> => {
+  let request = lessonRequests.get(lessonId);
+  if (!request) {
+    request = fetchCurriculum()
+      .then(async lessons => {
+        const summary = lessons.find(lesson => lesson.id === lessonId);
+        if (!summary) return null;
+
+        const response = await api.get<LessonDetailResponse>(`/lessons/${summary.uuid}`);
+        const info = toLesson(response.data);
+        return { info, content: { id: info.id, title: info.title, slides: response.data.slides } };
+      })
+      .catch(error => {
+        lessonRequests.delete(lessonId);
+        throw error;
+      });
+    lessonRequests.set(lessonId, request);
+  }
+  return request;
+};
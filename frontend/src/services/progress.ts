@@ -0,0 +1,80 @@
+// Progress Service
+// Queues lesson progress events and posts them to /progress/events in batches,
+// so answering an exercise never waits on (or costs) its own request.
+
+import api from './api';
+
+export interface ProgressEvent {
+  lesson_id: number;
+  type: 'exercise_completed' | 'lesson_completed' | 'time_spent';
+  score?: number;
+  completion_percentage?: number;
+  time_spent_seconds?: number;
+  occurred_at?: string;
+}
+
+const FLUSH_DELAY_MS = 5000;
+const MAX_BATCH = 500;
+
+interface ProgressBatch {
+  batch_id: string;
+  events: ProgressEvent[];
+}
+
+let queue: ProgressEvent[] = [];
+// A batch whose upload failed; it is resent with the same id so the server can skip it if it already applied it
+let unsent: ProgressBatch | null = null;
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+const newBatchId = (): string =>
+  typeof crypto !== 'undefined' && 'randomUUID' in crypto
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
+export const flushProgress = async (): Promise<void> => {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  if ((!unsent && queue.length === 0) || !localStorage.getItem('access_token')) return;
+
+  let batch = unsent;
+  if (!batch) {
+    batch = { batch_id: newBatchId(), events: queue.slice(0, MAX_BATCH) };
+    queue = queue.slice(batch.events.length);
+    unsent = batch;
+  }
+  try {
+    await api.post('/progress/events', batch);
+    if (unsent === batch) unsent = null;
+  } catch (error: any) {
+    // Keep the batch for the next flush unless the server rejected it outright
+    if (error.response && error.response.status < 500) {
+      if (unsent === batch) unsent = null;
+      console.error('Progress events rejected:', error.response.data);
+    }
+  }
+  if (unsent || queue.length > 0) scheduleFlush();
+};
+
+const scheduleFlush = () => {
+  if (!flushTimer) {
+    flushTimer = setTimeout(flushProgress, FLUSH_DELAY_MS);
+  }
+};
+
+export const recordProgress = (event: ProgressEvent, flushNow = false) => {
+  if (!localStorage.getItem('access_token')) return;
+  queue.push({ ...event, occurred_at: event.occurred_at || new Date().toISOString() });
+  if (flushNow) {
+    flushProgress();
+  } else {
+    scheduleFlush();
+  }
+};
+
+if (typeof document !== 'undefined') {
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flushProgress();
+  });
+}
@@ -1,6 +1,8 @@
 // Hawaiian Pronunciation Service
 // Provides phonetic breakdowns and pronunciation rules
 
+import api from './api';
+
 interface PronunciationRule {
   pattern: RegExp;
   replacement: string;
@@ -222,4 +224,134 @@ export function getPronunciationTips(word: string): string[] {
   }
   
   return tips;
-}
\ No newline at end of file
+}
+
+export interface PronunciationData {
+  word: string;
+  phonetic: string;
+  ipa: string;
+  syllables: string[];
+  audio_url: string | null;
+  tips: string[];
+  audio_source?: 'native' | 'synthesized' | null;
+}
+
+// Lookups made in the same tick (e.g. every vocabulary item on a lesson page)
+// are sent together as one batch request
+const MAX_BATCH_WORDS = 200;
+const pronunciationCache = new Map<string, Promise<PronunciationData>>();
+let pendingLookups = new Map<string, {
+  resolve: (data: PronunciationData) => void;
+  reject: (error: unknown) => void;
+}>();
+let flushScheduled = false;
+
+async function flushPronunciationLookups() {
+  flushScheduled = false;
+  const lookups = pendingLookups;
+  pendingLookups = new Map();
+  const words = Array.from(lookups.keys());
+
+  for (let i = 0; i < words.length; i += MAX_BATCH_WORDS) {
+    const chunk = words.slice(i, i + MAX_BATCH_WORDS);
+    try {
+      const response = await api.post('/pronunciation/batch', { words: chunk });
+      const items = new Map<string, PronunciationData>(
+        response.data.items.map((item: PronunciationData) => [item.word, item])
+      );
+      chunk.forEach(word => {
+        const item = items.get(word);
+        if (item) {
+          lookups.get(word)!.resolve(item);
+        } else {
+          lookups.get(word)!.reject(new Error(`No pronunciation for ${word}`));
+        }
+      });
+    } catch (error) {
+      chunk.forEach(word => lookups.get(word)!.reject(error));
+    }
+  }
+}
+
+function queueBatchLookup(key: string): Promise<PronunciationData> {
+  const lookup = new Promise<PronunciationData>((resolve, reject) => {
+    pendingLookups.set(key, { resolve, reject });
+  });
+  if (!flushScheduled) {
+    flushScheduled = true;
+    setTimeout(flushPronunciationLookups, 0);
+  }
+  return lookup;
+}
+
+// Static bundles: content-hashed shards of every known word, cached by the browser
+// for a year; only the small manifest is revalidated
+const BUNDLE_PATH = '/pronunciation/bundles/';
+const HAWAIIAN_LETTERS = 'aeiouhklmnpw';
+
+interface BundleManifest {
+  version: string;
+  shards: { [letter: string]: string };
+}
+
+type PronunciationShard = { [word: string]: Omit<PronunciationData, 'word'> };
+
+let manifestRequest: Promise<BundleManifest | null> | null = null;
+const shardRequests = new Map<string, Promise<PronunciationShard>>();
+
+// Same key as the backend's normalize_word: NFC, lowercase, real ʻokina
+function normalizeWord(word: string): string {
+  return word.trim().toLowerCase().normalize('NFC').replace(/[‘’'`]/g, 'ʻ');
+}
+
+// Shard letter ignoring ʻokina and kahakō, matching the backend's shard_key
+function shardKey(key: string): string {
+  const folded = key.normalize('NFD').replace(/[\u0300-\u036f]/g, '').replace(/ʻ/g, '');
+  return folded && HAWAIIAN_LETTERS.includes(folded[0]) ? folded[0] : '_';
+}
+
+function loadManifest(): Promise<BundleManifest | null> {
+  if (!manifestRequest) {
+    manifestRequest = api.get(`${BUNDLE_PATH}manifest.json`)
+      .then(response => response.data as BundleManifest)
+      .catch(() => null);
+  }
+  return manifestRequest;
+}
+
+async function lookupBundled(key: string): Promise<Omit<PronunciationData, 'word'> | null> {
+  const manifest = await loadManifest();
+  const filename = manifest?.shards[shardKey(key)];
+  if (!filename) {
+    return null;
+  }
+
+  let shard = shardRequests.get(filename);
+  if (!shard) {
+    shard = api.get(`${BUNDLE_PATH}${filename}`)
+      .then(response => response.data.words as PronunciationShard)
+      .catch(() => {
+        shardRequests.delete(filename);
+        return {};
+      });
+    shardRequests.set(filename, shard);
+  }
+  return (await shard)[key] || null;
+}
+
+// Fetch pronunciation data (phonetic, IPA, audio) for a word: from the static
+// bundles when the word is known, otherwise from the API
+export function fetchPronunciation(word: string): Promise<PronunciationData> {
+  const key = word.trim().toLowerCase();
+  const cached = pronunciationCache.get(key);
+  if (cached) {
+    return cached;
+  }
+
+  const lookup = lookupBundled(normalizeWord(key)).then(bundled => (
+    bundled ? { word: key, audio_url: null, ...bundled } : queueBatchLookup(key)
+  ));
+  pronunciationCache.set(key, lookup);
+  lookup.catch(() => pronunciationCache.delete(key));
+  return lookup;
+}